@@ -83,6 +83,7 @@ class CodeAnalyzer(object):
         if "Key" in self.ACListHandlerName: names.append("keyName")
         if "Periodic" in self.ACListHandlerName: names.append("elapsedTime")
         if "Message" in self.ACListHandlerName: names.append("message")
+        if "Collision" in self.ACListHandlerName: names.append("other")
         names = list(set(names))
         names.sort(key=str.casefold)
         self.ACNames = names
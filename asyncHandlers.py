@@ -0,0 +1,155 @@
+"""
+Support for handlers that use await, like:  await Wait(1)  or  await self.AnimatePosition(1, (100, 100))
+
+A handler whose code awaits anything gets compiled as an async function (see handlerCompiler), so running it just
+returns a coroutine.  The Runner then steps that coroutine on the runner thread, and each time it awaits a
+HandlerFuture, the Runner goes back to running other handlers until that future gets its result, and then resumes
+the coroutine from where it left off.  So lots of objects can be in the middle of scripted, waiting sequences at
+once, without blocking each other, or the user's clicks and key presses.
+
+Futures only ever get their results on the runner thread, usually from a function that the main thread enqueued
+there, so the coroutines never need any locking.
+"""
+
+import inspect
+
+
+class HandlerCancelled(BaseException):
+    """
+    Thrown into a handler that's awaiting something that got cancelled, like an animation that was stopped with
+    StopAnimating().  It's a BaseException, so a handler's own  except Exception:  doesn't swallow it, and the Runner
+    ends the handler quietly when it comes back out.
+    """
+    pass
+
+
+class HandlerFuture(object):
+    """ An awaitable result that will be filled in later, on the runner thread. """
+
+    def __init__(self):
+        self.done = False
+        self.result = None
+        self.exception = None
+        self.callbacks = []
+
+    def SetResult(self, result=None):
+        if self.done: return
+        self.done = True
+        self.result = result
+        self.RunCallbacks()
+
+    def SetException(self, exception):
+        # The awaiting handler gets this exception raised at its await
+        if self.done: return
+        self.done = True
+        self.exception = exception
+        self.RunCallbacks()
+
+    def Cancel(self):
+        self.SetException(HandlerCancelled())
+
+    def RunCallbacks(self):
+        callbacks = self.callbacks
+        self.callbacks = []
+        for callback in callbacks:
+            callback(self)
+
+    def AddCallback(self, callback):
+        if self.done:
+            callback(self)
+        else:
+            self.callbacks.append(callback)
+
+    def __await__(self):
+        if not self.done:
+            yield self
+        if self.exception:
+            raise self.exception
+        return self.result
+
+
+class HandlerTask(object):
+    """ A running async handler's coroutine, along with the event values it needs set up each time it resumes. """
+
+    def __init__(self, coro, uiModel, handlerName, mousePos, keyName, arg):
+        self.coro = coro
+        self.context = (uiModel, handlerName, mousePos, keyName, arg)
+        self.generation = uiModel.generation
+
+
+def DoneFuture(result):
+    future = HandlerFuture()
+    future.SetResult(result)
+    return future
+
+
+def AwaitCall(func, *args, **kwargs):
+    """
+    handlerCompiler rewrites  await func(...)  into  await AwaitCall(func, ...)  so that the same functions can
+    either block, when called normally, or be awaited.  If func is a method with an ...Async() version, like the
+    Runner's Wait() and WaitAsync(), call that instead.  Animate*() methods finish through their onFinished
+    function.  Anything else runs normally, and if it doesn't return something awaitable, its return value is
+    available right away.
+    """
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", "")
+    asyncFunc = getattr(owner, name + "Async", None) if owner is not None else None
+    if asyncFunc:
+        result = asyncFunc(*args, **kwargs)
+    elif owner is not None and name.startswith("Animate"):
+        result = AnimateAsync(func, args, kwargs)
+    else:
+        result = func(*args, **kwargs)
+    if inspect.isawaitable(result):
+        return result
+    return DoneFuture(result)
+
+
+# Animate*() method -> its signature, since building one costs more than the rest of an awaited animation call
+animateSignatures = {}
+
+
+def AnimateSignature(func):
+    key = getattr(func, "__func__", func)
+    sig = animateSignatures.get(key)
+    if sig is None:
+        sig = inspect.signature(func)
+        animateSignatures[key] = sig
+    return sig
+
+
+def AnimateAsync(func, args, kwargs):
+    """
+    Start an Animate*(duration, endValue, onFinished=None, *args, easing=None, **kwargs) call, with its onFinished
+    wrapped to also finish the returned future.  The animation gets tagged with the future, so if it's stopped before
+    it finishes, the model cancels the future, instead of leaving the awaiting handler suspended forever.
+    """
+    future = HandlerFuture()
+    # Bind like a normal call would, so duration, endValue and onFinished work whether passed by position or keyword
+    bound = AnimateSignature(func).bind(*args, **kwargs)
+    onFinished = bound.arguments.get("onFinished")
+
+    def _onAnimationFinished(*a, **kw):
+        try:
+            if onFinished:
+                onFinished(*a, **kw)
+        finally:
+            future.SetResult(None)
+
+    bound.arguments["onFinished"] = _onAnimationFinished
+    owner = func.__self__
+    if not hasattr(owner, "_model"):
+        # Not a CardStock object, so all we can do is wait for its onFinished
+        func(*bound.args, **bound.kwargs)
+        return future
+
+    model = owner._model
+    if model:
+        model.lastAnimation = None
+    func(*bound.args, **bound.kwargs)
+    if model and model.lastAnimation is not None:
+        model.lastAnimation["future"] = future
+    else:
+        # The object is gone, so nothing is animating, and there's nothing to wait for
+        future.SetResult(None)
+    return future
@@ -0,0 +1,73 @@
+"""
+Overhead of the await machinery with 100 objects all in the middle of scripted, waiting sequences: each round, every
+handler's coroutine resumes from an awaited animation or Wait(), and suspends again at its next await.  The Runner
+and real animations need a wx.App, so this steps the coroutines the way Runner.StepHandlerTask() does, with stand-ins
+for the proxy and the Runner's Wait().
+"""
+
+import types
+from common import Timed, Report
+import handlerCompiler
+from asyncHandlers import HandlerFuture
+
+OBJECTS = 100
+ROUNDS = 50
+
+HANDLER = """
+for i in range(ROUNDS):
+    await self.AnimatePosition(0.1, (i, i))
+    await Wait(0.1)
+"""
+
+
+class Model(object):
+    def __init__(self):
+        self.lastAnimation = None
+
+
+class Proxy(object):
+    def __init__(self, pending):
+        self._model = Model()
+        self.pending = pending
+
+    def AnimatePosition(self, duration, endPosition, onFinished=None, *args, easing=None, **kwargs):
+        self._model.lastAnimation = {}
+        self.pending.append(onFinished)
+
+
+class Waiter(object):
+    def __init__(self, pending):
+        self.pending = pending
+
+    def Wait(self, delay):
+        pass
+
+    def WaitAsync(self, delay):
+        future = HandlerFuture()
+        self.pending.append(future.SetResult)
+        return future
+
+
+def Step(coro, value=None):
+    try:
+        awaited = coro.send(value)
+    except StopIteration:
+        return
+    awaited.AddCallback(lambda future: Step(coro, future.result))
+
+
+def RunAll():
+    code = handlerCompiler.CompileHandler(HANDLER, "OnSetup", "bench.OnSetup")
+    pending = []
+    waiter = Waiter(pending)
+    for n in range(OBJECTS):
+        clientVars = {"self": Proxy(pending), "Wait": waiter.Wait, "ROUNDS": ROUNDS}
+        Step(types.FunctionType(code, clientVars, "OnSetup")())
+    while pending:
+        ready = pending[:]
+        del pending[:]
+        for finish in ready:
+            finish()
+
+
+Report(f"{OBJECTS} objects x {ROUNDS} animate+wait rounds", Timed(RunAll), OBJECTS * ROUNDS * 2)
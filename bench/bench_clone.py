@@ -0,0 +1,43 @@
+"""
+Cost of copying an object's model for Clone(): the old serialize/deserialize path, GetData() + ModelFromData(),
+versus the direct SetFromModel() copy, and reusing a recycled model.  Needs wxPython installed, since the models
+use wx points and sizes, but doesn't need a wx.App.
+"""
+
+from common import Timed, Report
+import generator
+
+COUNT = 2000
+
+source = generator.StackGenerator.ModelFromType(None, "rect")
+source.SetProperty("name", "bullet", notify=False)
+source.SetProperty("position", (10, 20), notify=False)
+source.SetProperty("size", (8, 8), notify=False)
+source.SetProperty("data", {"damage": 3, "owner": "ship", "path": [(1, 2), (3, 4)]}, notify=False)
+source.handlers["OnPeriodic"] = "self.position.y -= 5\nif self.position.y < 0:\n    self.Recycle()"
+source.points = [(0, 0), (8, 8)]
+
+
+def SerializeCopies():
+    for i in range(COUNT):
+        generator.StackGenerator.ModelFromData(None, source.GetData())
+
+
+def DirectCopies():
+    for i in range(COUNT):
+        generator.StackGenerator.ModelFromType(None, source.type).SetFromModel(source)
+
+
+pool = [generator.StackGenerator.ModelFromType(None, source.type) for i in range(COUNT)]
+
+
+def RecycledCopies():
+    for model in pool:
+        model.generation += 1
+        model.SetFromModel(source)
+
+
+print(f"{COUNT} copies of a rect model")
+Report("GetData() + ModelFromData()", Timed(SerializeCopies), COUNT)
+Report("ModelFromType() + SetFromModel()", Timed(DirectCopies), COUNT)
+Report("reused model + SetFromModel()", Timed(RecycledCopies), COUNT)
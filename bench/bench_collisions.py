@@ -0,0 +1,73 @@
+"""
+The engine's collision pass for OnCollision, on a card with 500 moving objects: stepping their physics, and then
+finding all touching pairs with sweep-and-prune and a narrowphase check, compared to checking every pair like stacks
+used to do with IsTouching() in OnPeriodic.
+"""
+
+import random
+import threading
+from common import Timed, Report
+import geometry
+import physics
+
+OBJECTS = 500
+CARD_SIZE = (2000, 2000)
+
+random.seed(1)
+
+
+class Model(object):
+    """ Just the properties physics.Body reads and writes. """
+    def __init__(self, x, y):
+        self.position = (x, y)
+        self.motionLock = threading.RLock()
+        self.properties = {"size": (30, 30), "speed": (random.uniform(-200, 200), random.uniform(-200, 200)),
+                           "acceleration": (0, 0), "gravity": 0, "friction": 0, "bounceOnEdges": True}
+
+    def GetAbsoluteXY(self):
+        return self.position
+
+    def SetAbsolutePosition(self, pos):
+        self.position = tuple(pos)
+
+    def GetProperty(self, key):
+        return self.properties[key]
+
+    def SetProperty(self, key, value, notify=True):
+        self.properties[key] = tuple(value)
+
+
+models = [Model(random.uniform(0, CARD_SIZE[0]), random.uniform(0, CARD_SIZE[1])) for i in range(OBJECTS)]
+
+
+def Shapes():
+    return [(m, [geometry.RectHitShape(m.position[0], m.position[1], 30, 30)]) for m in models]
+
+
+def StepPhysics():
+    bodies = [physics.Body(m) for m in models]
+    physics.StepBodies(bodies, 1 / 60, CARD_SIZE)
+    for b in bodies:
+        b.WriteBack()
+
+
+def Broadphase():
+    shapes = dict(Shapes())
+    items = [(geometry.ShapesBBox(s), m) for m, s in shapes.items()]
+    return [(a, b) for a, b in geometry.SweepAndPrune(items) if geometry.ShapesTouch(shapes[a], shapes[b])]
+
+
+def AllPairs():
+    shapes = Shapes()
+    touching = []
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            if geometry.ShapesTouch(shapes[i][1], shapes[j][1]):
+                touching.append((shapes[i][0], shapes[j][0]))
+    return touching
+
+
+assert len(Broadphase()) == len(AllPairs())
+Report(f"{OBJECTS} moving objects: physics step", Timed(StepPhysics))
+Report(f"{OBJECTS} objects: sweep-and-prune + narrowphase", Timed(Broadphase))
+Report(f"{OBJECTS} objects: check every pair", Timed(AllPairs, repeat=2))
@@ -0,0 +1,46 @@
+"""
+Startup cost of getting code for every handler in the example stacks: compiling them all from scratch, versus
+loading a saved compile cache and looking each one up.
+"""
+
+import os
+import tempfile
+from common import ExampleHandlers, Timed, Report
+import compileCache
+import handlerCompiler
+
+handlers = list(ExampleHandlers())
+
+
+def CompileAll():
+    for filename, handlerName, handlerStr in handlers:
+        try:
+            handlerCompiler.CompileHandler(handlerCompiler.NormalizeSource(handlerStr), handlerName, filename)
+        except (SyntaxError, ValueError):
+            pass
+
+
+cache = compileCache.CompileCache(None)
+for filename, handlerName, handlerStr in handlers:
+    try:
+        cache.GetCode(handlerStr, handlerName, filename)
+    except (SyntaxError, ValueError):
+        pass
+path = os.path.join(tempfile.mkdtemp(), "examples.cdsc")
+cache.Write(path)
+
+
+def LoadCached():
+    loaded = compileCache.CompileCache(None)
+    loaded.Load(path)
+    for filename, handlerName, handlerStr in handlers:
+        try:
+            loaded.GetCode(handlerStr, handlerName, filename)
+        except (SyntaxError, ValueError):
+            pass
+    assert not loaded.isDirty, "every handler should hit the cache"
+
+
+print(f"{len(handlers)} handlers from examples/*.cds")
+Report("compile every handler", Timed(CompileAll), len(handlers))
+Report("load cache file + look up every handler", Timed(LoadCached), len(handlers))
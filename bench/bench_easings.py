@@ -0,0 +1,29 @@
+"""
+Easing a tick's worth of tweens: one EaseAll() batch, versus calling Ease() per tween.  EaseAll() uses numpy when it's
+installed and the batch is big enough, and plain python otherwise.
+"""
+
+import random
+from common import Timed, Report
+import easings
+
+TICKS = 100
+
+random.seed(1)
+
+for count in [10, 100, 1000]:
+    ids = [random.randrange(len(easings.EASING_NAMES)) for i in range(count)]
+    progresses = [random.random() for i in range(count)]
+
+    def PerTween():
+        for tick in range(TICKS):
+            [easings.Ease(e, t) for e, t in zip(ids, progresses)]
+
+    def Batched():
+        for tick in range(TICKS):
+            easings.EaseAll(ids, progresses)
+
+    Report(f"{count} tweens x {TICKS} ticks: Ease() each", Timed(PerTween), count * TICKS)
+    Report(f"{count} tweens x {TICKS} ticks: EaseAll()", Timed(Batched), count * TICKS)
+
+print("numpy available" if easings.NUMPY_AVAILABLE else "numpy not installed, so EaseAll() uses plain python")
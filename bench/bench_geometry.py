@@ -0,0 +1,54 @@
+"""
+IsTouching() pair checks per second, answered on the runner thread with the pure python geometry, versus sending each
+check to the main thread and waiting for its answer, the way @RunOnMain calls do.  The main thread here is a plain
+thread serving a queue, like wx.CallAfter does, so this measures the round trip itself, and leaves out the wx event
+loop's own latency and the old wx.Region rasterizing, which would only make the old way slower.
+"""
+
+import queue
+import random
+import threading
+from common import Timed, Report
+import geometry
+
+random.seed(1)
+
+
+def RandomShapes():
+    x, y = random.uniform(0, 100), random.uniform(0, 100)
+    kind = random.choice(["rect", "oval", "line"])
+    if kind == "rect":
+        return [geometry.RectHitShape(x, y, 30, 20)]
+    elif kind == "oval":
+        return [geometry.HitShape(geometry.OvalPoints(x, y, x + 30, y + 30), closed=True, filled=True, radius=1)]
+    return [geometry.HitShape([(x, y), (x + 40, y + 25)], radius=4)]
+
+
+pairs = [(RandomShapes(), RandomShapes()) for i in range(1000)]
+
+callQueue = queue.Queue()
+returnQueue = queue.Queue()
+
+
+def MainLoop():
+    while True:
+        func, args = callQueue.get()
+        returnQueue.put(func(*args))
+
+
+threading.Thread(target=MainLoop, daemon=True).start()
+
+
+def OnRunnerThread():
+    for a, b in pairs:
+        geometry.ShapesTouch(a, b)
+
+
+def ThroughMainThread():
+    for a, b in pairs:
+        callQueue.put((geometry.ShapesTouch, (a, b)))
+        returnQueue.get()
+
+
+Report(f"{len(pairs)} pair checks, waiting on the main thread", Timed(ThroughMainThread), len(pairs))
+Report(f"{len(pairs)} pair checks on the runner thread", Timed(OnRunnerThread), len(pairs))
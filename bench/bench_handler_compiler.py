@@ -0,0 +1,58 @@
+"""
+Per-event cost of running a handler: exec() of its source, the way handlers first ran, compiling it every time,
+then exec() of cached module-level code, versus calling the function that handlerCompiler wraps the handler's code
+in.  Also times compiling each way over the example stacks.
+"""
+
+import types
+from common import ExampleHandlers, Timed, Report
+import handlerCompiler
+
+CALLS = 100000
+HANDLER = "speed = 3\nif speed > 2:\n    speed -= 1\ncount = count + speed"
+
+moduleCode = compile(HANDLER, "card_1.button_1.OnClick", "exec")
+funcCode = handlerCompiler.CompileHandler(HANDLER, "OnClick", "card_1.button_1.OnClick")
+clientVars = {"count": 0}
+handlerFunc = types.FunctionType(funcCode, clientVars, "OnClick")
+
+
+def RunSource():
+    for i in range(CALLS):
+        exec(HANDLER, clientVars)
+
+
+def RunExec():
+    for i in range(CALLS):
+        exec(moduleCode, clientVars)
+
+
+def RunFunction():
+    for i in range(CALLS):
+        handlerFunc()
+
+
+handlers = [(f, n, handlerCompiler.NormalizeSource(s)) for f, n, s in ExampleHandlers()]
+
+
+def CompileModules():
+    for filename, handlerName, handlerStr in handlers:
+        try:
+            compile(handlerStr, filename, "exec")
+        except (SyntaxError, ValueError):
+            pass
+
+
+def CompileFunctions():
+    for filename, handlerName, handlerStr in handlers:
+        try:
+            handlerCompiler.CompileHandler(handlerStr, handlerName, filename)
+        except (SyntaxError, ValueError):
+            pass
+
+
+Report("exec() source, compiling on every event", Timed(RunSource, repeat=1), CALLS)
+Report("exec() cached module code", Timed(RunExec), CALLS)
+Report("call wrapped handler function", Timed(RunFunction), CALLS)
+Report(f"compile {len(handlers)} handlers as module code", Timed(CompileModules), len(handlers))
+Report(f"compile {len(handlers)} handlers as functions", Timed(CompileFunctions), len(handlers))
@@ -0,0 +1,36 @@
+"""
+RunInProcess() throughput: a batch of CPU-heavy calls to a function defined in a handler, run one after another
+on this thread, versus packed up with processWorker and run across a pool of spawned worker processes.
+"""
+
+import os
+import multiprocessing
+from time import perf_counter
+from common import Report
+import processWorker
+
+CALLS = 16
+N = 300000
+
+# Like a function a handler defines, living in the stack's variables instead of in a real module
+stackVars = {}
+exec("import math\n"
+     "def Crunch(n):\n"
+     "    return sum(math.sqrt(i) for i in range(n))\n", stackVars)
+Crunch = stackVars["Crunch"]
+
+
+if __name__ == "__main__":
+    start = perf_counter()
+    serial = [Crunch(N) for i in range(CALLS)]
+    Report(f"{CALLS} calls on one thread", perf_counter() - start, CALLS)
+
+    pool = multiprocessing.get_context("spawn").Pool()
+    pool.apply(processWorker.RunPackedCall, (processWorker.PackCall(Crunch, (1,), {}),))  # Let the workers start up
+    start = perf_counter()
+    results = [pool.apply_async(processWorker.RunPackedCall, (processWorker.PackCall(Crunch, (N,), {}),))
+               for i in range(CALLS)]
+    results = [r.get() for r in results]
+    Report(f"{CALLS} calls across {os.cpu_count()} worker processes", perf_counter() - start, CALLS)
+    pool.terminate()
+    assert results == serial
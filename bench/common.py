@@ -0,0 +1,45 @@
+"""
+Shared helpers for the scripts in bench/.  Run any of them from the repo root, like:  python bench/bench_compile.py
+These only use modules that work without a wx.App, so they can run headless.
+"""
+
+import os
+import sys
+import glob
+import json
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def ExampleHandlers():
+    """ Yields (filename, handlerName, handlerStr) for every non-empty handler in the example stacks. """
+    def walk(data, path):
+        name = data.get("properties", {}).get("name", "stack")
+        path = path + [name] if data.get("type") != "stack" else path
+        for handlerName, handlerStr in data.get("handlers", {}).items():
+            if handlerStr.strip():
+                yield (".".join(path + [handlerName]), handlerName, handlerStr)
+        for child in data.get("cards", []) + data.get("childModels", []):
+            yield from walk(child, path)
+
+    for stackPath in sorted(glob.glob(os.path.join(ROOT, "examples", "*.cds"))):
+        with open(stackPath) as f:
+            yield from walk(json.load(f), [])
+
+
+def Timed(func, repeat=5):
+    """ Returns the best time in seconds of repeat runs of func(). """
+    best = None
+    for i in range(repeat):
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def Report(label, seconds, count=None):
+    perItem = f"  ({seconds / count * 1e6:.1f} us each)" if count else ""
+    print(f"{label:<48} {seconds * 1000:9.3f} ms{perItem}")
@@ -3,9 +3,11 @@ Modified from the Killable Threads post by tomer filiba:
 http://tomerfiliba.com/recipes/Thread2/
 """
 
+import sys
 import threading
 import inspect
 import queue
+import collections
 from wx import CallAfter
 import ctypes
 
@@ -34,6 +36,13 @@ class CodeRunnerThread(threading.Thread):
         self.returnQueue = queue.Queue()
         self.is_terminated = False
 
+        # Async main-thread calls wait here until the main thread drains them once per frame, in DrainMainQueue()
+        # deque appends and pops are atomic, so the runner thread doesn't need to lock per call.
+        self.mainQueue = collections.deque()
+        self.mainQueueStats = {"enqueued": 0, "delivered": 0, "coalesced": 0}
+        # Set on this thread when we post a wake-up to the main thread, and cleared on the main thread when it runs
+        self.wakePending = False
+
     def _get_my_tid(self):
         """determines this (self's) thread id"""
         if not self.is_alive():
@@ -55,6 +64,51 @@ class CodeRunnerThread(threading.Thread):
         """raises the given exception type in the context of this thread"""
         _async_raise(self._get_my_tid(), exctype)
 
+    def EnqueueOnMain(self, coalesceKey, func, args, kwargs):
+        # On this runner thread
+        self.mainQueue.append((coalesceKey, func, args, kwargs))
+        self.mainQueueStats["enqueued"] += 1
+        if not self.wakePending:
+            # Post one wake-up when the queue starts filling, so calls run as soon as the main thread is free,
+            # instead of waiting for the next frame.  Everything queued until then still runs as one batch.
+            self.wakePending = True
+            CallAfter(self.OnWake)
+
+    def OnWake(self):
+        # On Main thread.  Clear the flag before draining, so anything queued from here on posts a new wake-up.
+        self.wakePending = False
+        if self.is_alive():  # Once the stack has stopped, leftover calls are dropped, like with the timer
+            self.DrainMainQueue()
+
+    def DrainMainQueue(self):
+        """
+        On Main thread.  Run all async calls queued so far, in order.  Calls with a coalesceKey only run at the
+        position of their last occurrence, so a run of repeated notifications, like an object moving 100 times in
+        one frame, only gets delivered once.
+        """
+        count = len(self.mainQueue)
+        if not count:
+            return
+        items = [self.mainQueue.popleft() for i in range(count)]
+        lastIndexes = {}
+        for i, item in enumerate(items):
+            if item[0] is not None:
+                lastIndexes[item[0]] = i
+        for i, (coalesceKey, func, args, kwargs) in enumerate(items):
+            if self.is_terminated:
+                self.mainQueue.clear()
+                return
+            if coalesceKey is not None and lastIndexes[coalesceKey] != i:
+                self.mainQueueStats["coalesced"] += 1
+                continue
+            self.mainQueueStats["delivered"] += 1
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                # Report it the way wx reports an exception from a CallAfter, and keep going, so one failed call
+                # doesn't drop the rest of the batch
+                sys.excepthook(*sys.exc_info())
+
     def terminate(self):
         """raises SystemExit in the context of the given thread, which should
         cause the thread to exit silently (unless caught)"""
@@ -73,6 +127,11 @@ def to_main_sync(func, *args, **kwargs):
     if threading.current_thread() == threading.main_thread():
         # on main thread
         return func(*args, **kwargs)
+    elif not isinstance(threading.current_thread(), CodeRunnerThread):
+        # on some other thread, like a RunInBackground() worker, which has no returnQueue of its own
+        returnQueue = queue.Queue()
+        CallAfter(to_main_sync_other_helper, returnQueue, func, *args, **kwargs)
+        return returnQueue.get()
     else:
         # on non-main thread
         thread = threading.current_thread()
@@ -88,6 +147,8 @@ def to_main_sync_helper(thread, func, *args, **kwargs):
     # On main thread
     if not thread.is_terminated:
         try:
+            # Run any earlier async calls first, so everything lands on the main thread in the order it was called
+            thread.DrainMainQueue()
             ret = func(*args, **kwargs)
             thread.returnQueue.put(ret) # send return value to calling thread
         except Exception as e:
@@ -97,6 +158,15 @@ def to_main_sync_helper(thread, func, *args, **kwargs):
         thread.returnQueue.put(None) # send empty return value to calling thread
 
 
+def to_main_sync_other_helper(returnQueue, func, *args, **kwargs):
+    # On main thread
+    ret = None
+    try:
+        ret = func(*args, **kwargs)
+    finally:
+        returnQueue.put(ret)
+
+
 def RunOnMain(func):
     """ Used as a decorator, to make Proxy object functions run on the main thread. """
     def wrapper_run_on_main(*args, **kwargs):
@@ -106,31 +176,44 @@ def RunOnMain(func):
 
 # -----------------------------------------
 # Build the @RunOnMainAsync decorator, to run the function on the Main thread, and let the runnerThread continue
-# without waiting for a return value -- no queue needed
+# without waiting for a return value.  These calls get batched up in the runnerThread's mainQueue, and run together
+# as soon as the main thread is free, or at the latest when the StackManager's timer calls DrainMainQueue().
 
 
 def to_main_async(func, *args, **kwargs):
-    """Run a function on the main thread, and await its return value so we can return it on the calling thread"""
+    """Queue up a function to run on the main thread, without waiting for it to run"""
+    to_main_async_coalesced(None, func, *args, **kwargs)
+
+
+def to_main_async_coalesced(coalesceKey, func, *args, **kwargs):
+    """Like to_main_async(), but if a call with the same coalesceKey is still waiting to run, only run the later one"""
     if threading.current_thread() == threading.main_thread():
         # on main thread
         func(*args, **kwargs)
+    elif not isinstance(threading.current_thread(), CodeRunnerThread):
+        # on some other thread, like a RunInBackground() worker, which has no mainQueue to batch into
+        CallAfter(func, *args, **kwargs)
     else:
         # on non-main thread
         thread = threading.current_thread()
         # no more to_main calls once we're terminated
         if not thread.is_terminated:
-            CallAfter(to_main_async_helper, thread, func, *args, **kwargs)
+            thread.EnqueueOnMain(coalesceKey, func, args, kwargs)
         return None
 
 
-def to_main_async_helper(thread, func, *args, **kwargs):
-    # On main thread
-    if not thread.is_terminated:
-        func(*args, **kwargs)
-
-
 def RunOnMainAsync(func):
     """ Used as a decorator, to make Proxy object functions run on the main thread. """
     def wrapper_run_on_main_async(*args, **kwargs):
         return to_main_async(func, *args, **kwargs)
     return wrapper_run_on_main_async
+
+
+def RunOnMainCoalesced(func):
+    """
+    Used as a decorator, like @RunOnMainAsync, but for notifications where only the last of several identical
+    calls waiting to run matters, like a property changed notification, which reads the property's latest value.
+    """
+    def wrapper_run_on_main_coalesced(*args):
+        return to_main_async_coalesced((func, args), func, *args)
+    return wrapper_run_on_main_coalesced
@@ -0,0 +1,137 @@
+import os
+import marshal
+import hashlib
+import importlib.util
+import types
+import handlerCompiler
+
+# Bump this whenever handlerCompiler changes what it generates, to invalidate old caches
+CACHE_VERSION = 4
+CACHE_HEADER = b"CSCC" + CACHE_VERSION.to_bytes(2, "little") + importlib.util.MAGIC_NUMBER
+
+
+class CompileCache(object):
+    """
+    An on-disk cache of compiled handler code, like python's __pycache__, so that opening a stack doesn't need to
+    recompile every handler again.  Entries are keyed by a hash of the handler's source code and its filename, so a
+    cache can never hand back stale code, and a cache written by a different python version is just ignored.
+
+    A stack's cache is read from the user's cache directory, which is also where we save it.  Exported apps also
+    ship with a .cdsc file next to their .cds file, which gets read first only if trustBundled is set, since anyone
+    can put a .cdsc file next to a downloaded stack, and we'd run its code without ever seeing the source.  Both get
+    merged, so handlers that were edited after the .cdsc file was built still find their newer code in the user's cache.
+
+    Keys always use handlerCompiler.NormalizeSource(), the same form of the code the Runner compiles and runs.
+    Handlers whose code matches one already compiled, like on clones, reuse that code under their own filename.
+    """
+
+    def __init__(self, stackPath, trustBundled=False):
+        self.stackPath = stackPath
+        self.entries = {}
+        self.codeBySource = {}  # (handlerName, handlerStr) -> code, to reuse for other objects with the same handler
+        self.isDirty = False
+        if stackPath:
+            if trustBundled:
+                self.Load(self.BundledPath())
+            self.Load(self.UserCachePath())
+
+    def BundledPath(self):
+        return self.stackPath + "c"
+
+    def UserCachePath(self):
+        import wx  # Only needed here, so the rest of the cache works without a wx.App
+        name = hashlib.sha256(os.path.abspath(self.stackPath).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(wx.StandardPaths.Get().GetUserLocalDataDir(), "compileCache", name + ".cdsc")
+
+    @staticmethod
+    def Key(handlerStr, filename):
+        handlerStr = handlerCompiler.NormalizeSource(handlerStr)
+        return hashlib.sha256(f"{filename}\n{handlerStr}".encode("utf-8")).digest()
+
+    def GetCode(self, handlerStr, handlerName, filename):
+        # Raises SyntaxError for bad code, which we don't cache here
+        handlerStr = handlerCompiler.NormalizeSource(handlerStr)
+        key = self.Key(handlerStr, filename)
+        code = self.entries.get(key)
+        if code is None:
+            sameCode = self.codeBySource.get((handlerName, handlerStr))
+            if sameCode:
+                code = handlerCompiler.RenameCode(sameCode, filename)
+            else:
+                code = handlerCompiler.CompileHandler(handlerStr, handlerName, filename)
+            self.entries[key] = code
+            self.isDirty = True
+        self.codeBySource.setdefault((handlerName, handlerStr), code)
+        return code
+
+    def Forget(self, handlerStr, filename):
+        # Drop the code for a removed object's handler.  Save() would prune it anyway, but clones can pile up until then.
+        self.entries.pop(self.Key(handlerStr, filename), None)
+
+    def Load(self, path):
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(CACHE_HEADER)) != CACHE_HEADER:
+                    return False
+                entries = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if not isinstance(entries, dict):
+            return False
+        # Skip anything that isn't a cached handler, so a damaged file can't hand the Runner something it can't run
+        entries = {k: v for k, v in entries.items() if isinstance(k, bytes) and isinstance(v, types.CodeType)}
+        self.entries.update(entries)  # Later caches win, but entries are keyed by source, so they never conflict
+        return True
+
+    def Write(self, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmpPath = path + ".tmp"
+            with open(tmpPath, "wb") as f:
+                f.write(CACHE_HEADER)
+                marshal.dump(self.entries, f)
+            os.replace(tmpPath, path)
+        except OSError:
+            return False
+        return True
+
+    def CompileAll(self, stackModel):
+        """ Compile every handler in the stack, and drop entries for handler code that no longer exists. """
+        validKeys = set()
+        for model, handlerName, handlerStr in self.AllHandlers(stackModel):
+            filename = handlerCompiler.HandlerFilename(model, handlerName)
+            try:
+                self.GetCode(handlerStr, handlerName, filename)
+                validKeys.add(self.Key(handlerStr, filename))
+            except (SyntaxError, ValueError):
+                pass
+        for key in list(self.entries.keys()):
+            if key not in validKeys:
+                self.entries.pop(key)
+                self.isDirty = True
+
+    def Save(self, stackModel):
+        """ Save any newly compiled code into the user cache dir, pruning out code for old versions of handlers. """
+        if self.stackPath and self.isDirty:
+            validKeys = set(self.Key(handlerStr, handlerCompiler.HandlerFilename(model, handlerName))
+                            for model, handlerName, handlerStr in self.AllHandlers(stackModel))
+            self.entries = {k: v for k, v in self.entries.items() if k in validKeys}
+            if self.Write(self.UserCachePath()):
+                self.isDirty = False
+
+    @staticmethod
+    def AllHandlers(model):
+        for handlerName, handlerStr in model.handlers.items():
+            handlerStr = handlerCompiler.NormalizeSource(handlerStr)
+            if handlerStr:
+                yield (model, handlerName, handlerStr)
+        for child in model.childModels:
+            yield from CompileCache.AllHandlers(child)
+
+
+def BuildBundledCache(stackModel, stackPath):
+    """ Precompile all of a stack's handlers into a .cdsc file next to stackPath, for exporting. """
+    cache = CompileCache(None)
+    cache.stackPath = stackPath
+    cache.CompileAll(stackModel)
+    return cache.Write(cache.BundledPath())
@@ -0,0 +1,104 @@
+import threading
+import heapq
+from time import time
+
+
+class DelayedCall(object):
+    """ The handle that RunAfterDelay() returns to stack code, so it can Cancel() the call before it runs. """
+
+    def __init__(self, queue, fireTime, func, args, kwargs, owner=None):
+        self.queue = queue
+        self.fireTime = fireTime
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        # The model whose handler scheduled this call.  If it gets recycled into a new object, the call is dropped.
+        self.owner = owner
+        self.ownerGeneration = owner.generation if owner else None
+        self.isCancelled = False
+        self.didRun = False
+
+    def Cancel(self):
+        """ Stop this call from running, if it hasn't run yet.  Returns True if it was still waiting to run. """
+        wasPending = not self.isCancelled and not self.didRun
+        self.isCancelled = True
+        # Let go of the function and its args now, in case they hold onto lots of data
+        self.func = self.args = self.kwargs = self.owner = None
+        if wasPending and self.queue:
+            self.queue.NoteCancelled()
+        return wasPending
+
+    @property
+    def isPending(self):
+        return not self.isCancelled and not self.didRun
+
+    def Take(self):
+        """
+        On Runner thread.  Mark this call as run, and return its (func, args, kwargs) for the Runner to call, or None
+        if it got cancelled, or the object that scheduled it got recycled, before it could run.
+        """
+        if not self.isPending:
+            return None
+        func, args, kwargs = self.func, self.args, self.kwargs
+        self.didRun = True
+        self.func = self.args = self.kwargs = None
+        owner, self.owner = self.owner, None
+        if owner and owner.generation != self.ownerGeneration:
+            return None
+        return (func, args, kwargs)
+
+
+class DelayedCallQueue(object):
+    """
+    All of a running stack's RunAfterDelay() calls, in one heap ordered by when they should fire.  The StackManager's
+    periodic tick calls PopDue() to collect every call that's come due since the last tick, and hands them to the
+    runner thread together, so we don't need a separate wx.Timer for each call.  Cancelled calls are dropped from the
+    heap as they reach the front, or all at once if they start to pile up.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.heap = []
+        self.seq = 0
+        self.numCancelled = 0
+
+    def Add(self, delay, func, args, kwargs, owner=None):
+        call = DelayedCall(self, time() + delay, func, args, kwargs, owner)
+        with self.lock:
+            self.seq += 1
+            heapq.heappush(self.heap, (call.fireTime, self.seq, call))
+        return call
+
+    def NoteCancelled(self):
+        with self.lock:
+            self.numCancelled += 1
+            if self.numCancelled > 64 and self.numCancelled > len(self.heap) // 2:
+                self.heap = [entry for entry in self.heap if not entry[2].isCancelled]
+                heapq.heapify(self.heap)
+                self.numCancelled = 0
+
+    def PopDue(self, now):
+        """ Remove and return all calls that should have fired by now, in order. """
+        due = []
+        with self.lock:
+            heap = self.heap
+            while heap and heap[0][0] <= now:
+                call = heapq.heappop(heap)[2]
+                if call.isCancelled:
+                    self.numCancelled = max(0, self.numCancelled - 1)
+                else:
+                    call.queue = None  # It's out of the heap now, so Cancel() doesn't need to tell us
+                    due.append(call)
+        return due
+
+    def Clear(self):
+        with self.lock:
+            heap = self.heap
+            self.heap = []
+            self.numCancelled = 0
+        for entry in heap:
+            entry[2].queue = None
+            entry[2].Cancel()
+
+    def __len__(self):
+        return len(self.heap)
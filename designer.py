@@ -12,6 +12,7 @@ import sys
 import json
 import configparser
 import wx
+import multiprocessing
 from time import sleep
 import version
 from tools import *
@@ -860,6 +861,8 @@ class DesignerApp(wx.App, InspectionMixin):
 
 
 if __name__ == '__main__':
+    # Let RunInProcess() worker processes start up correctly, including from frozen apps
+    multiprocessing.freeze_support()
     app = DesignerApp(redirect=False)
 
     if len(sys.argv) > 1 and not app.argFilename:
@@ -0,0 +1,79 @@
+"""
+Easing curves for animations.  Each curve maps a linear progress value from 0.0 to 1.0 into an eased progress
+value, which always starts at 0.0 and ends at 1.0.  The animation engine collects every running tween's progress
+each tick, and eases them all in one batch with EaseAll(), using numpy when it's available and there are enough
+tweens running to make it worthwhile.
+"""
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ModuleNotFoundError:
+    NUMPY_AVAILABLE = False
+
+# Below this many tweens in a tick, plain python is faster than setting up numpy arrays
+NUMPY_MIN_BATCH = 32
+
+EASING_NAMES = ["Linear", "EaseIn", "EaseOut", "EaseInOut", "Bounce"]
+LINEAR, EASE_IN, EASE_OUT, EASE_IN_OUT, BOUNCE = range(len(EASING_NAMES))
+
+
+def EasingId(name):
+    """ Returns the easing id for a user-supplied easing name, raising if it's not a known easing. """
+    if name is None:
+        return LINEAR
+    if not isinstance(name, str):
+        raise TypeError("easing must be a string")
+    for i, easingName in enumerate(EASING_NAMES):
+        if name.lower() == easingName.lower():
+            return i
+    raise ValueError(f"easing must be one of {', '.join(EASING_NAMES)}")
+
+
+def BounceOut(t):
+    n = 7.5625
+    d = 2.75
+    if t < 1 / d:
+        return n * t * t
+    elif t < 2 / d:
+        t -= 1.5 / d
+        return n * t * t + 0.75
+    elif t < 2.5 / d:
+        t -= 2.25 / d
+        return n * t * t + 0.9375
+    t -= 2.625 / d
+    return n * t * t + 0.984375
+
+
+def Ease(easingId, t):
+    if easingId == EASE_IN:
+        return t * t * t
+    elif easingId == EASE_OUT:
+        return 1 - (1 - t) ** 3
+    elif easingId == EASE_IN_OUT:
+        return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+    elif easingId == BOUNCE:
+        return BounceOut(t)
+    return t
+
+
+def EaseAll(easingIds, progresses):
+    """ Eases each progress value by the matching easing id, and returns the list of eased values. """
+    if NUMPY_AVAILABLE and len(progresses) >= NUMPY_MIN_BATCH:
+        return EaseArray(numpy.asarray(easingIds), numpy.asarray(progresses, dtype=float)).tolist()
+    return [Ease(e, t) for e, t in zip(easingIds, progresses)]
+
+
+def EaseArray(ids, t):
+    inv = 1 - t
+    b = numpy.select([t < 1 / 2.75, t < 2 / 2.75, t < 2.5 / 2.75],
+                     [7.5625 * t * t,
+                      7.5625 * (t - 1.5 / 2.75) ** 2 + 0.75,
+                      7.5625 * (t - 2.25 / 2.75) ** 2 + 0.9375],
+                     7.5625 * (t - 2.625 / 2.75) ** 2 + 0.984375)
+    return numpy.select([ids == EASE_IN, ids == EASE_OUT, ids == EASE_IN_OUT, ids == BOUNCE],
+                        [t * t * t,
+                         1 - inv ** 3,
+                         numpy.where(t < 0.5, 4 * t * t * t, 1 - (-2 * t + 2) ** 3 / 2),
+                         b],
+                        t)
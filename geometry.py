@@ -0,0 +1,230 @@
+"""
+Collision geometry for CardStock objects, used by IsTouching() and IsTouchingPoint().
+
+Every object's hit area is described by a list of HitShapes in card coordinates.  A HitShape is a polyline or
+polygon, optionally filled, with a stroke radius around its edges (half of the object's pen thickness).  Ovals and
+round-rect corners get approximated by polygons.  Plain object frames use RectHitShape, which keeps the fast,
+half-open rect overlap rules that wx.Rect uses.  Each shape has a bounding box for early-outs, and long strokes are
+compared using a sweep over their segments' bounding boxes, so pen strokes with thousands of points stay fast.
+
+This is pure python, so it's safe to run on the runner thread.
+"""
+
+import math
+
+
+class HitShape(object):
+    def __init__(self, points, closed=False, filled=False, radius=0):
+        self.points = [(float(p[0]), float(p[1])) for p in points]
+        self.closed = closed and len(self.points) > 2
+        self.filled = filled and self.closed
+        self.radius = radius
+        self.segments = None
+        if self.points:
+            xs = [p[0] for p in self.points]
+            ys = [p[1] for p in self.points]
+            self.bbox = (min(xs) - radius, min(ys) - radius, max(xs) + radius, max(ys) + radius)
+        else:
+            self.bbox = None
+
+    def GetSegments(self):
+        if self.segments is None:
+            pts = self.points
+            if len(pts) == 1:
+                segs = [(pts[0], pts[0])]
+            else:
+                segs = list(zip(pts[:-1], pts[1:]))
+                if self.closed:
+                    segs.append((pts[-1], pts[0]))
+            self.segments = segs
+        return self.segments
+
+    def BoxIntersects(self, other):
+        a = self.bbox
+        b = other.bbox
+        return a is not None and b is not None and a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+    def ContainsPoint(self, x, y):
+        b = self.bbox
+        if b is None or x < b[0] or x > b[2] or y < b[1] or y > b[3]:
+            return False
+        if self.filled and PointInPolygon(x, y, self.points):
+            return True
+        r2 = self.radius * self.radius
+        return any(PointSegmentDist2(x, y, p, q) <= r2 for p, q in self.GetSegments())
+
+    def Touches(self, other):
+        if isinstance(other, RectHitShape) and not isinstance(self, RectHitShape):
+            return other.Touches(self)
+        if not self.BoxIntersects(other):
+            return False
+        # One filled shape holding any part of the other one
+        if self.filled and PointInPolygon(other.points[0][0], other.points[0][1], self.points):
+            return True
+        if other.filled and PointInPolygon(self.points[0][0], self.points[0][1], other.points):
+            return True
+        # Otherwise some edges need to come within both strokes' radii of each other
+        return SegmentsWithinDist(self.GetSegments(), other.GetSegments(), self.radius + other.radius,
+                                  self.bbox, other.bbox)
+
+
+class RectHitShape(HitShape):
+    """ A filled rect, with no stroke, that follows wx.Rect's rules: left/bottom edges are in, right/top are out. """
+    def __init__(self, x, y, width, height):
+        super().__init__([(x, y), (x+width, y), (x+width, y+height), (x, y+height)], True, True, 0)
+        self.rect = (x, y, x+width, y+height)
+
+    def ContainsPoint(self, x, y):
+        r = self.rect
+        return r[0] <= x < r[2] and r[1] <= y < r[3]
+
+    def Touches(self, other):
+        r = self.rect
+        if isinstance(other, RectHitShape):
+            o = other.rect
+            return r[0] < o[2] and o[0] < r[2] and r[1] < o[3] and o[1] < r[3]
+        if not self.BoxIntersects(other):
+            return False
+        if any(self.ContainsPoint(p[0], p[1]) for p in other.points):
+            return True
+        if other.filled and PointInPolygon(r[0], r[1], other.points):
+            return True
+        rad2 = other.radius * other.radius
+        for p, q in other.GetSegments():
+            if SegmentRectDist2(p, q, r) <= rad2:
+                return True
+        return False
+
+
+def ShapesBBox(shapes):
+    boxes = [s.bbox for s in shapes if s.bbox is not None]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def SweepAndPrune(items):
+    """
+    Broadphase collision pass.  items is a list of (bbox, value).  Returns a list of (valueA, valueB) pairs whose
+    bounding boxes overlap, found by sorting on the boxes' left edges, and sweeping across x.
+    """
+    items = sorted(items, key=lambda item: item[0][0])
+    pairs = []
+    active = []
+    for box, value in items:
+        active = [a for a in active if a[0][2] >= box[0]]
+        for aBox, aValue in active:
+            if aBox[1] <= box[3] and box[1] <= aBox[3]:
+                pairs.append((aValue, value))
+        active.append((box, value))
+    return pairs
+
+
+def ShapesTouch(shapesA, shapesB):
+    return any(a.Touches(b) for a in shapesA for b in shapesB)
+
+
+def ShapesContainPoint(shapes, x, y):
+    return any(s.ContainsPoint(x, y) for s in shapes)
+
+
+def PointInPolygon(x, y, points):
+    # Even-odd rule, to match how wx fills polygons
+    inside = False
+    j = len(points) - 1
+    for i in range(len(points)):
+        xi, yi = points[i]
+        xj, yj = points[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def PointSegmentDist2(x, y, p, q):
+    dx = q[0] - p[0]
+    dy = q[1] - p[1]
+    lenSq = dx*dx + dy*dy
+    t = 0 if lenSq == 0 else max(0, min(1, ((x - p[0]) * dx + (y - p[1]) * dy) / lenSq))
+    ex = p[0] + t*dx - x
+    ey = p[1] + t*dy - y
+    return ex*ex + ey*ey
+
+
+def SegmentsCross(p1, p2, q1, q2):
+    def orient(a, b, c):
+        return (b[0]-a[0]) * (c[1]-a[1]) - (b[1]-a[1]) * (c[0]-a[0])
+    d1 = orient(q1, q2, p1)
+    d2 = orient(q1, q2, p2)
+    d3 = orient(p1, p2, q1)
+    d4 = orient(p1, p2, q2)
+    return ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4))
+
+
+def SegmentDist2(p1, p2, q1, q2):
+    if SegmentsCross(p1, p2, q1, q2):
+        return 0
+    return min(PointSegmentDist2(p1[0], p1[1], q1, q2), PointSegmentDist2(p2[0], p2[1], q1, q2),
+               PointSegmentDist2(q1[0], q1[1], p1, p2), PointSegmentDist2(q2[0], q2[1], p1, p2))
+
+
+def SegmentRectDist2(p, q, r):
+    if r[0] <= p[0] < r[2] and r[1] <= p[1] < r[3]:
+        return 0
+    corners = [(r[0], r[1]), (r[2], r[1]), (r[2], r[3]), (r[0], r[3])]
+    return min(SegmentDist2(p, q, corners[i], corners[(i+1) % 4]) for i in range(4))
+
+
+def SegmentsWithinDist(segsA, segsB, dist, boxA, boxB):
+    """
+    Returns True if any segment in segsA comes within dist of any segment in segsB.  Only segments that overlap
+    the other shape's bounding box are considered, and then we sweep across x, so we only compare pairs of
+    segments whose bounding boxes overlap.
+    """
+    def boxes(segs, otherBox, tag):
+        out = []
+        for p, q in segs:
+            x0, x1 = (p[0], q[0]) if p[0] <= q[0] else (q[0], p[0])
+            y0, y1 = (p[1], q[1]) if p[1] <= q[1] else (q[1], p[1])
+            if x0 - dist <= otherBox[2] and x1 + dist >= otherBox[0] and \
+                    y0 - dist <= otherBox[3] and y1 + dist >= otherBox[1]:
+                out.append((x0 - dist, x1 + dist, y0 - dist, y1 + dist, tag, p, q))
+        return out
+
+    events = boxes(segsA, boxB, 0) + boxes(segsB, boxA, 1)
+    events.sort(key=lambda e: e[0])
+    dist2 = dist * dist
+    active = ([], [])
+    for e in events:
+        others = active[1 - e[4]]
+        if others:
+            others[:] = [o for o in others if o[1] >= e[0]]
+            for o in others:
+                if o[2] <= e[3] and e[2] <= o[3] and SegmentDist2(e[5], e[6], o[5], o[6]) <= dist2:
+                    return True
+        active[e[4]].append(e)
+    return False
+
+
+def OvalPoints(x0, y0, x1, y1):
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    rx, ry = abs(x1 - x0) / 2, abs(y1 - y0) / 2
+    # Enough sides that the polygon stays within about a pixel of the true ellipse
+    n = max(12, min(256, int(math.pi * (rx + ry) / 4)))
+    return [(cx + rx * math.cos(2 * math.pi * i / n), cy + ry * math.sin(2 * math.pi * i / n)) for i in range(n)]
+
+
+def RoundRectPoints(x0, y0, x1, y1, radius):
+    x0, x1 = min(x0, x1), max(x0, x1)
+    y0, y1 = min(y0, y1), max(y0, y1)
+    radius = max(0, min(radius, (x1 - x0) / 2, (y1 - y0) / 2))
+    if radius == 0:
+        return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    points = []
+    n = 8
+    for cx, cy, startAngle in [(x1 - radius, y0 + radius, -math.pi/2), (x1 - radius, y1 - radius, 0),
+                               (x0 + radius, y1 - radius, math.pi/2), (x0 + radius, y0 + radius, math.pi)]:
+        for i in range(n + 1):
+            a = startAngle + (math.pi / 2) * i / n
+            points.append((cx + radius * math.cos(a), cy + radius * math.sin(a)))
+    return points
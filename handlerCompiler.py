@@ -0,0 +1,257 @@
+import ast
+import importlib
+import types
+
+
+class BoundNameCollector(ast.NodeVisitor):
+    """
+    Collect all names that a handler binds at its top level (assignments, for loops, imports, defs, etc.),
+    without descending into nested functions, lambdas, or classes, which have their own scopes.
+    """
+    def __init__(self):
+        super().__init__()
+        self.names = set()
+        self.yieldNode = None
+        self.isAsync = False
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self.names.add(node.id)
+
+    def visit_Global(self, node):
+        self.names.update(node.names)
+
+    def visit_FunctionDef(self, node):
+        self.names.add(node.name)
+        for d in node.decorator_list:
+            self.visit(d)
+        for d in node.args.defaults + [d for d in node.args.kw_defaults if d]:
+            self.visit(d)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.names.add(node.name)
+        for n in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+            self.visit(n)
+
+    def visit_Lambda(self, node):
+        for d in node.args.defaults + [d for d in node.args.kw_defaults if d]:
+            self.visit(d)
+
+    def visit_comprehension(self, node):
+        # Comprehension variables are local to the comprehension, but walrus targets inside of it are not
+        self.visit(node.iter)
+        for i in node.ifs:
+            self.visit(i)
+
+    def visit_ListComp(self, node):
+        for gen in node.generators:
+            self.visit(gen)
+        self.visit(node.elt)
+
+    visit_SetComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        for gen in node.generators:
+            self.visit(gen)
+        self.visit(node.key)
+        self.visit(node.value)
+
+    def visit_NamedExpr(self, node):
+        self.names.add(node.target.id)
+        self.visit(node.value)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.names.add(alias.asname if alias.asname else alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != "*":
+                self.names.add(alias.asname if alias.asname else alias.name)
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            self.names.add(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node):
+        if node.name:
+            self.names.add(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node):
+        if node.name:
+            self.names.add(node.name)
+
+    def visit_MatchMapping(self, node):
+        if node.rest:
+            self.names.add(node.rest)
+        self.generic_visit(node)
+
+    def visit_Yield(self, node):
+        if not self.yieldNode:
+            self.yieldNode = node
+        self.generic_visit(node)
+
+    visit_YieldFrom = visit_Yield
+
+    def visit_Await(self, node):
+        self.isAsync = True
+        self.generic_visit(node)
+
+    visit_AsyncFor = visit_Await
+    visit_AsyncWith = visit_Await
+
+
+class AwaitTransformer(ast.NodeTransformer):
+    """
+    Rewrite each  await func(...)  in the handler, and in any async functions it defines, into
+    await AwaitCall(func, ...), so that functions like Wait() that normally block can hand back something awaitable
+    instead.  See asyncHandlers.AwaitCall().  Plain functions, lambdas and class bodies can't await, so only their
+    decorators and default values, which run in the enclosing code, get visited.
+    """
+    def visit_FunctionDef(self, node):
+        for n in node.decorator_list + node.args.defaults + [d for d in node.args.kw_defaults if d]:
+            self.visit(n)
+        return node
+
+    def visit_Lambda(self, node):
+        for n in node.args.defaults + [d for d in node.args.kw_defaults if d]:
+            self.visit(n)
+        return node
+
+    def visit_ClassDef(self, node):
+        for n in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+            self.visit(n)
+        return node
+
+    def visit_Await(self, node):
+        self.generic_visit(node)
+        call = node.value
+        if isinstance(call, ast.Call):
+            awaitCall = ast.parse("__import__('asyncHandlers').AwaitCall", mode="eval").body
+            node.value = ast.copy_location(ast.Call(func=ast.copy_location(awaitCall, call),
+                                                    args=[call.func] + call.args, keywords=call.keywords), call)
+        return node
+
+
+class HandlerTransformer(ast.NodeTransformer):
+    """
+    Wrap a handler's code in a function named after the handler, so that a top-level return is just a native
+    return.  All names that the handler binds at its top level are declared global, so they still land in the
+    stack's shared variables, exactly like they did when handlers ran as module-level code.  If the handler awaits
+    anything at its top level, the wrapper is an async function, which the Runner steps as a coroutine.
+    """
+    def __init__(self, handlerName):
+        super().__init__()
+        self.handlerName = handlerName
+
+    def visit_Module(self, node):
+        collector = BoundNameCollector()
+        for stmt in node.body:
+            collector.visit(stmt)
+        if collector.yieldNode:
+            # Module-level code can't yield, so don't let the wrapper function quietly turn into a generator
+            raise SyntaxError("'yield' outside function",
+                              (None, collector.yieldNode.lineno, collector.yieldNode.col_offset + 1, None))
+
+        body = [self.visit(stmt) for stmt in node.body]
+        body = [stmt for stmt in body if stmt is not None]
+        if collector.names:
+            body.insert(0, ast.Global(names=sorted(collector.names), lineno=1, col_offset=0))
+        if not body:
+            body = [ast.Pass(lineno=1, col_offset=0)]
+
+        funcClass = ast.AsyncFunctionDef if collector.isAsync else ast.FunctionDef
+        func = funcClass(name=self.handlerName,
+                         args=ast.arguments(posonlyargs=[], args=[], vararg=None, kwonlyargs=[],
+                                            kw_defaults=[], kwarg=None, defaults=[]),
+                         body=body, decorator_list=[], returns=None, type_comment=None,
+                         lineno=1, col_offset=0)
+        node.body = [func]
+        return ast.fix_missing_locations(node)
+
+    def visit_Global(self, node):
+        # These names are already in the wrapper's global statement, and a global declaration after the name is
+        # used would be a SyntaxError inside of a function.  Leave a pass, in case it was the only statement in a block.
+        return ast.copy_location(ast.Pass(), node)
+
+    def visit_Call(self, node):
+        # At a handler's top level, locals(), vars() and dir() used to see the stack's variables, so keep it that way,
+        # instead of seeing the wrapper function's empty local scope
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name) and not node.args and not node.keywords:
+            if node.func.id in ("locals", "vars"):
+                return ast.copy_location(ast.parse("globals()", mode="eval").body, node)
+            if node.func.id == "dir":
+                return ast.copy_location(ast.parse("sorted(globals())", mode="eval").body, node)
+        return node
+
+    def visit_ImportFrom(self, node):
+        # import * isn't allowed inside a function, so do it by hand into the stack's variables
+        if any(alias.name == "*" for alias in node.names):
+            call = ast.parse(f"__import__('handlerCompiler').ImportStar({node.module!r}, globals())").body[0]
+            return ast.copy_location(call, node)
+        return node
+
+    def visit_AnnAssign(self, node):
+        # Annotated names can't be declared global, so keep just the assignment
+        if isinstance(node.target, ast.Name):
+            if node.value is None:
+                return ast.copy_location(ast.Pass(), node)
+            return ast.copy_location(ast.Assign(targets=[node.target], value=node.value), node)
+        return node
+
+    def visit_FunctionDef(self, node):
+        return node  # nested scopes keep their own globals and returns
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+
+
+def NormalizeSource(handlerStr):
+    # The form of a handler's code that we run, and key cached code by.  Use this everywhere, so keys always match.
+    return handlerStr.strip()
+
+
+def HandlerFilename(model, handlerName):
+    # Compile each handler under its own name, like card_1.button_1.OnClick, so tracebacks can lead back to it
+    path = model.GetPath()
+    if not path:
+        path = model.GetProperty("name")
+    return path + "." + handlerName
+
+
+def RenameCode(code, filename):
+    # The same compiled code, but reporting errors from filename, so identical handlers on clones only compile once
+    consts = tuple(RenameCode(c, filename) if isinstance(c, types.CodeType) else c for c in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
+
+
+def ImportStar(moduleName, namespace):
+    module = importlib.import_module(moduleName)
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [n for n in dir(module) if not n.startswith("_")]
+    for n in names:
+        namespace[n] = getattr(module, n)
+
+
+def CompileHandler(handlerStr, handlerName, filename):
+    """
+    Compile a handler's code into a code object for a function named handlerName, that takes no arguments.
+    For handlers that use await, it's the code for an async function.
+    Raises SyntaxError just like compile() would.
+    """
+    root = ast.parse(handlerStr, filename, "exec")
+    root = AwaitTransformer().visit(root)
+    root = HandlerTransformer(handlerName).visit(root)
+    moduleCode = compile(root, filename, "exec")
+    for const in moduleCode.co_consts:
+        if hasattr(const, "co_name") and const.co_name == handlerName:
+            return const
+    return None
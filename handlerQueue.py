@@ -0,0 +1,108 @@
+import threading
+import heapq
+from time import time
+
+# Priority classes, most urgent first
+SETUP = 0
+INPUT = 1
+MESSAGE = 2
+PERIODIC = 3
+REFRESH = 4
+PRIORITY_NAMES = ["setup", "input", "message", "periodic", "refresh"]
+
+INPUT_HANDLERS = ["OnClick", "OnTextEnter", "OnTextChanged", "OnResize"]
+COALESCED_HANDLERS = ["OnMouseMove", "OnPeriodic"]
+
+
+class HandlerQueue(object):
+    """
+    The runner thread's work queue.  Items are the same tuples/lists the Runner always used: [] for a refresh,
+    (cardModel,) to set up a card, [func, args, kwargs] for a function, and 6-item handler tuples.
+
+    Items come out by priority class: card setups first, then input events, then messages, timers and other
+    handlers, then OnPeriodics, and refreshes last, so a backlog of slow OnPeriodics can't hold up a mouse click.
+    Each card setup also starts a new epoch, and everything queued before it still runs first, so events never
+    cross over into the wrong card.  A new OnMouseMove replaces a pending one for the same object, and a new
+    OnPeriodic merges its elapsedTime into a pending one, instead of piling up.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.heap = []
+        self.seq = 0
+        self.epoch = 0
+        self.pending = {}  # (model, handlerName) -> heap entry, for coalescing
+        # priority name -> [count, total seconds, max seconds] of the time from enqueueing an item to running it
+        self.latencyStats = {name: [0, 0.0, 0.0] for name in PRIORITY_NAMES}
+
+    @staticmethod
+    def PriorityForItem(item):
+        if len(item) == 0:
+            return REFRESH
+        elif len(item) == 1:
+            return SETUP
+        elif len(item) == 6:
+            handlerName = item[1]
+            if handlerName == "OnPeriodic":
+                return PERIODIC
+            if handlerName.startswith("OnMouse") or handlerName.startswith("OnKey") or handlerName in INPUT_HANDLERS:
+                return INPUT
+        return MESSAGE
+
+    def put(self, item):
+        """ Add item to the queue.  Returns False if it was merged into an item that was already waiting. """
+        priority = self.PriorityForItem(item)
+        with self.cond:
+            if priority == SETUP:
+                self.epoch += 1
+            coalesceKey = None
+            if priority != SETUP and len(item) == 6 and item[1] in COALESCED_HANDLERS:
+                coalesceKey = (item[0], item[1])
+                old = self.pending.get(coalesceKey)
+                if old and old[0] == self.epoch:
+                    if item[1] == "OnPeriodic":
+                        old[3][5] += item[5]
+                        return False
+                    old[5] = False  # Drop the stale OnMouseMove, and queue this newer one in its place
+            self.seq += 1
+            entry = [self.epoch, priority, self.seq, list(item) if coalesceKey else item, time(), True]
+            if coalesceKey:
+                self.pending[coalesceKey] = entry
+            heapq.heappush(self.heap, entry)
+            self.cond.notify()
+        return True
+
+    def Purge(self, model):
+        """
+        Drop all handlers waiting to run for model, like when a recycled model gets reused for a new object.
+        Returns how many of the dropped handlers were OnPeriodics, since the Runner counts those as they're queued.
+        """
+        numPeriodics = 0
+        with self.cond:
+            for entry in self.heap:
+                item = entry[3]
+                if len(item) == 6 and item[0] is model and entry[5]:
+                    entry[5] = False
+                    if item[1] == "OnPeriodic":
+                        numPeriodics += 1
+                    if self.pending.get((item[0], item[1])) is entry:
+                        self.pending.pop((item[0], item[1]))
+        return numPeriodics
+
+    def get(self):
+        with self.cond:
+            while True:
+                while not self.heap:
+                    self.cond.wait()
+                entry = heapq.heappop(self.heap)
+                item = entry[3]
+                if len(item) == 6 and self.pending.get((item[0], item[1])) is entry:
+                    self.pending.pop((item[0], item[1]))
+                if entry[5]:
+                    break
+            stats = self.latencyStats[PRIORITY_NAMES[entry[1]]]
+            latency = time() - entry[4]
+            stats[0] += 1
+            stats[1] += latency
+            stats[2] = max(stats[2], latency)
+            return item
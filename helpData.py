@@ -248,7 +248,7 @@ class HelpData():
     @classmethod
     def ReservedNames(cls):
         if not cls.reservedNames:
-            cls.reservedNames = ["keyName", "mousePos", "message"]
+            cls.reservedNames = ["keyName", "mousePos", "message", "other"]
             cls.reservedNames.extend(HelpDataGlobals.variables.keys())
             cls.reservedNames.extend(HelpDataGlobals.functions.keys())
             cls.reservedNames.extend(HelpDataObject.properties.keys())
@@ -292,17 +292,41 @@ class HelpDataGlobals():
     functions = {
         "Wait": {"args": {"duration": {"type": "float", "info": "Number of seconds to delay."}}, "return": None,
                  "info": "Delays the program from running for <b>duration</b> seconds.  No movements or animations "
-                         "will happen during this time."},
+                         "will happen during this time.  Inside an event, you can use <b>await Wait(duration)</b> "
+                         "instead, to let everything else keep running while just this event waits.  <b>await</b> "
+                         "also works with the Animate methods, Alert(), and Ask()."},
         "Distance": {"args": {"pointA": {"type": "point", "info": "One location on the card."},
                               "pointB": {"type": "point", "info": "Another location on the card."}}, "return": "float",
                      "info": "Return the distance between <b>pointA</b> and <b>pointB</b>."},
         "RunAfterDelay": {"args": {"duration": {"type": "float", "info": "Number of seconds to delay."},
                                    "func": {"type": "function", "info": "A function to call after the delay."},
-                                   "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>func</b>."}}, "return": None,
+                                   "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>func</b>."}}, "return": "object",
                           "info": "This function lets your program continue running while a timer waits for <b>duration</b> seconds, "
                                   "and then runs the functions <b>func</b>, passing it any additional argumentss you add "
                                   "after <b>func</b>.  Movements, animations, and user interaction "
-                                  "will all continue during this time."},
+                                  "will all continue during this time.  Returns a timer object, whose Cancel() method "
+                                  "stops <b>func</b> from running, if it hasn't run yet."},
+        "RunInBackground": {"args": {"func": {"type": "function", "info": "A function to run in the background."},
+                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>func</b>."},
+                                     "onDone": {"type": "function", "info": "An optional function to call with <b>func</b>'s return value once it finishes."}},
+                            "return": "object",
+                            "info": "Runs <b>func</b> on a background thread, so that slow work, like loading a web page or "
+                                    "reading from a serial port, doesn't freeze your stack while it waits.  When <b>func</b> "
+                                    "finishes, <b>onDone</b> gets called with its return value.  In an event, you can also "
+                                    "use <b>result = await RunInBackground(func)</b>, and if <b>func</b> raises an "
+                                    "exception, the await raises it too.  Don't change CardStock objects from "
+                                    "inside <b>func</b>; do that in <b>onDone</b> instead."},
+        "RunInProcess": {"args": {"func": {"type": "function", "info": "A function to run in another process."},
+                                  "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>func</b>."},
+                                  "onDone": {"type": "function", "info": "An optional function to call with <b>func</b>'s return value once it finishes."}},
+                         "return": "object",
+                         "info": "Runs <b>func</b> in a separate worker process, so that heavy number crunching can use "
+                                 "your computer's other CPU cores, without freezing your stack.  When <b>func</b> "
+                                 "finishes, <b>onDone</b> gets called with its return value.  In an event, you can also "
+                                 "use <b>result = await RunInProcess(func)</b>, which raises <b>func</b>'s exception if "
+                                 "it fails.  <b>func</b> can use imported modules and "
+                                 "plain values like numbers, strings, and lists, but not CardStock objects or functions "
+                                 "like Wait().  Its arguments and return value need to be plain values too."},
         "Time": {"args": {}, "return": "float",
                  "info": "Returns the time in seconds since 'The Unix Epoch', midnight UTC on January 1st, 1970.  That "
                          "date doesn't usually matter, since most often, you'll store the time at one point in your "
@@ -382,6 +406,23 @@ class HelpDataObject():
         "speed": {"type": "point",
                   "info": "This is a point value corresponding to the current speed of the object, in pixels/second "
                           "in both the <b>x</b> and <b>y</b> directions."},
+        "acceleration": {"type": "point",
+                         "info": "This is a point value corresponding to how fast this object's <b>speed</b> changes, "
+                                 "in pixels/second/second in both the <b>x</b> and <b>y</b> directions."},
+        "gravity": {"type": "float",
+                    "info": "How strongly this object gets pulled down towards the bottom of the card, in "
+                            "pixels/second/second.  Starts out as 0, for no gravity."},
+        "friction": {"type": "float",
+                     "info": "The fraction of this object's <b>speed</b> that it loses each second, so 0 means it "
+                             "never slows down, and 1 means it stops within about a second."},
+        "bounceOnEdges": {"type": "bool",
+                          "info": "If <b>True</b>, this object bounces off of the edges of the card as it moves, "
+                                  "instead of sliding off of the card."},
+        "periodicInterval": {"type": "float",
+                             "info": "The number of seconds to wait between runs of this object's "
+                                     "<b>OnPeriodic</b> event.  The default of 0 runs it as often as possible, about "
+                                     "30 times per second.  For example, set it to 1 for a clock that only needs to "
+                                     "update once a second."},
         "visible": {"type": "bool",
                     "info": "<b>True</b> if this object is <b>visible</b>, or <b>False</b> if it is hidden.  If this "
                             "object is in a group that has been hidden, this object's <b>visible</b> property will be "
@@ -419,6 +460,11 @@ class HelpDataObject():
         "Delete": {"args": {},
                    "return": None,
                    "info": "Deletes this object.  Like Cut, but the object does not get copied to the clipboard."},
+        "Recycle": {"args": {},
+                    "return": None,
+                    "info": "Deletes this object, like Delete, but lets a later Clone of an object of the same type "
+                            "reuse it, instead of building a new object from scratch.  This helps stacks that create "
+                            "and delete lots of objects, like bullets in a game."},
         "SendMessage": {"args": {"message":{"type": "string", "info": "The message being sent to this object."}},
                         "return": None,
                         "info": "Sends a <b>message</b> to this object, that the object can handle in its OnMessage event code.  For "
@@ -482,7 +528,8 @@ class HelpDataObject():
                                                      "info": "the destination bottom-left corner position at the end of the animation"},
                                      "onFinished": {"type": "function",
                                                     "info": "an optional function to run when the animation finishes"},
-                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                     "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                             "return": None,
                             "info": "Visually animates the movement of this object from its current position to <b>endPosition</b>, "
                                     "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -493,7 +540,8 @@ class HelpDataObject():
                                                    "info": "the destination center position at the end of the animation"},
                                    "onFinished": {"type": "function",
                                                   "info": "an optional function to run when the animation finishes"},
-                                   "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                   "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                   "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                           "return": None,
                           "info": "Visually animates the movement of this object from its current position to have its center at <b>endCenter</b>, "
                                   "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -502,7 +550,8 @@ class HelpDataObject():
         "AnimateSize": {"args": {"duration": {"type": "float", "info": "time in seconds for the animation to run"},
                                  "endSize": {"type": "size", "info": "the final size of this object at the end of the animation"},
                                  "onFinished": {"type": "function", "info": "an optional function to run when the animation finishes"},
-                                 "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                 "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                 "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                         "return": None,
                         "info": "Visually animates the <b>size</b> of this object from its current size to <b>endSize</b>, "
                                 "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -542,7 +591,14 @@ class HelpDataObject():
                               "BroadcastMessage() is delivered here."},
         "OnPeriodic": {"args": {"elapsedTime": {"type": "float", "info": "This is the number of seconds since the last time this event was run, normally about 0.03."}},
                    "info": "The <b>OnPeriodic</b> event is run approximately 30 times per second on every object on the current page, "
-                           "and gives your object a chance to run periodic checks, for example checking for collisions using IsTouching()."},
+                           "and gives your object a chance to run periodic checks, for example checking for collisions using IsTouching().  "
+                           "Set an object's <b>periodicInterval</b> to run it less often."},
+        "OnCollision": {"args": {"other": {"type": "object", "info": "This is the other object that this object just started touching."}},
+                        "info": "The <b>OnCollision</b> event is run when this object starts touching another object on "
+                                "the current card, and gives you that <b>other</b> object.  It runs once when the two "
+                                "objects first touch, and then again only after they stop touching and touch again.  "
+                                "Hidden objects don't collide, and an object inside a group collides as its whole "
+                                "group."},
     }
 
 
@@ -602,7 +658,8 @@ class HelpDataTextField():
                                                    "info": "the final textColor at the end of the animation"},
                                       "onFinished": {"type": "function",
                                                      "info": "an optional function to run when the animation finishes."},
-                                      "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                      "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                      "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                              "return": None,
                              "info": "Visually animates fading this object's <b>textColor</b> to <b>endColor</b>, "
                                      "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -645,7 +702,8 @@ class HelpDataTextLabel():
                                                    "info": "the final textColor at the end of the animation"},
                                       "onFinished": {"type": "function",
                                                      "info": "an optional function to run when the animation finishes."},
-                                      "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                      "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                      "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                              "return": None,
                              "info": "Visually animates fading this object's <b>textColor</b> to <b>endColor</b>, "
                                      "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -679,7 +737,8 @@ class HelpDataImage():
                                                                      "the end of the animation"},
                                      "onFinished": {"type": "function",
                                                     "info": "an optional function to run when the animation finishes."},
-                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                     "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                             "return": None,
                             "info": "Visually animates changing this image's <b>rotation</b> angle to <b>endRotation</b>, "
                                     "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -733,7 +792,8 @@ class HelpDataLine():
                                                  "info": "the final penThickness at the end of the animation"},
                                  "onFinished": {"type": "function",
                                                 "info": "an optional function to run when the animation finishes."},
-                                         "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                         "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                         "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                         "return": None,
                         "info": "Visually animates changing this object's <b>penThickness</b> to <b>endThickness</b>, "
                                 "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -744,7 +804,8 @@ class HelpDataLine():
                                                  "info": "the final pen color at the end of the animation"},
                                  "onFinished": {"type": "function",
                                                 "info": "an optional function to run when the animation finishes."},
-                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                     "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                     "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                         "return": None,
                         "info": "Visually animates fading this object's <b>penColor</b> to <b>endColor</b>, "
                                 "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -769,7 +830,8 @@ class HelpDataShape():
                                                   "info": "the final fillColor at the end of the animation"},
                                      "onFinished": {"type": "function",
                                                     "info": "an optional function to run when the animation finishes."},
-                                      "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                      "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                      "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                             "return": None,
                             "info": "Visually animates fading this object's <b>fillColor</b> to <b>endColor</b>, "
                                     "over <b>duration</b> seconds.  When the animation completes, runs the "
@@ -793,7 +855,8 @@ class HelpDataRoundRectangle():
                                                           "info": "the final cornerRadius at the end of the animation"},
                                          "onFinished": {"type": "function",
                                                         "info": "an optional function to run when the animation finishes."},
-                                         "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."}},
+                                         "*args": {"type": "any", "info": "0 or more arguments and/or keyword argumentss to pass into <b>onFinished</b>."},
+                                         "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                                 "return": None,
                                 "info": "Visually animates changing this round rectangle's <b>cornerRadius</b> to <b>endCornerRadius</b>, "
                                         "over <b>duration</b> seconds.  When the animation completes, runs the <b>onFinished</b> function, "
@@ -820,6 +883,14 @@ class HelpDataCard():
         "canResize": {"type": "bool",
                       "info": "If <b>canResize</b> is <b>True</b>, the user can resize the stack window while running it. "
                               "If it's <b>False</b>, the user can't resize the window while the stack runs."},
+        "frameRate": {"type": "int",
+                      "info": "The number of times per second that the stack tries to redraw the screen while it runs.  "
+                              "Defaults to 60.  If the stack falls behind, it skips drawing frames before it slows down "
+                              "its animations."},
+        "simulationRate": {"type": "int",
+                           "info": "The number of fixed-size steps per second that the stack uses to move animated "
+                                   "objects by their <b>speed</b>, <b>acceleration</b>, and <b>gravity</b>.  Defaults "
+                                   "to 60."},
     }
 
     methods = {
@@ -904,11 +975,19 @@ class HelpDataCard():
                              },
                     "return": "object",
                     "info": "Adds a new Group to the card, and returns the new object."},
+        "FindObjects": {"args": {"type": {"type": "string", "info": "an optional object type to look for, like "
+                                                                    "'button', 'image', or 'oval'."},
+                                 "namePrefix": {"type": "string", "info": "an optional start of the names to look for, "
+                                                                          "like 'enemy_'."}},
+                        "return": "list",
+                        "info": "Returns a list of the objects on this card, including objects inside of groups, that "
+                                "match the <b>type</b> and <b>namePrefix</b> you pass in."},
         "AnimateBgColor": {"args": {"duration": {"type": "float", "info": "time in seconds for the animation to run"},
                                       "endColor": {"type": "string",
                                                    "info": "the final backgroundColor at the end of the animation"},
                                       "onFinished": {"type": "function",
-                                                     "info": "an optional function to run when the animation finishes."}},
+                                                     "info": "an optional function to run when the animation finishes."},
+                                      "easing": {"type": "string", "info": "optional easing curve: 'Linear' (default), 'EaseIn', 'EaseOut', 'EaseInOut', or 'Bounce'."}},
                              "return": None,
                              "info": "Visually animates this card's <b>backgroundColor</b> to <b>endColor</b>, "
                                      "over <b>duration</b> seconds.  When the animation completes, runs the <b>onFinished</b> function, "
@@ -0,0 +1,111 @@
+"""
+A simple physics stepper for objects' speed, acceleration, gravity, friction and bounceOnEdges properties.
+
+Each tick, StackManager collects the current card's moving objects, and StepBodies() integrates all of them together,
+using numpy arrays when numpy is available and plain python lists otherwise.  A tick's elapsed time gets split into
+equal substeps of at most MAX_SUBSTEP seconds, so that fast objects bounce cleanly, and a slow frame doesn't fling
+things through the walls.
+
+Units are pixels and seconds.  gravity pulls objects down (towards y=0) by that many pixels/second/second, and
+friction is the fraction of an object's speed it loses per second.
+"""
+
+import math
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ModuleNotFoundError:
+    NUMPY_AVAILABLE = False
+
+MAX_SUBSTEP = 1.0 / 120
+# Objects with friction, and no acceleration or gravity, stop once they drop below this speed
+MIN_SPEED = 0.5
+NUMPY_MIN_BATCH = 16
+
+
+class Body(object):
+    """ One object's physics state, read from its model before stepping, and written back after. """
+    def __init__(self, model):
+        self.model = model
+        size = model.GetProperty("size")
+        speed = model.GetProperty("speed")
+        accel = model.GetProperty("acceleration")
+        self.readPos = model.GetAbsoluteXY()
+        self.readSpeed = (speed[0], speed[1])
+        self.x, self.y = self.readPos
+        self.width, self.height = size[0], size[1]
+        self.vx, self.vy = self.readSpeed
+        self.ax, self.ay = accel[0], accel[1] - model.GetProperty("gravity")
+        self.friction = max(0.0, model.GetProperty("friction"))
+        self.bounce = model.GetProperty("bounceOnEdges")
+
+    def WriteBack(self):
+        """
+        Write back only the values that the step changed, and only if nothing else changed them since we read them,
+        so that a handler setting an object's speed or position while its batch was stepping doesn't get undone.
+        """
+        model = self.model
+        if self.friction and self.ax == 0 and self.ay == 0 and math.hypot(self.vx, self.vy) < MIN_SPEED:
+            self.vx, self.vy = 0, 0
+        with model.motionLock:
+            if (self.x, self.y) != self.readPos and model.GetAbsoluteXY() == self.readPos:
+                model.SetAbsolutePosition((self.x, self.y))
+            speed = model.GetProperty("speed")
+            if (self.vx, self.vy) != self.readSpeed and (speed[0], speed[1]) == self.readSpeed:
+                model.SetProperty("speed", (self.vx, self.vy), notify=False)
+
+
+def StepBodies(bodies, elapsedTime, edgeSize):
+    """ Advance all bodies by elapsedTime seconds, bouncing the ones with bounce set off the edges of edgeSize. """
+    if not bodies or elapsedTime <= 0:
+        return
+    steps = max(1, int(math.ceil(elapsedTime / MAX_SUBSTEP)))
+    dt = elapsedTime / steps
+    if NUMPY_AVAILABLE and len(bodies) >= NUMPY_MIN_BATCH:
+        StepArrays(bodies, dt, steps, edgeSize)
+    else:
+        for b in bodies:
+            StepBody(b, dt, steps, edgeSize)
+
+
+def StepBody(b, dt, steps, edgeSize):
+    damping = max(0.0, 1 - b.friction * dt)
+    maxX = edgeSize[0] - b.width
+    maxY = edgeSize[1] - b.height
+    for i in range(steps):
+        b.vx = (b.vx + b.ax * dt) * damping
+        b.vy = (b.vy + b.ay * dt) * damping
+        b.x += b.vx * dt
+        b.y += b.vy * dt
+        if b.bounce:
+            if (b.x < 0 and b.vx < 0) or (b.x > maxX and b.vx > 0):
+                b.x = min(max(b.x, 0), maxX)
+                b.vx = -b.vx
+            if (b.y < 0 and b.vy < 0) or (b.y > maxY and b.vy > 0):
+                b.y = min(max(b.y, 0), maxY)
+                b.vy = -b.vy
+
+
+def StepArrays(bodies, dt, steps, edgeSize):
+    def column(attr):
+        return numpy.array([getattr(b, attr) for b in bodies], dtype=float)
+
+    x, y, vx, vy, ax, ay = [column(a) for a in ("x", "y", "vx", "vy", "ax", "ay")]
+    damping = numpy.maximum(0.0, 1 - column("friction") * dt)
+    bounce = numpy.array([b.bounce for b in bodies], dtype=bool)
+    maxX = edgeSize[0] - column("width")
+    maxY = edgeSize[1] - column("height")
+    for i in range(steps):
+        vx = (vx + ax * dt) * damping
+        vy = (vy + ay * dt) * damping
+        x += vx * dt
+        y += vy * dt
+        hitX = bounce & (((x < 0) & (vx < 0)) | ((x > maxX) & (vx > 0)))
+        hitY = bounce & (((y < 0) & (vy < 0)) | ((y > maxY) & (vy > 0)))
+        x = numpy.where(hitX, numpy.minimum(numpy.maximum(x, 0), maxX), x)
+        y = numpy.where(hitY, numpy.minimum(numpy.maximum(y, 0), maxY), y)
+        vx = numpy.where(hitX, -vx, vx)
+        vy = numpy.where(hitY, -vy, vy)
+    for i, b in enumerate(bodies):
+        b.x, b.y, b.vx, b.vy = float(x[i]), float(y[i]), float(vx[i]), float(vy[i])
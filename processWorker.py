@@ -0,0 +1,89 @@
+"""
+Packing up functions from stack code, to run in another process for RunInProcess().
+
+Functions defined in handlers live in the stack's shared variables, not in a real module, so pickle can't send
+them by name.  Instead we send each function's compiled code, along with the stack variables it uses: modules are
+re-imported by name, other functions from the stack get packed up the same way, and plain values get pickled.
+Anything else, like CardStock objects, can't cross over to the other process, so it's left out.
+
+This module gets imported by the worker processes, so it must not import wx or any other CardStock modules.
+"""
+
+import sys
+import types
+import pickle
+import marshal
+import builtins
+import importlib
+
+
+def IsStackFunction(func):
+    # Functions from real modules can be pickled by reference, but functions from handlers can't
+    module = sys.modules.get(getattr(func, "__module__", None))
+    return isinstance(func, types.FunctionType) and func.__globals__ is not getattr(module, "__dict__", None)
+
+
+def CodeNames(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(CodeNames(const))
+    return names
+
+
+def PackFunction(func, packedGlobals):
+    if not IsStackFunction(func):
+        return ("ref", func)
+    if func.__closure__:
+        raise TypeError(f"RunInProcess() can't run {func.__name__}(), because it uses variables from the function "
+                        f"it was defined inside of")
+    for name in CodeNames(func.__code__):
+        if name in packedGlobals or name not in func.__globals__:
+            continue
+        value = func.__globals__[name]
+        if isinstance(value, types.ModuleType):
+            packedGlobals[name] = ("module", value.__name__)
+        elif IsStackFunction(value):
+            packedGlobals[name] = None  # Placeholder, in case of recursion
+            packedGlobals[name] = ("func", PackFunction(value, packedGlobals))
+        else:
+            try:
+                pickle.dumps(value)
+                packedGlobals[name] = ("value", value)
+            except Exception:
+                pass
+    return ("code", marshal.dumps(func.__code__), func.__name__, func.__defaults__, func.__kwdefaults__)
+
+
+def PackCall(func, args, kwargs):
+    """ Return the bytes to send to a worker process, or raise TypeError if func or its args can't be sent. """
+    packedGlobals = {}
+    packedFunc = PackFunction(func, packedGlobals)
+    try:
+        return pickle.dumps((packedFunc, packedGlobals, args, kwargs))
+    except Exception as err:
+        name = getattr(func, "__name__", "this function")
+        raise TypeError(f"RunInProcess() can't send {name}() or its arguments to another process: {err}")
+
+
+def UnpackFunction(packedFunc, namespace):
+    if packedFunc[0] == "ref":
+        return packedFunc[1]
+    code, name, defaults, kwdefaults = packedFunc[1:]
+    func = types.FunctionType(marshal.loads(code), namespace, name, defaults)
+    func.__kwdefaults__ = kwdefaults
+    return func
+
+
+def RunPackedCall(data):
+    """ Runs in the worker process. """
+    packedFunc, packedGlobals, args, kwargs = pickle.loads(data)
+    namespace = {"__builtins__": builtins}
+    for name, (kind, value) in packedGlobals.items():
+        if kind == "module":
+            namespace[name] = importlib.import_module(value)
+        elif kind == "func":
+            namespace[name] = UnpackFunction(value, namespace)
+        else:
+            namespace[name] = value
+    return UnpackFunction(packedFunc, namespace)(*args, **kwargs)
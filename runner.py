@@ -1,10 +1,11 @@
-import re
 import sys
 import os
 import traceback
 import wx
 import uiView
 import types
+import handlerCompiler
+from compileCache import CompileCache
 from uiCard import Card
 from wx.adv import Sound
 from time import sleep, time
@@ -12,7 +13,13 @@ import math
 from errorListWindow import CardStockError
 import threading
 from codeRunnerThread import CodeRunnerThread, RunOnMain, RunOnMainAsync
-import queue
+from handlerQueue import HandlerQueue
+from delayedCalls import DelayedCallQueue
+from asyncHandlers import HandlerFuture, HandlerTask, HandlerCancelled
+from workerPool import WorkerPool
+import processWorker
+import multiprocessing
+import inspect
 
 try:
     import simpleaudio
@@ -23,6 +30,11 @@ except ModuleNotFoundError:
 if wx.Platform == '__WXMAC__':
     SIMPLE_AUDIO_AVAILABLE = False
 
+# Max number of threads for running RunInBackground() calls at once
+BACKGROUND_WORKERS = 4
+
+NO_VALUE = ("no", "value")  # Use this if a var didn't exist/had no value (not even None)
+
 
 class Runner():
     """
@@ -45,17 +57,24 @@ class Runner():
     injects a SystemExit("Return") exception into the runnerThread, so it will stop and allow us to close viewer.
     """
 
-    def __init__(self, stackManager):
+    def __init__(self, stackManager, trustBundledCache=False):
         self.stackManager = stackManager
-        self.cardVarKeys = []  # store names of views on the current card, to remove from clientVars before setting up the next card
+        self.cardVarKeys = {}  # names of views on the current card -> their models, to remove from clientVars before setting up the next card
+        self.setupCardModel = None  # The card whose views are currently in clientVars
         self.pressedKeys = []
-        self.timers = []
+        self.timers = DelayedCallQueue()  # Calls waiting to run from RunAfterDelay()
+        self.backgroundPool = None  # Threads for RunInBackground(), started when first needed
+        self.processPool = None  # Worker processes for RunInProcess(), started when first needed
         self.errors = []
         self.lastHandlerStack = []
         self.didSetup = False
         self.runnerDepth = 0
         self.numOnPeriodicsQueued = 0
-        self.rewrittenHandlerMap = {}
+        # (model, handlerName) -> (handlerStr, func, syntaxError, filename), so we only compile once
+        self.compiledHandlers = {}
+        self.handlerFilenames = {}  # compiled handler filename -> (model, handlerName), for finding errors' sources
+        # Only exported apps run the precompiled code shipped next to their stack
+        self.compileCache = CompileCache(stackManager.filename, trustBundledCache)
         self.onRunFinished = None
         self.funcDefs = {}
         self.lastCard = None
@@ -65,7 +84,8 @@ class Runner():
         # single item list means run SetupForCard
         # 5-item list means run a handler
         # 0-item list means just wake up to check if the thread is supposed to stop
-        self.handlerQueue = queue.Queue()
+        # Tasks come back out in priority order, see HandlerQueue
+        self.handlerQueue = HandlerQueue()
 
         self.runnerThread = CodeRunnerThread(target=self.StartRunLoop)
         self.runnerThread.start()
@@ -78,6 +98,8 @@ class Runner():
         self.clientVars = {
             "Wait": self.Wait,
             "RunAfterDelay": self.RunAfterDelay,
+            "RunInBackground": self.RunInBackground,
+            "RunInProcess": self.RunInProcess,
             "Time": self.Time,
             "Distance": self.Distance,
             "Paste": self.Paste,
@@ -145,15 +167,59 @@ class Runner():
         This always runs on the runnerThread.
         """
         self.clientVars["card"] = cardModel.GetProxy()
-        for k in self.cardVarKeys.copy():
+        for k in self.cardVarKeys:
             if k in self.clientVars:
                 self.clientVars.pop(k)
-            self.cardVarKeys.remove(k)
-        for m in cardModel.GetAllChildModels():
+        self.cardVarKeys.clear()
+        self.AddCardVarsInternal(cardModel.GetAllChildModels())
+        self.setupCardModel = cardModel
+        self.didSetup = True
+
+    def AddCardVars(self, cardModel, model):
+        """
+        Add a view that was just added to cardModel, and any views inside it, to clientVars, without rebuilding all
+        of the card's variables, so adding lots of objects, like with Clone(), stays fast.  Falls back to a full
+        SetupForCard() if we're not on the runnerThread, or this card isn't the one currently set up.
+        """
+        if threading.currentThread() != self.runnerThread or cardModel != self.setupCardModel:
+            self.SetupForCard(cardModel)
+            return
+        models = [model]
+        if model.type == "group":
+            models.extend(model.GetAllChildModels())
+        self.AddCardVarsInternal(models)
+
+    def AddCardVarsInternal(self, models):
+        for m in models:
             name = m.GetProperty("name")
             self.clientVars[name] = m.GetProxy()
-            self.cardVarKeys.append(name)
-        self.didSetup = True
+            self.cardVarKeys[name] = m
+
+    def RemoveCardVars(self, cardModel, model):
+        """ Remove a view that's being removed from cardModel, and any views inside it, from clientVars. """
+        if threading.currentThread() != self.runnerThread or cardModel != self.setupCardModel:
+            self.SetupForCard(cardModel)
+            return
+        models = [model]
+        if model.type == "group":
+            models.extend(model.GetAllChildModels())
+        for m in models:
+            name = m.GetProperty("name")
+            if self.cardVarKeys.get(name) is m:
+                self.cardVarKeys.pop(name)
+                if name in self.clientVars:
+                    self.clientVars.pop(name)
+
+    def RenameCardVar(self, cardModel, model, oldName):
+        """ Move a view on cardModel that was just renamed, to its new name in clientVars. """
+        if threading.currentThread() != self.runnerThread or cardModel != self.setupCardModel:
+            self.SetupForCard(cardModel)
+            return
+        if self.cardVarKeys.get(oldName) is model:
+            self.cardVarKeys.pop(oldName)
+            if oldName in self.clientVars:
+                self.clientVars.pop(oldName)
+        self.AddCardVarsInternal([model])
 
     def IsRunningHandler(self):
         return len(self.lastHandlerStack) > 0
@@ -162,9 +228,11 @@ class Runner():
         # On Main thread
         if self.runnerThread:
             self.stopRunnerThread = True
-            for t in self.timers:
-                t.Stop()
-            self.timers = []
+            self.timers.Clear()
+            if self.backgroundPool:
+                self.backgroundPool.Shutdown()
+            if self.processPool:
+                self.ShutdownProcessPool()
             self.handlerQueue.put([]) # Wake up the runner thread get() call so it can see that we're stopping
 
             def waitAndYield(duration):
@@ -202,14 +270,19 @@ class Runner():
 
             self.runnerThread = None
 
+        self.compileCache.Save(self.stackManager.stackModel)
+        self.compileCache = None
+
         self.lastHandlerStack = None
         self.lastCard = None
         self.SoundStop()
         self.soundCache = None
         self.cardVarKeys = None
+        self.setupCardModel = None
         self.clientVars = None
         self.timers = None
-        self.rewrittenHandlerMap = None
+        self.compiledHandlers = None
+        self.handlerFilenames = None
         self.funcDefs = None
         self.handlerQueue = None
         self.stackManager = None
@@ -279,7 +352,7 @@ class Runner():
         If we're already on the runnerThread, that means an object's event code called another event, so run that
         immediately.
         """
-        handlerStr = uiModel.handlers[handlerName].strip()
+        handlerStr = handlerCompiler.NormalizeSource(uiModel.handlers[handlerName])
         if handlerStr == "":
             return False
 
@@ -295,15 +368,19 @@ class Runner():
         if threading.currentThread() == self.runnerThread:
             self.RunHandlerInternal(uiModel, handlerName, handlerStr, mousePos, keyName, arg)
         else:
+            elapsedTime = None
             if handlerName == "OnPeriodic":
+                # elapsedTime is the time since this object's last OnPeriodic, which depends on its periodicInterval
+                now = time()
+                if uiModel.lastOnPeriodicTime:
+                    elapsedTime = now - uiModel.lastOnPeriodicTime
+                else:
+                    elapsedTime = now - self.stackStartTime
+                uiModel.lastOnPeriodicTime = now
+            isNew = self.handlerQueue.put((uiModel, handlerName, handlerStr, mousePos, keyName,
+                                           elapsedTime if arg is None else arg))
+            if isNew and handlerName == "OnPeriodic":
                 self.numOnPeriodicsQueued += 1
-            now = time()
-            if uiModel.lastOnPeriodicTime:
-                elapsedTime = now - uiModel.lastOnPeriodicTime
-            else:
-                elapsedTime = now - self.stackStartTime
-            uiModel.lastOnPeriodicTime = now
-            self.handlerQueue.put((uiModel, handlerName, handlerStr, mousePos, keyName, elapsedTime))
         return True
 
     def RunHandlerInternal(self, uiModel, handlerName, handlerStr, mousePos, keyName, arg):
@@ -313,53 +390,9 @@ class Runner():
 
         self.runnerDepth += 1
 
-        noValue = ("no", "value")  # Use this if this var didn't exist/had no value (not even None)
-
-        # Keep this method re-entrant, by storing old values (or lack thereof) of anything we set here,
-        # (like self, key, etc.) and replacing or deleting them at the end of the run.
-        oldVars = {}
-
-        if "self" in self.clientVars:
-            oldVars["self"] = self.clientVars["self"]
-        else:
-            oldVars["self"] = noValue
-        self.clientVars["self"] = uiModel.GetProxy()
-
-        if arg and handlerName == "OnMessage":
-            if "message" in self.clientVars:
-                oldVars["message"] = self.clientVars["message"]
-            else:
-                oldVars["message"] = noValue
-            self.clientVars["message"] = arg
-
-        if arg and handlerName == "OnPeriodic":
-            if "elapsedTime" in self.clientVars:
-                oldVars["elapsedTime"] = self.clientVars["elapsedTime"]
-            else:
-                oldVars["elapsedTime"] = noValue
-            self.clientVars["elapsedTime"] = arg
-
-        if mousePos and handlerName.startswith("OnMouse"):
-            if "mousePos" in self.clientVars:
-                oldVars["mousePos"] = self.clientVars["mousePos"]
-            else:
-                oldVars["mousePos"] = noValue
-            self.clientVars["mousePos"] = mousePos
-
-        if keyName and handlerName.startswith("OnKey"):
-            if "keyName" in self.clientVars:
-                oldVars["keyName"] = self.clientVars["keyName"]
-            else:
-                oldVars["keyName"] = noValue
-            self.clientVars["keyName"] = keyName
-
-        # rewrite handlers that use return outside of a function, and replace with an exception that we catch, to
-        # act like a return.
-        handlerStr = self.RewriteHandler(handlerStr)
-
+        oldVars = self.SetHandlerVars(uiModel, handlerName, mousePos, keyName, arg)
         self.lastHandlerStack.append((uiModel, handlerName))
 
-        error = None
         error_class = None
         line_number = None
         errModel = None
@@ -370,8 +403,10 @@ class Runner():
         # Use this for noticing user-definitions of new functions
         oldClientVars = self.clientVars.copy()
 
+        result = None
         try:
-            exec(handlerStr, self.clientVars)
+            handlerFunc = self.GetCompiledHandler(uiModel, handlerName, handlerStr)
+            result = handlerFunc()
             self.ScrapeNewFuncDefs(oldClientVars, self.clientVars, uiModel, handlerName)
         except SyntaxError as err:
             self.ScrapeNewFuncDefs(oldClientVars, self.clientVars, uiModel, handlerName)
@@ -382,95 +417,204 @@ class Runner():
             errHandlerName = handlerName
         except Exception as err:
             self.ScrapeNewFuncDefs(oldClientVars, self.clientVars, uiModel, handlerName)
-            if err.__class__.__name__ == "RuntimeError" and err.args[0] == "Return":
-                # Catch our exception-based return calls
-                pass
-            else:
-                error_class = err.__class__.__name__
-                detail = err.args[0]
-                cl, exc, tb = sys.exc_info()
-                trace = traceback.extract_tb(tb)
-                for i in range(len(trace)):
-                    if trace[i].filename == "<string>" and trace[i].name == "<module>":
-                        errModel = uiModel
-                        errHandlerName = handlerName
-                        line_number = trace[i].lineno
-                        in_func.append((handlerName, trace[i].lineno))
-                    elif line_number and trace[i].filename == "<string>" and trace[i].name != "<module>":
-                        if trace[i].name in self.funcDefs:
-                            errModel = self.funcDefs[trace[i].name][0]
-                            errHandlerName = self.funcDefs[trace[i].name][1]
-                            line_number = trace[i].lineno
-                        in_func.append((trace[i].name, trace[i].lineno))
+            error_class = err.__class__.__name__
+            detail = err.args[0]
+            cl, exc, tb = sys.exc_info()
+            errModel, errHandlerName, line_number, in_func = self.FindErrorSource(tb)
+            if not errModel:
+                # The failing code belonged to an object that's been removed since, so blame the handler that ran it
+                errModel, errHandlerName = uiModel, handlerName
 
         del self.lastHandlerStack[-1]
+        self.RestoreHandlerVars(oldVars)
+
+        if error_class:
+            self.RecordError(uiModel, errModel, errHandlerName, line_number, error_class, detail, in_func)
+
+        if inspect.iscoroutine(result):
+            # This handler uses await, so start stepping it, and resume it whenever what it's awaiting is ready
+            self.StepHandlerTask(HandlerTask(result, uiModel, handlerName, mousePos, keyName, arg))
+
+        self.runnerDepth -= 1
+
+    def SetHandlerVars(self, uiModel, handlerName, mousePos, keyName, arg):
+        """
+        Set up the variables a handler can see, like self and mousePos.  Keep this re-entrant, by returning the
+        old values (or lack thereof) of anything we set here, for RestoreHandlerVars() to put back afterwards.
+        """
+        oldVars = {}
+
+        def setVar(name, value):
+            oldVars[name] = self.clientVars[name] if name in self.clientVars else NO_VALUE
+            self.clientVars[name] = value
 
+        setVar("self", uiModel.GetProxy())
+        if arg and handlerName == "OnMessage":
+            setVar("message", arg)
+        if arg and handlerName == "OnCollision":
+            setVar("other", arg)
+        if arg and handlerName == "OnPeriodic":
+            setVar("elapsedTime", arg)
+        if mousePos and handlerName.startswith("OnMouse"):
+            setVar("mousePos", mousePos)
+        if keyName and handlerName.startswith("OnKey"):
+            setVar("keyName", keyName)
+        return oldVars
+
+    def RestoreHandlerVars(self, oldVars):
         # restore the old values from before this handler was called
         for k, v in oldVars.items():
-            if v == noValue:
+            if v == NO_VALUE:
                 if k in self.clientVars:
                     self.clientVars.pop(k)
             else:
                 self.clientVars[k] = v
 
-        if error_class and self.errors is not None:
-            msg = f"{error_class} in {self.HandlerPath(errModel, errHandlerName)}, line {line_number}: {detail}"
-            if len(in_func) > 1:
-                frames = [f"{f[0]}():{f[1]}" for f in in_func]
-                msg += f" (from {' => '.join(frames)})"
+    def RecordError(self, uiModel, errModel, errHandlerName, line_number, error_class, detail, in_func):
+        if self.errors is None:
+            return
+        error = None
+        msg = f"{error_class} in {self.HandlerPath(errModel, errHandlerName)}, line {line_number}: {detail}"
+        if len(in_func) > 1:
+            frames = [f"{f[0]}():{f[1]}" for f in in_func]
+            msg += f" (from {' => '.join(frames)})"
+
+        for e in self.errors:
+            if e.msg == msg:
+                error = e
+                break
+        if not error:
+            error = CardStockError(uiModel.GetCard(), errModel, errHandlerName, line_number, msg)
+            self.errors.append(error)
+        error.count += 1
 
-            for e in self.errors:
-                if e.msg == msg:
-                    error = e
-                    break
-            if not error:
-                error = CardStockError(uiModel.GetCard(), errModel, errHandlerName, line_number, msg)
-                self.errors.append(error)
-            error.count += 1
+        sys.stderr.write(msg + os.linesep)
 
-            sys.stderr.write(msg + os.linesep)
+    def StepHandlerTask(self, task, value=None, exception=None):
+        """
+        Run an async handler's coroutine until it awaits something that isn't ready yet, or finishes.
+        This always runs on the runnerThread.
+        """
+        if self.stopRunnerThread or not self.didSetup:
+            return
 
-        self.runnerDepth -= 1
+        uiModel, handlerName, mousePos, keyName, arg = task.context
+        if not uiModel.IsSameLife(task.generation):
+            return
+
+        self.runnerDepth += 1
+        oldVars = self.SetHandlerVars(uiModel, handlerName, mousePos, keyName, arg)
+        self.lastHandlerStack.append((uiModel, handlerName))
 
-    def RewriteHandler(self, handlerStr):
-        # rewrite handlers that use return outside of a function, and replace with an exception that we catch, to
-        # act like a return.
-        if "return" in handlerStr:
-            if handlerStr in self.rewrittenHandlerMap:
-                # we cache the rewritten handlers
-                return self.rewrittenHandlerMap[handlerStr]
+        error_class = None
+        try:
+            if exception:
+                awaited = task.coro.throw(exception)
             else:
-                lines = handlerStr.split('\n')
-                funcIndent = None
-                updatedLines = []
-                for line in lines:
-                    if funcIndent is not None:
-                        # if we were inside a function definition, check if it's done
-                        m = re.match(rf"^(\s{{{funcIndent}}})\b", line)
-                        if m:
-                            funcIndent = None
-                    if funcIndent is None:
-                        m = re.match(r"^(\s*)def ", line)
-                        if m:
-                            # mark that we're inside a function def now, so don't replace returns.
-                            funcIndent = len(m.group(1))
-                            updatedLines.append(line)
-                        else:
-                            # not inside a function def, so replace returns with a RuntimeError('Return')
-                            # and catch these later, while running the handler
-                            u = re.sub(r"^(\s*)return\b", r"\1raise RuntimeError('Return')", line)
-                            u = re.sub(r":\s+return\b", ": raise RuntimeError('Return')", u)
-                            updatedLines.append(u)
-                    else:
-                        # now we're inside a function def, so don't replace returns.  they're valid here!
-                        updatedLines.append(line)
-
-                updated = '\n'.join(updatedLines)
-                self.rewrittenHandlerMap[handlerStr] = updated  # cache the updated handler
-                return updated
+                awaited = task.coro.send(value)
+        except (StopIteration, HandlerCancelled):
+            # A cancelled handler that doesn't catch HandlerCancelled just ends, like one that returned
+            awaited = None
+        except Exception as err:
+            awaited = None
+            error_class = err.__class__.__name__
+            detail = err.args[0] if err.args else ""
+            cl, exc, tb = sys.exc_info()
+            errModel, errHandlerName, line_number, in_func = self.FindErrorSource(tb)
+            if not errModel:
+                # The failing code belonged to an object that's been removed since, so blame the handler that ran it
+                errModel, errHandlerName = uiModel, handlerName
+
+        del self.lastHandlerStack[-1]
+        self.RestoreHandlerVars(oldVars)
+
+        if error_class:
+            self.RecordError(uiModel, errModel, errHandlerName, line_number, error_class, detail, in_func)
+        elif isinstance(awaited, HandlerFuture):
+            awaited.AddCallback(lambda future: self.StepHandlerTask(task, future.result, future.exception))
+        elif awaited is not None:
+            err = TypeError("handlers can only await CardStock functions like Wait(), or other async functions")
+            self.EnqueueFunction(self.StepHandlerTask, task, None, err)
+
+        self.runnerDepth -= 1
+
+    def GetCompiledHandler(self, uiModel, handlerName, handlerStr):
+        """
+        Return the compiled function for this handler, compiling it only the first time it runs, or after its code
+        changes.  Each handler is compiled with its own filename, like card_1.button_1.OnClick, instead of "<string>",
+        so that errors in tracebacks lead straight back to the handler (or function) that they came from.
+        The handler's code is wrapped in a function by handlerCompiler, so a top-level return just returns, and the
+        compiled code comes from the stack's on-disk compileCache when it's there.
+        """
+        key = (uiModel, handlerName)
+        cached = self.compiledHandlers.get(key)
+        if not cached or cached[0] != handlerStr:
+            filename = handlerCompiler.HandlerFilename(uiModel, handlerName)
+            try:
+                code = self.compileCache.GetCode(handlerStr, handlerName, filename)
+                cached = (handlerStr, types.FunctionType(code, self.clientVars, handlerName), None, filename)
+            except (SyntaxError, ValueError) as err:
+                # Remember the error too, so a broken handler doesn't get recompiled on every event.  compile() raises
+                # ValueError for some bad source, like null bytes, so report those as SyntaxErrors in this handler too.
+                if not isinstance(err, SyntaxError):
+                    err = SyntaxError(str(err), (filename, 1, 1, None))
+                cached = (handlerStr, None, err, filename)
+            self.compiledHandlers[key] = cached
+            self.handlerFilenames[filename] = (uiModel, handlerName)
+        if cached[2]:
+            raise cached[2]
+        return cached[1]
+
+    def PurgeHandlers(self, model):
+        # Drop model's queued handlers, and stop counting its dropped OnPeriodics, or OnPeriodic would stop for good
+        self.numOnPeriodicsQueued -= self.handlerQueue.Purge(model)
+
+    def ForgetHandlers(self, model):
+        """
+        On Runner or Main thread, when model gets removed.  Drop its compiled handlers, so they don't pile up in stacks
+        that keep cloning and deleting objects, and so a later object that reuses its name doesn't get its errors.
+        """
+        compiledHandlers = self.compiledHandlers
+        handlerFilenames = self.handlerFilenames
+        cache = self.compileCache
+        if compiledHandlers is None or handlerFilenames is None:
+            return
+        for handlerName in list(model.handlers.keys()):
+            cached = compiledHandlers.pop((model, handlerName), None)
+            if cached and handlerFilenames.get(cached[3]) == (model, handlerName):
+                handlerFilenames.pop(cached[3], None)
+                if cache and cached[1]:
+                    cache.Forget(cached[0], cached[3])
+
+    def InvalidateHandlers(self, model, handlerName=None):
+        """ Drop cached code for this model's handler, or for all of its handlers, after its code changes. """
+        if self.compiledHandlers is None:
+            return
+        if handlerName:
+            self.compiledHandlers.pop((model, handlerName), None)
         else:
-            # No return used, so keep the handler as-is
-            return handlerStr
+            for key in model.handlers.keys():
+                self.compiledHandlers.pop((model, key), None)
+
+    def FindErrorSource(self, tb):
+        """
+        Walk a traceback, and use our per-handler filenames to find the model, handler, and line number where the
+        error happened, along with the list of functions it happened inside of.
+        """
+        return self.FindFramesSource(traceback.extract_tb(tb))
+
+    def FindFramesSource(self, frames):
+        errModel = None
+        errHandlerName = None
+        line_number = None
+        in_func = []
+        for frame in frames:
+            source = self.handlerFilenames.get(frame.filename)
+            if source and not source[0].didSetDown:
+                errModel, errHandlerName = source
+                line_number = frame.lineno
+                in_func.append((frame.name, frame.lineno))
+        return (errModel, errHandlerName, line_number, in_func)
 
     def RunWithExceptionHandling(self, func, *args, **kwargs):
         """ Run a function with exception handling.  This always runs on the runnerThread. """
@@ -501,14 +645,7 @@ class Runner():
             error_class = err.__class__.__name__
             detail = err.args[0]
             cl, exc, tb = sys.exc_info()
-            trace = traceback.extract_tb(tb)
-            for i in range(len(trace)):
-                if trace[i].filename == "<string>" and trace[i].name != "<module>":
-                    if trace[i].name in self.funcDefs:
-                        errModel = self.funcDefs[trace[i].name][0]
-                        errHandlerName = self.funcDefs[trace[i].name][1]
-                        line_number = trace[i].lineno
-                    in_func.append((trace[i].name, trace[i].lineno))
+            errModel, errHandlerName, line_number, in_func = self.FindErrorSource(tb)
 
         if error_class and errModel and self.errors is not None:
             msg = f"{error_class} in {self.HandlerPath(errModel, errHandlerName)}, line {line_number}: {detail}"
@@ -572,10 +709,20 @@ class Runner():
             self.pressedKeys.remove(keyName)
 
     @RunOnMainAsync
-    def SetFocus(self, obj):
+    def SetFocus(self, obj, requestNum):
         uiView = self.stackManager.GetUiViewByModel(obj._model)
         if uiView:
             uiView.view.SetFocus()
+            # Don't wait for EVT_SET_FOCUS, which some platforms only send later
+            self.stackManager.focusedModel = uiView.model
+        self.stackManager.focusRequestsDone = requestNum
+
+    @RunOnMain
+    def HasFocus(self, model):
+        uiView = self.stackManager.GetUiViewByModel(model)
+        if uiView and uiView.view:
+            return uiView.view.HasFocus()
+        return False
 
 
     # --------- User-accessible view functions -----------
@@ -584,8 +731,7 @@ class Runner():
         if not isinstance(message, str):
             raise TypeError("message must be a string")
 
-        self.RunHandler(self.stackManager.uiCard.model, "OnMessage", None, message)
-        for ui in self.stackManager.GetAllUiViews():
+        for ui in self.stackManager.GetUiViewsWithHandler("OnMessage"):
             self.RunHandler(ui.model, "OnMessage", None, message)
 
     def GotoCard(self, card):
@@ -600,9 +746,9 @@ class Runner():
             raise TypeError("card must be card object, a string, or an int")
 
         if index is None:
-            for m in self.stackManager.stackModel.childModels:
-                if m.GetProperty("name") == cardName:
-                    index = self.stackManager.stackModel.childModels.index(m)
+            m = self.stackManager.stackModel.GetNameIndex().get(cardName)
+            if m:
+                index = self.stackManager.stackModel.childModels.index(m)
         if index is not None:
             self.stackManager.LoadCardAtIndex(index)
         else:
@@ -631,6 +777,17 @@ class Runner():
                 break
             sleep(min(remaining, 0.25))
 
+    def WaitAsync(self, delay):
+        # await Wait(delay) lets other handlers run while this one waits
+        try:
+            delay = float(delay)
+        except ValueError:
+            raise TypeError("delay must be a number")
+
+        future = HandlerFuture()
+        self.timers.Add(max(0.0, delay), future.SetResult, (), {})
+        return future
+
     def Time(self):
         return time()
 
@@ -670,6 +827,32 @@ class Runner():
 
         return (func() == wx.ID_YES)
 
+    def AlertAsync(self, message):
+        if not isinstance(message, str):
+            raise TypeError("message must be a string")
+
+        def show():
+            wx.MessageDialog(None, str(message), "", wx.OK).ShowModal()
+        return self.ShowDialogAsync(show)
+
+    def AskAsync(self, message):
+        if not isinstance(message, str):
+            raise TypeError("message must be a string")
+        return self.ShowDialogAsync(lambda: wx.MessageDialog(None, str(message), "", wx.YES_NO).ShowModal() == wx.ID_YES)
+
+    def ShowDialogAsync(self, showFunc):
+        # Show the dialog from the main thread's event loop, and send its result back to the awaiting handler
+        future = HandlerFuture()
+        if self.stopRunnerThread:
+            future.SetResult(None)
+            return future
+
+        def func():
+            if self.stopRunnerThread: return
+            self.EnqueueFunction(future.SetResult, showFunc())
+        wx.CallAfter(func)
+        return future
+
     def SoundPlay(self, filepath):
         if not isinstance(filepath, str):
             raise TypeError("filepath must be a string")
@@ -729,25 +912,118 @@ class Runner():
         except ValueError:
             raise TypeError("duration must be a number")
 
-        startTime = time()
+        if not callable(func):
+            raise TypeError("func must be a function")
 
-        @RunOnMainAsync
-        def f():
-            if self.stopRunnerThread: return
+        owner = self.lastHandlerStack[-1][0] if self.lastHandlerStack else None
+        return self.timers.Add(max(0.0, duration), func, args, kwargs, owner)
 
-            adjustedDuration = duration + startTime - time()
-            if adjustedDuration > 0.010:
-                timer = wx.Timer()
-                def onTimer(event):
-                    if self.stopRunnerThread: return
-                    self.EnqueueFunction(func, *args, **kwargs)
-                timer.Bind(wx.EVT_TIMER, onTimer)
-                timer.StartOnce(int(adjustedDuration*1000))
-                self.timers.append(timer)
-            else:
-                self.EnqueueFunction(func, *args, **kwargs)
+    def RunInBackground(self, func, *args, onDone=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on a background thread, so slow calls like network requests don't hold up
+        everything else.  When it finishes, onDone(result) runs back on the runner thread.  Returns a future, so
+        handlers can also  await RunInBackground(...)  to get the result, or have func's exception raised there.
+        """
+        if not callable(func):
+            raise TypeError("func must be a function")
+        if onDone is not None and not callable(onDone):
+            raise TypeError("onDone must be a function")
+
+        future = HandlerFuture()
+        if self.stopRunnerThread:
+            return future
+
+        # Remember where this was called from, to report errors from the background call there
+        callSite = self.FindFramesSource(traceback.extract_stack())
+
+        def done(result, exception):
+            if not self.stopRunnerThread:
+                self.EnqueueFunction(self.FinishBackgroundCall, future, onDone, result, exception, callSite)
+
+        if not self.backgroundPool:
+            self.backgroundPool = WorkerPool(BACKGROUND_WORKERS, "CardStockBackground")
+        self.backgroundPool.SubmitCall(func, args, kwargs, done)
+        return future
+
+    def RunInProcess(self, func, *args, onDone=None, **kwargs):
+        """
+        Run func(*args, **kwargs) in a separate worker process, so heavy number crunching can use other CPU cores,
+        without freezing the stack.  func, its args, and its return value all need to be picklable, and func can use
+        modules and plain values from the stack's variables, but not CardStock objects.  When it finishes,
+        onDone(result) runs back on the runner thread.  Like RunInBackground(), this returns an awaitable future.
+        """
+        if not callable(func):
+            raise TypeError("func must be a function")
+        if onDone is not None and not callable(onDone):
+            raise TypeError("onDone must be a function")
 
-        f()
+        future = HandlerFuture()
+        if self.stopRunnerThread:
+            return future
+
+        data = processWorker.PackCall(func, args, kwargs)  # Raises TypeError right away if func can't be sent
+        callSite = self.FindFramesSource(traceback.extract_stack())
+
+        if not self.processPool:
+            # Always spawn fresh worker processes, since forking a process with wx and running threads isn't safe
+            # A multiprocessing Pool, rather than a ProcessPoolExecutor, since it can kill busy workers when we stop
+            self.processPool = multiprocessing.get_context("spawn").Pool()
+
+        def done(result, exception):
+            if not self.stopRunnerThread:
+                self.EnqueueFunction(self.FinishBackgroundCall, future, onDone, result, exception, callSite)
+
+        self.processPool.apply_async(processWorker.RunPackedCall, (data,),
+                                     callback=lambda result: done(result, None),
+                                     error_callback=lambda exception: done(None, exception))
+        return future
+
+    def ShutdownProcessPool(self):
+        pool = self.processPool
+        self.processPool = None
+        # Stop any workers that are still crunching, and drop calls that haven't started yet
+        pool.terminate()
+
+    def FinishBackgroundCall(self, future, onDone, result, exception, callSite):
+        # On Runner thread.  Report the background or process call's error, or pass its result along.
+        if not exception:
+            try:
+                if onDone:
+                    self.RunWithExceptionHandling(onDone, result)
+            finally:
+                future.SetResult(result)
+            return
+
+        if future.callbacks:
+            # A handler is awaiting this call, so raise the error at its await, where it can catch it, or where it
+            # gets reported from if it doesn't
+            future.SetException(exception)
+            return
+
+        errModel, errHandlerName, line_number, in_func = self.FindErrorSource(exception.__traceback__)
+        if not errModel:
+            errModel, errHandlerName, line_number, in_func = callSite
+        detail = exception.args[0] if exception.args else ""
+        if errModel:
+            self.RecordError(errModel, errModel, errHandlerName, line_number,
+                             exception.__class__.__name__, detail, in_func)
+        else:
+            # Called from outside of any handler, so there's nowhere in the stack to point to
+            sys.stderr.write(f"{exception.__class__.__name__} in background call: {detail}" + os.linesep)
+        future.SetException(exception)
+
+    def FireDelayedCalls(self, now):
+        # On Main thread, from the periodic timer.  Hand all calls that are due to the runner thread together.
+        if self.stopRunnerThread: return
+        for call in self.timers.PopDue(now):
+            self.EnqueueFunction(self.RunDelayedCall, call)
+
+    def RunDelayedCall(self, call):
+        # On Runner thread.  Run the call's func itself through RunWithExceptionHandling(), so self gets set up for it
+        taken = call.Take()
+        if taken:
+            func, args, kwargs = taken
+            self.RunWithExceptionHandling(func, *args, **kwargs)
 
     @RunOnMain
     def Quit(self):
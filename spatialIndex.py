@@ -0,0 +1,96 @@
+import math
+
+
+class SpatialIndex(object):
+    """
+    A uniform grid over the card, that maps each cell to the items whose rects overlap it, so we can quickly find
+    the few objects that might be under the mouse, or inside a selection box, without checking every object on the
+    card.  Items also keep a z value, and queries return items sorted by z, so callers can walk them in drawing order.
+    Items too big for the grid (spanning lots of cells) are just kept in a separate list, and always checked.
+    """
+
+    def __init__(self, cellSize=64, maxCells=64):
+        self.cellSize = cellSize
+        self.maxCells = maxCells
+        self.cells = {}  # (cx, cy) -> set of items
+        self.items = {}  # item -> (rect, z, cellKeys or None if it's a big item)
+        self.bigItems = set()
+
+    def Clear(self):
+        self.cells = {}
+        self.items = {}
+        self.bigItems = set()
+
+    def CellRange(self, rect):
+        cs = self.cellSize
+        return (int(math.floor(rect[0] / cs)), int(math.floor(rect[1] / cs)),
+                int(math.floor(rect[2] / cs)), int(math.floor(rect[3] / cs)))
+
+    def Insert(self, item, rect, z):
+        """ Add item with rect as (left, bottom, right, top), or update it if it's already here. """
+        oldZ = self.Remove(item)
+        if z is None:
+            z = oldZ
+        cx0, cy0, cx1, cy1 = self.CellRange(rect)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > self.maxCells:
+            self.bigItems.add(item)
+            self.items[item] = (rect, z, None)
+            return
+        keys = [(cx, cy) for cx in range(cx0, cx1+1) for cy in range(cy0, cy1+1)]
+        for key in keys:
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = set()
+            cell.add(item)
+        self.items[item] = (rect, z, keys)
+
+    def Update(self, item, rect):
+        """ Move an item that's already in the index, keeping its z value. """
+        if item in self.items:
+            self.Insert(item, rect, None)
+
+    def Remove(self, item):
+        entry = self.items.pop(item, None)
+        if not entry:
+            return None
+        if entry[2] is None:
+            self.bigItems.discard(item)
+        else:
+            for key in entry[2]:
+                cell = self.cells[key]
+                cell.discard(item)
+                if not cell:
+                    del self.cells[key]
+        return entry[1]
+
+    def QueryPoint(self, x, y):
+        """ Returns items whose rects contain the point, from the top (highest z) down. """
+        cs = self.cellSize
+        found = set(self.bigItems)
+        found.update(self.cells.get((int(math.floor(x / cs)), int(math.floor(y / cs))), ()))
+        hits = []
+        for item in found:
+            r, z, keys = self.items[item]
+            if r[0] <= x <= r[2] and r[1] <= y <= r[3]:
+                hits.append((z, item))
+        hits.sort(key=lambda h: h[0], reverse=True)
+        return [h[1] for h in hits]
+
+    def QueryRect(self, rect):
+        """ Returns items whose rects overlap rect, from the bottom (lowest z) up. """
+        cx0, cy0, cx1, cy1 = self.CellRange(rect)
+        found = set(self.bigItems)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            for cell in self.cells.values():
+                found.update(cell)
+        else:
+            for cx in range(cx0, cx1+1):
+                for cy in range(cy0, cy1+1):
+                    found.update(self.cells.get((cx, cy), ()))
+        hits = []
+        for item in found:
+            r, z, keys = self.items[item]
+            if r[0] <= rect[2] and rect[0] <= r[2] and r[1] <= rect[3] and rect[1] <= r[3]:
+                hits.append((z, item))
+        hits.sort(key=lambda h: h[0])
+        return [h[1] for h in hits]
@@ -5,6 +5,7 @@ import re
 import random
 import json
 import shutil
+from compileCache import BuildBundledCache
 
 try:
     import PyInstaller.__main__
@@ -156,6 +157,10 @@ class StackExporter(object):
             tmpStack = os.path.join(tmp, 'stack.cds')
             shutil.copyfile(self.stackManager.filename, tmpStack)
 
+            # Precompile all handlers, so the app doesn't need to compile them when it starts
+            tmpCache = tmpStack + "c"
+            hasCache = BuildBundledCache(self.stackManager.stackModel, tmpStack)
+
             # Create ResourceMap.json
             self.BuildResMap()
             mapFile = os.path.join(tmp, 'ResourceMap.json')
@@ -185,12 +190,16 @@ class StackExporter(object):
                     '--distpath',
                     os.path.dirname(filepath)
                 ])
+                if hasCache:
+                    args.extend(["--add-data", f"{tmpCache}{sep}."])
             elif wx.Platform == "__WXMSW__":
                 if canSave:
                     os.mkdir(filepath)
                     resPath = os.path.join(filepath, "Resources")
                     os.mkdir(resPath)
                     shutil.copyfile(tmpStack, os.path.join(resPath, "stack.cds"))
+                    if hasCache:
+                        shutil.copyfile(tmpCache, os.path.join(resPath, "stack.cdsc"))
                     distpath = filepath
                 else:
                     distpath = os.path.dirname(filepath)
@@ -200,12 +209,16 @@ class StackExporter(object):
                     '--distpath', distpath])
                 if not canSave:
                     args.extend(["--add-data", f"{tmpStack}{sep}."])
+                    if hasCache:
+                        args.extend(["--add-data", f"{tmpCache}{sep}."])
             else:
                 if canSave:
                     os.mkdir(filepath)
                     resPath = os.path.join(filepath, "Resources")
                     os.mkdir(resPath)
                     shutil.copyfile(tmpStack, os.path.join(resPath, "stack.cds"))
+                    if hasCache:
+                        shutil.copyfile(tmpCache, os.path.join(resPath, "stack.cdsc"))
                     distpath = filepath
                 else:
                     distpath = os.path.dirname(filepath)
@@ -216,6 +229,8 @@ class StackExporter(object):
                     '--distpath', distpath])
                 if not canSave:
                     args.extend(["--add-data", f"{tmpStack}{sep}."])
+                    if hasCache:
+                        args.extend(["--add-data", f"{tmpCache}{sep}."])
 
             args.extend(["--add-data", f"{mapFile}{sep}."])
             stackDir = os.path.dirname(self.stackManager.filename)
@@ -269,6 +284,9 @@ class StackExporter(object):
             os.mkdir(resDir)
             shutil.copyfile(self.stackManager.filename, os.path.join(resDir, "stack.cds"))
 
+        # Precompile all handlers, so the app doesn't need to compile them when it starts
+        BuildBundledCache(self.stackManager.stackModel, os.path.join(resDir, "stack.cds"))
+
         # Create ResourceMap.json
         self.BuildResMap()
         jsonData = json.dumps(self.resMap)
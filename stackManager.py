@@ -12,12 +12,17 @@ import wx
 from wx.lib.docview import CommandProcessor
 from time import time
 import json
+import threading
 from tools import *
 from commands import *
 import generator
 import findEngineDesigner
 import resourcePathManager
 import analyzer
+import geometry
+import easings
+import physics
+from spatialIndex import SpatialIndex
 from stackModel import StackModel
 from uiCard import UiCard, CardModel
 from uiButton import UiButton
@@ -26,7 +31,20 @@ from uiTextLabel import UiTextLabel
 from uiImage import UiImage
 from uiShape import UiShape
 from uiGroup import UiGroup, GroupModel
-from codeRunnerThread import RunOnMain, RunOnMainAsync
+from codeRunnerThread import RunOnMain, RunOnMainAsync, RunOnMainCoalesced
+
+# Frame scheduling limits for the stack's simulationRate and frameRate properties, in Hz
+MIN_RATE = 1
+MAX_RATE = 240
+MIN_TIMER_INTERVAL = 4
+# Never run more than this many simulation steps in one tick, to avoid spiraling further behind
+MAX_SIM_STEPS_PER_TICK = 8
+# Renders and OnPeriodic runs can come up to this many seconds early, to absorb timer jitter
+TIMER_SLOP = 0.004
+BASE_ON_PERIODIC_INTERVAL = 1.0 / 30
+MAX_ON_PERIODIC_INTERVAL = 0.5
+# Keep at most this many Recycle()d models of each type around for Clone() to reuse
+MAX_RECYCLED_MODELS = 100
 
 
 # ----------------------------------------------------------------------
@@ -87,10 +105,24 @@ class StackManager(object):
         self.command_processor = CommandProcessor()
         self.timer = None
         self.timerCount = 0
+        self.simAccumulator = 0  # Seconds of simulation time that haven't been stepped yet
+        self.lastRenderTime = 0
+        self.onPeriodicInterval = BASE_ON_PERIODIC_INTERVAL  # Grows while OnPeriodic handlers can't keep up
+        self.lastOnPeriodicRunTime = 0
+        self.frameStats = {"simSteps": 0, "droppedSimSteps": 0, "renders": 0, "skippedRenders": 0,
+                           "missedOnPeriodics": 0}
+        self.touchingPairs = set()  # Pairs of models that are touching, for sending OnCollision when they start
+        self.animatingModels = {}  # Models with a speed or running animations, in the order they started moving
+        self.recycledModels = {}  # type -> models from Recycle(), waiting for Clone() to reuse them
+        self.recycleLock = threading.Lock()
         self.tool = None
         self.globalCursor = None
         self.lastMousePos = wx.Point(0,0)
         self.lastFocusedTextField = None
+        self.focusedModel = None
+        # Focus() calls made on the runner thread, and how many of them the main thread has carried out
+        self.focusRequests = 0
+        self.focusRequestsDone = 0
         self.lastMouseMovedUiView = None
         self.isDoubleClick = False
         self.inlineEditingView = None
@@ -106,7 +138,10 @@ class StackManager(object):
 
         self.selectedViews = []
         self.uiViews = []
+        self.viewIndex = SpatialIndex()  # Top-level uiViews on this card, by frame, for fast HitTests
+        self.nextViewZ = 0
         self.modelToViewMap = {}
+        self.handlerIndex = {}  # handlerName -> {model: uiView} for views on this card that have code for that handler
         self.cardIndex = None
         self.uiCard = UiCard(None, self, self.stackModel.childModels[0])
 
@@ -120,7 +155,7 @@ class StackManager(object):
         if not self.isEditing:
             self.timer = wx.Timer(self.view)
             self.view.Bind(wx.EVT_TIMER, self.OnPeriodicTimer, self.timer)
-            self.timer.Start(15 if wx.Platform != "__WXMSW__" else 11)
+            self.timer.Start(self.TimerInterval())
 
         self.view.Bind(wx.EVT_SIZE, self.OnResize)
         self.view.Bind(wx.EVT_PAINT, self.OnPaint)
@@ -143,6 +178,7 @@ class StackManager(object):
         for ui in self.uiViews:
             ui.SetDown()
         self.uiViews = None
+        self.viewIndex = None
         self.uiCard.SetDown()
         self.uiCard = None
         self.stackModel.SetDown()
@@ -154,16 +190,19 @@ class StackManager(object):
         self.command_processor = None
         self.tool = None
         self.lastFocusedTextField = None
+        self.focusedModel = None
         self.lastMouseMovedUiView = None
         self.lastMouseDownView = None
         self.inlineEditingView = None
         self.runner = None
+        self.recycledModels = {}
         self.resPathMan = None
         self.lastOnPeriodicTime = None
         self.analyzer.SetDown()
         self.analyzer = None
         self.selectedViews = None
         self.modelToViewMap = None
+        self.handlerIndex = None
         self.view.stackManager = None
         self.view = None
 
@@ -188,36 +227,167 @@ class StackManager(object):
                 if uiView.view:
                     uiView.view.SetCursor(wx.Cursor(viewCursor if viewCursor else cursor))
 
+    def GetRate(self, key):
+        return max(MIN_RATE, min(MAX_RATE, self.stackModel.GetProperty(key)))
+
+    def TimerInterval(self):
+        # Tick at least as often as the fastest of the simulation and frame rates, but never slower than the old
+        # fixed timer, so the runner's UI updates still get delivered promptly.
+        base = 15 if wx.Platform != "__WXMSW__" else 11
+        fastest = max(self.GetRate("simulationRate"), self.GetRate("frameRate"))
+        return max(MIN_TIMER_INTERVAL, min(base, int(1000 / fastest)))
+
     def OnPeriodicTimer(self, event):
         if not self.runner.stopRunnerThread:
+            # Deliver this frame's batch of UI updates from the runner thread
+            self.runner.runnerThread.DrainMainQueue()
+
             self.timerCount += 1
-            # Determine elapsed time since last round of OnPeriodic calls
+            interval = self.TimerInterval()
+            if self.timer and self.timer.GetInterval() != interval:
+                self.timer.Start(interval)
+
+            # Determine elapsed time since the last tick, and step the simulation forward in fixed steps to match
             now = time()
             if not self.lastOnPeriodicTime:
                 self.lastOnPeriodicTime = self.runner.stackStartTime
-            elapsedTime = now - self.lastOnPeriodicTime
-
-            # Run animations at 60 Hz / FPS
-            onFinishedCalls = []
-            self.uiCard.RunAnimations(onFinishedCalls, elapsedTime)
-            for ui in self.GetAllUiViews():
-                ui.RunAnimations(onFinishedCalls, elapsedTime)
-            # Let all animations process, before running their onFinished handlers,
-            # which could start new animations.
-            for c in onFinishedCalls:
-                c()
+            self.simAccumulator += now - self.lastOnPeriodicTime
             self.lastOnPeriodicTime = now
 
-            # Run OnPeriodic at 30 Hz
+            simStep = 1.0 / self.GetRate("simulationRate")
+            steps = 0
+            while self.simAccumulator >= simStep and steps < MAX_SIM_STEPS_PER_TICK:
+                # Each step eases tweens at its own point in time, rather than all of them at the tick's time
+                self.simAccumulator -= simStep
+                self.RunAnimations(now - self.simAccumulator, simStep)
+                steps += 1
+            self.frameStats["simSteps"] += steps
+            fellBehind = self.simAccumulator >= simStep
+            if fellBehind:
+                # We can't catch up, so drop the missed simulation time instead of spiraling further behind
+                self.frameStats["droppedSimSteps"] += int(self.simAccumulator / simStep)
+                self.simAccumulator %= simStep
+
+            if steps:
+                self.RunCollisionChecks()
+
+            self.runner.FireDelayedCalls(now)
+
+            # Run OnPeriodic at 30 Hz, backing off while the handlers are still busy with earlier runs
             didRun = False
-            if self.timerCount % 2 == 0 and self.runner.numOnPeriodicsQueued == 0:
-                didRun = self.uiCard.OnPeriodic(event)
+            if now - self.lastOnPeriodicRunTime >= self.onPeriodicInterval - TIMER_SLOP:
+                if self.runner.numOnPeriodicsQueued == 0:
+                    didRun = self.uiCard.OnPeriodic(event)
+                    self.lastOnPeriodicRunTime = now
+                    self.onPeriodicInterval = max(BASE_ON_PERIODIC_INTERVAL, self.onPeriodicInterval * 0.9)
+                else:
+                    self.frameStats["missedOnPeriodics"] += 1
+                    self.onPeriodicInterval = min(MAX_ON_PERIODIC_INTERVAL, self.onPeriodicInterval * 1.5)
 
             if didRun:
                 self.runner.EnqueueRefresh()
-            else:
+            elif fellBehind or time() - now > simStep:
+                # Drop this frame's render before dropping any more simulation
+                self.frameStats["skippedRenders"] += 1
+            elif now - self.lastRenderTime >= 1.0 / self.GetRate("frameRate") - TIMER_SLOP:
+                self.lastRenderTime = now
+                self.frameStats["renders"] += 1
                 self.view.RefreshIfNeeded()
 
+    def AddAnimatingModel(self, model):
+        # On Runner or Main thread.  Call this after giving model a speed or an animation.
+        self.animatingModels[model] = True
+
+    def UpdateAnimatingModel(self, model):
+        # On Runner or Main thread.  Call this after model's speed or animations may have started or stopped.
+        if model.IsAnimating():
+            self.animatingModels[model] = True
+        else:
+            self.animatingModels.pop(model, None)
+            # Re-check, in case the other thread started it up again while we were removing it
+            if model.IsAnimating():
+                self.animatingModels[model] = True
+
+    def RecycleModel(self, model):
+        # On Main thread, once model's old uiView is gone, so Clone() can't reuse it while the old view still shows it
+        if model.type in ["card", "group"]:
+            return
+        # Forget its collisions, so its next life starts out not touching anything
+        self.touchingPairs = set(pair for pair in self.touchingPairs if model not in pair)
+        with self.recycleLock:
+            models = self.recycledModels.setdefault(model.type, [])
+            if len(models) < MAX_RECYCLED_MODELS:
+                models.append(model)
+
+    def TakeRecycledModel(self, typeStr):
+        # On Runner thread.  Returns a set-down model of this type to reuse, or None.
+        with self.recycleLock:
+            models = self.recycledModels.get(typeStr)
+            return models.pop() if models else None
+
+    def RunAnimations(self, now, elapsedTime):
+        cardModel = self.uiCard.model
+        models = []
+        updateList = []
+        finishList = []
+        bodyList = []
+        for model in list(self.animatingModels):
+            if model.didSetDown:
+                self.animatingModels.pop(model, None)
+            elif model.GetCard() == cardModel:
+                model.RunAnimations(now, elapsedTime, updateList, finishList, bodyList)
+                models.append(model)
+
+        # Step all of the moving objects' physics together
+        if bodyList:
+            physics.StepBodies(bodyList, elapsedTime, self.stackModel.GetProperty("size"))
+            for body in bodyList:
+                body.WriteBack()
+
+        # Ease all of this tick's tweens in one batch, then apply them
+        if updateList:
+            eased = easings.EaseAll([d["easing"] for d, p in updateList], [p for d, p in updateList])
+            for (d, p), e in zip(updateList, eased):
+                d["onUpdate"](e, d)
+        # Let all animations update, before finishing any, since onFinish could start new animations
+        for (model, key) in finishList:
+            model.FinishAnimation(key)
+        for model in models:
+            self.UpdateAnimatingModel(model)
+
+    def RunCollisionChecks(self):
+        """
+        Send OnCollision events to objects that just started touching another object on this card.  Only the card's
+        top-level objects take part, so an object in a group collides as its whole group.  Do one broadphase
+        sweep-and-prune pass over all visible objects' bounding boxes, and only check actual shapes for those pairs
+        that overlap, and where at least one object has an OnCollision handler.
+        """
+        models = [m for m in self.uiCard.model.childModels if not m.IsHidden()]
+        listeners = set(m for m in models if m.GetHandler("OnCollision"))
+        if not listeners:
+            self.touchingPairs = set()
+            return
+
+        items = []
+        shapes = {}
+        for m in models:
+            shapes[m] = m.GetHitShapes()
+            box = geometry.ShapesBBox(shapes[m])
+            if box:
+                items.append((box, m))
+
+        touching = set()
+        for a, b in geometry.SweepAndPrune(items):
+            if (a in listeners or b in listeners) and geometry.ShapesTouch(shapes[a], shapes[b]):
+                pair = frozenset((a, b))
+                touching.add(pair)
+                if pair not in self.touchingPairs:
+                    if a in listeners:
+                        self.runner.RunHandler(a, "OnCollision", None, b.GetProxy())
+                    if b in listeners:
+                        self.runner.RunHandler(b, "OnCollision", None, a.GetProxy())
+        self.touchingPairs = touching
+
     def SetTool(self, tool):
         if self.tool:
             self.tool.Deactivate()
@@ -229,21 +399,20 @@ class StackManager(object):
 
     def ClearAllViews(self):
         self.SelectUiView(None)
+        self.viewIndex.Clear()
         for ui in self.uiViews.copy():
             if ui.model.type != "card":
                 self.uiViews.remove(ui)
-
-                def DelFromMap(ui):
-                    del self.modelToViewMap[ui.model]
-                    if ui.model.type == "group":
-                        for childUi in ui.uiViews:
-                            DelFromMap(childUi)
-                DelFromMap(ui)
+                self.UnmapUiView(ui)
             ui.SetDown()
+        self.handlerIndex = {}
 
     def CreateViews(self, cardModel):
         self.uiCard.SetModel(cardModel)
         self.uiViews = []
+        self.viewIndex.Clear()
+        self.handlerIndex = {}
+        self.IndexHandlers(self.uiCard)
         self.AddUiViewsFromModels(cardModel.childModels, canUndo=False)  # Don't allow undoing card loads
 
     def GetAllUiViews(self):
@@ -278,6 +447,7 @@ class StackManager(object):
             if self.designer:
                 self.designer.Freeze()
             self.ClearAllViews()
+            self.touchingPairs = set()
             self.lastFocusedTextField = None
             self.lastMouseMovedUiView = None
             if index is not None:
@@ -442,15 +612,12 @@ class StackManager(object):
             uiView.model.SetProperty("name", self.uiCard.model.DeduplicateNameInCard(
                 uiView.model.GetProperty("name"), exclude=[]), notify=False)
 
-        def AddToMap(ui):
-            self.modelToViewMap[ui.model] = ui
-            if ui.model.type == "group":
-                for childUi in ui.uiViews:
-                    AddToMap(childUi)
-        AddToMap(uiView)
+        self.MapUiView(uiView)
 
         if uiView:
             self.uiViews.append(uiView)
+            self.viewIndex.Insert(uiView, self.GetIndexRect(uiView.model), self.nextViewZ)
+            self.nextViewZ += 1
 
             if uiView.model not in self.uiCard.model.childModels:
                 self.uiCard.model.AddChild(uiView.model)
@@ -505,7 +672,7 @@ class StackManager(object):
             if self.designer:
                 self.designer.SetSelectedUiViews(self.selectedViews)
 
-    @RunOnMainAsync
+    @RunOnMainCoalesced
     def OnPropertyChanged(self, model, key):
         uiView = self.GetUiViewByModel(model)
         if model == self.stackModel:
@@ -514,9 +681,66 @@ class StackManager(object):
                 self.view.SetSize(model.GetProperty(key))
         if uiView:
             uiView.OnPropertyChanged(model, key)
+            if key in ["position", "size", "shape", "penThickness"] and model.type not in ["card", "stack"]:
+                self.UpdateIndexForModel(model)
         if uiView and self.designer:
             self.designer.cPanel.UpdatedProperty(uiView, key)
 
+    def GetIndexRect(self, model):
+        # Absolute frame of this object and anything inside it, with room for resize boxes and thick pens
+        pos = model.GetAbsolutePosition()
+        s = model.GetProperty("size")
+        margin = 20 + model.properties.get("penThickness", 0) / 2
+        rect = [pos.x - margin, pos.y - margin, pos.x + s.width + margin, pos.y + s.height + margin]
+        if model.type == "group":
+            for child in model.childModels:
+                r = self.GetIndexRect(child)
+                rect = [min(rect[0], r[0]), min(rect[1], r[1]), max(rect[2], r[2]), max(rect[3], r[3])]
+        return rect
+
+    def UpdateIndexForModel(self, model):
+        # Re-index the top-level object on the card that holds this model
+        while model.parent and model.parent.type != "card":
+            model = model.parent
+        uiView = self.modelToViewMap.get(model)
+        if uiView:
+            self.viewIndex.Update(uiView, self.GetIndexRect(model))
+
+    def MapUiView(self, ui):
+        # Register this uiView, and any inside of it, by model and by the events they have code for
+        self.modelToViewMap[ui.model] = ui
+        self.IndexHandlers(ui)
+        if ui.model.type == "group":
+            for childUi in ui.uiViews:
+                self.MapUiView(childUi)
+
+    def UnmapUiView(self, ui):
+        self.modelToViewMap.pop(ui.model, None)
+        for views in self.handlerIndex.values():
+            views.pop(ui.model, None)
+        if ui.model.type == "group":
+            for childUi in ui.uiViews:
+                self.UnmapUiView(childUi)
+
+    def IndexHandlers(self, ui):
+        for handlerName, code in ui.model.handlers.items():
+            if code.strip():
+                self.handlerIndex.setdefault(handlerName, {})[ui.model] = ui
+
+    def UpdateHandlerIndex(self, model, handlerName):
+        # Called when a model's handler code changes
+        ui = self.GetUiViewByModel(model)
+        if ui:
+            if model.handlers[handlerName].strip():
+                self.handlerIndex.setdefault(handlerName, {})[model] = ui
+            elif handlerName in self.handlerIndex:
+                self.handlerIndex[handlerName].pop(model, None)
+
+    def GetUiViewsWithHandler(self, handlerName):
+        """ Returns the uiViews on this card that have code for handlerName, without visiting all of the others. """
+        views = self.handlerIndex.get(handlerName)
+        return list(views.values()) if views else []
+
     def GetUiViewByModel(self, model):
         if not self.uiCard:
             return None
@@ -527,12 +751,8 @@ class StackManager(object):
         return None
 
     def GetUiViewByName(self, name):
-        if self.uiCard.model.properties["name"] == name:
-            return self.uiCard
-        for ui in self.GetAllUiViews():
-            if ui.model.properties["name"] == name:
-                return ui
-        return None
+        model = self.uiCard.model.GetChildModelByName(name)
+        return self.GetUiViewByModel(model) if model else None
 
     def RemoveUiViewByModel(self, viewModel):
         ui = self.GetUiViewByModel(viewModel)
@@ -540,14 +760,10 @@ class StackManager(object):
             if ui in self.selectedViews:
                 self.SelectUiView(ui, True)
 
-            def DelFromMap(ui):
-                del self.modelToViewMap[ui.model]
-                if ui.model.type == "group":
-                    for childUi in ui.uiViews:
-                        DelFromMap(childUi)
-            DelFromMap(ui)
+            self.UnmapUiView(ui)
 
             self.uiViews.remove(ui)
+            self.viewIndex.Remove(ui)
             if ui.model.parent:
                 self.uiCard.model.RemoveChild(ui.model)
             ui.SetDown()
@@ -831,14 +1047,16 @@ class StackManager(object):
                     hit = uiView.HitTest(pt - wx.Point(uiView.model.GetAbsolutePosition()))
                     if hit and (hit == uiView or hit.HasGroupAncestor(uiView)):
                         return hit
+        # Only check views whose frames are near pt, from the top down
+        candidates = self.viewIndex.QueryPoint(pt[0], pt[1])
         # Native views first
-        for uiView in reversed(self.uiViews):
+        for uiView in candidates:
             if not uiView.model.IsHidden() and uiView.view:
                 hit = uiView.HitTest(pt - wx.Point(uiView.model.GetAbsolutePosition()))
                 if hit:
                     return hit
         # Then virtual views
-        for uiView in reversed(self.uiViews):
+        for uiView in candidates:
             if not uiView.model.IsHidden() and not uiView.view:
                 hit = uiView.HitTest(pt - wx.Point(uiView.model.GetAbsolutePosition()))
                 if hit:
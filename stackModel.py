@@ -22,9 +22,13 @@ class StackModel(ViewModel):
         self.properties["name"] = "stack"
         self.properties["canSave"] = False
         self.properties["canResize"] = False
+        self.properties["frameRate"] = 60
+        self.properties["simulationRate"] = 60
 
         self.propertyTypes["canSave"] = 'bool'
         self.propertyTypes["canResize"] = 'bool'
+        self.propertyTypes["frameRate"] = 'int'
+        self.propertyTypes["simulationRate"] = 'int'
 
         self.propertyKeys = []
 
@@ -33,10 +37,12 @@ class StackModel(ViewModel):
     def AppendCardModel(self, cardModel):
         cardModel.parent = self
         self.childModels.append(cardModel)
+        self.InvalidateNameIndex()
 
     def InsertCardModel(self, index, cardModel):
         cardModel.parent = self
         self.childModels.insert(index, cardModel)
+        self.InvalidateNameIndex()
 
     def InsertNewCard(self, name, atIndex):
         card = CardModel(self.stackManager)
@@ -52,6 +58,7 @@ class StackModel(ViewModel):
     def RemoveCardModel(self, cardModel):
         cardModel.parent = None
         self.childModels.remove(cardModel)
+        self.InvalidateNameIndex(namesRemoved=True)
 
     def GetCardModel(self, i):
         return self.childModels[i]
@@ -60,13 +67,8 @@ class StackModel(ViewModel):
         parts = path.split('.')
         m = self
         for p in parts:
-            found = False
-            for c in m.childModels:
-                if c.properties['name'] == p:
-                    m = c
-                    found = True
-                    break
-            if not found:
+            m = m.GetNameIndex().get(p)
+            if not m:
                 return None
         return m
 
@@ -86,6 +88,7 @@ class StackModel(ViewModel):
 
         super().SetData(stackData)
         self.childModels = []
+        self.InvalidateNameIndex(namesRemoved=True)
         for data in stackData["cards"]:
             m = CardModel(self.stackManager)
             m.parent = self
@@ -11,6 +11,7 @@ import os
 import sys
 import json
 import wx
+import multiprocessing
 import wx.html
 from stackManager import StackManager
 from stackModel import StackModel
@@ -238,7 +239,7 @@ class StandaloneFrame(wx.Frame):
         dlg.Destroy()
 
     def RunViewer(self):
-        runner = Runner(self.stackManager)
+        runner = Runner(self.stackManager, trustBundledCache=True)
         self.stackManager.runner = runner
         self.MakeMenu()
         self.SetClientSize(self.stackManager.stackModel.GetProperty("size"))
@@ -312,5 +313,7 @@ class StandaloneApp(wx.App, InspectionMixin):
 
 
 if __name__ == '__main__':
+    # Let RunInProcess() worker processes start up correctly, including from frozen apps
+    multiprocessing.freeze_support()
     app = StandaloneApp(redirect=False)
     app.MainLoop()
@@ -0,0 +1,99 @@
+import ast
+import types
+
+import pytest
+
+import asyncHandlers
+import handlerCompiler
+from asyncHandlers import HandlerFuture, HandlerCancelled
+
+
+class FakeModel(object):
+    def __init__(self):
+        self.lastAnimation = None
+
+
+class FakeProxy(object):
+    def __init__(self):
+        self._model = FakeModel()
+        self.calls = []
+
+    def AnimatePosition(self, duration, endPosition, onFinished=None, *args, easing=None, **kwargs):
+        self.calls.append((duration, endPosition, args, easing))
+        self.onFinished = onFinished
+        self._model.lastAnimation = {}
+
+
+async def Awaiter(awaitable):
+    return await awaitable
+
+
+def Step(coro, value=None, exception=None):
+    return coro.throw(exception) if exception else coro.send(value)
+
+
+def test_animate_binds_keyword_arguments():
+    proxy = FakeProxy()
+    finished = []
+    future = asyncHandlers.AwaitCall(proxy.AnimatePosition, duration=1, endPosition=(5, 5),
+                                     onFinished=finished.append, easing="In")
+    assert proxy.calls == [(1, (5, 5), (), "In")]
+    assert proxy._model.lastAnimation["future"] is future
+    proxy.onFinished("done")
+    assert finished == ["done"]
+    assert future.done
+
+
+def test_animate_keeps_positional_finish_args():
+    proxy = FakeProxy()
+    finished = []
+    asyncHandlers.AwaitCall(proxy.AnimatePosition, 1, (5, 5), lambda *a: finished.append(a), 1, 2)
+    assert proxy.calls[0][2] == (1, 2)
+    proxy.onFinished(*proxy.calls[0][2])
+    assert finished == [(1, 2)]
+
+
+def test_cancel_is_thrown_into_the_waiting_coroutine():
+    future = HandlerFuture()
+    coro = Awaiter(future)
+    assert Step(coro) is future
+    future.Cancel()
+    with pytest.raises(HandlerCancelled):
+        Step(coro, future.result, future.exception)
+
+
+def test_set_exception_raises_at_the_await():
+    future = HandlerFuture()
+    future.SetException(ValueError("nope"))
+    with pytest.raises(ValueError):
+        Step(Awaiter(future))
+
+
+def test_awaits_in_nested_async_functions_are_rewritten():
+    root = ast.parse("async def blink():\n    await Wait(0.5)\n"
+                     "    def f(x=lambda: 1):\n        return x\n"
+                     "await Wait(1)\nawait blink()")
+    code = ast.unparse(handlerCompiler.AwaitTransformer().visit(root))
+    assert "AwaitCall(Wait, 0.5)" in code
+    assert "AwaitCall(Wait, 1)" in code
+    assert "AwaitCall(blink)" in code
+
+
+def test_nested_async_function_can_await_wait():
+    class Runner(object):
+        def Wait(self, delay):
+            raise AssertionError("awaited Wait() should not block")
+
+        def WaitAsync(self, delay):
+            return self.future
+
+    runner = Runner()
+    runner.future = HandlerFuture()
+    code = handlerCompiler.CompileHandler("async def blink():\n    await Wait(0.5)\n    return 'done'\n"
+                                          "return await blink()", "OnClick", "card_1.button_1.OnClick")
+    coro = types.FunctionType(code, {"Wait": runner.Wait}, "OnClick")()
+    assert Step(coro) is runner.future
+    runner.future.SetResult()
+    with pytest.raises(StopIteration) as info:
+        Step(coro)
+    assert info.value.value == "done"
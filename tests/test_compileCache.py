@@ -0,0 +1,104 @@
+import marshal
+import compileCache
+import handlerCompiler
+
+
+class FakeModel(object):
+    """ Just enough of a ViewModel for CompileCache to walk. """
+
+    def __init__(self, name, handlers, children=()):
+        self.name = name
+        self.handlers = handlers
+        self.childModels = list(children)
+        self.parent = None
+        for child in self.childModels:
+            child.parent = self
+
+    def GetPath(self):
+        if self.parent and self.parent.parent:
+            return self.parent.GetPath() + "." + self.name
+        return self.name
+
+    def GetProperty(self, key):
+        return self.name
+
+
+def MakeStack():
+    button = FakeModel("button_1", {"OnClick": "\n  x = 1\nprint(x)  \n", "OnMouseDown": ""})
+    card = FakeModel("card_1", {"OnSetup": "y = 2", "OnShowCard": "   "}, [button])
+    return FakeModel("stack", {"OnSetup": "\tz = 3\n"}, [card])
+
+
+def MakeCache(tmp_path, monkeypatch, trustBundled=False):
+    monkeypatch.setattr(compileCache.CompileCache, "UserCachePath",
+                        lambda self: str(tmp_path / "userCache" / "stack.cdsc"))
+    return compileCache.CompileCache(str(tmp_path / "stack.cds"), trustBundled)
+
+
+def test_saved_cache_hits_every_handler(tmp_path, monkeypatch):
+    stack = MakeStack()
+    cache = MakeCache(tmp_path, monkeypatch)
+    cache.CompileAll(stack)
+    cache.Save(stack)
+    assert not cache.isDirty
+
+    reloaded = MakeCache(tmp_path, monkeypatch)
+    handlers = list(reloaded.AllHandlers(stack))
+    assert len(handlers) == 3
+    for model, handlerName, handlerStr in handlers:
+        # Look the handler up the way the Runner does, from the raw source in the model
+        runtimeStr = handlerCompiler.NormalizeSource(model.handlers[handlerName])
+        filename = handlerCompiler.HandlerFilename(model, handlerName)
+        assert reloaded.Key(runtimeStr, filename) in reloaded.entries
+        reloaded.GetCode(runtimeStr, handlerName, filename)
+    assert not reloaded.isDirty
+
+
+def test_user_cache_adds_to_bundled_cache(tmp_path, monkeypatch):
+    stack = MakeStack()
+    compileCache.BuildBundledCache(stack, str(tmp_path / "stack.cds"))
+
+    # Edit a handler after the bundle was built, and save its new code into the user cache
+    stack.childModels[0].handlers["OnSetup"] = "y = 5"
+    cache = MakeCache(tmp_path, monkeypatch)
+    cache.CompileAll(stack)
+    cache.Save(stack)
+
+    reloaded = MakeCache(tmp_path, monkeypatch, trustBundled=True)
+    for model, handlerName, handlerStr in reloaded.AllHandlers(stack):
+        assert reloaded.Key(handlerStr, handlerCompiler.HandlerFilename(model, handlerName)) in reloaded.entries
+
+
+def test_bundled_cache_only_trusted_when_asked(tmp_path, monkeypatch):
+    stack = MakeStack()
+    compileCache.BuildBundledCache(stack, str(tmp_path / "stack.cds"))
+
+    assert not MakeCache(tmp_path, monkeypatch).entries
+    assert MakeCache(tmp_path, monkeypatch, trustBundled=True).entries
+
+
+def test_damaged_cache_entries_are_skipped(tmp_path, monkeypatch):
+    with open(tmp_path / "stack.cdsc", "wb") as f:
+        f.write(compileCache.CACHE_HEADER)
+        marshal.dump({b"key": 5, "other": compile("x = 1", "f", "exec")}, f)
+    assert not MakeCache(tmp_path, monkeypatch, trustBundled=True).entries
+
+
+def test_clones_reuse_compiled_code(tmp_path, monkeypatch):
+    cache = MakeCache(tmp_path, monkeypatch)
+    compiles = []
+    compileHandler = handlerCompiler.CompileHandler
+    monkeypatch.setattr(handlerCompiler, "CompileHandler", lambda *args: compiles.append(args) or compileHandler(*args))
+
+    handlerStr = "def f():\n    return 1 / 0\nf()"
+    original = cache.GetCode(handlerStr, "OnClick", "card_1.button_1.OnClick")
+    clone = cache.GetCode(handlerStr, "OnClick", "card_1.button_2.OnClick")
+    assert len(compiles) == 1
+    assert clone.co_filename == "card_1.button_2.OnClick"
+    assert original.co_filename == "card_1.button_1.OnClick"
+    inner = [c for c in clone.co_consts if hasattr(c, "co_filename")]
+    assert inner and all(c.co_filename == "card_1.button_2.OnClick" for c in inner)
+
+    cache.Forget(handlerStr, "card_1.button_2.OnClick")
+    assert cache.Key(handlerStr, "card_1.button_2.OnClick") not in cache.entries
+    assert cache.Key(handlerStr, "card_1.button_1.OnClick") in cache.entries
@@ -0,0 +1,32 @@
+from delayedCalls import DelayedCallQueue
+
+
+class FakeModel(object):
+    generation = 0
+
+
+def test_due_calls_come_out_in_order():
+    queue = DelayedCallQueue()
+    late = queue.Add(0.2, print, ("late",), {})
+    early = queue.Add(0.1, print, ("early",), {})
+    due = queue.PopDue(early.fireTime + 1)
+    assert due == [early, late]
+    assert early.Take() == (print, ("early",), {})
+    assert early.Take() is None
+
+
+def test_cancelled_calls_dont_run():
+    queue = DelayedCallQueue()
+    call = queue.Add(0, print, (), {})
+    assert call.Cancel()
+    assert queue.PopDue(call.fireTime + 1) == []
+    assert call.Take() is None
+
+
+def test_calls_from_a_recycled_object_are_dropped():
+    owner = FakeModel()
+    queue = DelayedCallQueue()
+    call = queue.Add(0, print, (), {}, owner)
+    owner.generation += 1  # Clone() reused the recycled model for a new object
+    assert queue.PopDue(call.fireTime + 1) == [call]
+    assert call.Take() is None
@@ -0,0 +1,44 @@
+import types
+
+import pytest
+
+import handlerCompiler
+
+
+def Run(handlerStr, clientVars=None):
+    clientVars = {} if clientVars is None else clientVars
+    code = handlerCompiler.CompileHandler(handlerStr, "OnClick", "card_1.button_1.OnClick")
+    return types.FunctionType(code, clientVars, "OnClick")(), clientVars
+
+
+def test_top_level_names_land_in_stack_vars():
+    result, clientVars = Run("x = 1\nfor i in range(3):\n    x += i\nreturn x")
+    assert result == 4
+    assert clientVars["x"] == 4
+
+
+def test_global_alone_in_a_block():
+    result, clientVars = Run("if True:\n    global k\nk = 5")
+    assert clientVars["k"] == 5
+
+
+def test_bare_annotation_alone_in_a_block():
+    result, clientVars = Run("if True:\n    k: int\nk = 5")
+    assert clientVars["k"] == 5
+
+
+def test_top_level_locals_and_dir_see_stack_vars():
+    result, clientVars = Run("a = 1\nreturn (sorted(locals()), dir(), sorted(vars()))", {"b": 2})
+    names, dirNames, varNames = result
+    assert "a" in names and "b" in names
+    assert dirNames == names == varNames
+
+
+def test_locals_in_nested_functions_are_untouched():
+    result, clientVars = Run("def f(y):\n    return locals()\nreturn f(3)")
+    assert result == {"y": 3}
+
+
+def test_yield_is_still_a_syntax_error():
+    with pytest.raises(SyntaxError):
+        Run("yield 1")
@@ -0,0 +1,38 @@
+from handlerQueue import HandlerQueue
+
+
+class FakeModel(object):
+    pass
+
+
+def Handler(model, handlerName, arg=None):
+    return (model, handlerName, "pass", None, None, arg)
+
+
+def test_purge_counts_dropped_periodics():
+    # Like copying an object into a recycled model while the recycled one's OnPeriodic is still queued
+    queue = HandlerQueue()
+    recycled, other = FakeModel(), FakeModel()
+    numOnPeriodicsQueued = 0
+    for model in [recycled, other]:
+        if queue.put(Handler(model, "OnPeriodic", 0.1)):
+            numOnPeriodicsQueued += 1
+    queue.put(Handler(recycled, "OnMouseMove"))
+
+    numOnPeriodicsQueued -= queue.Purge(recycled)
+    assert numOnPeriodicsQueued == 1
+    assert queue.get()[0] is other  # The recycled model's handlers are gone
+    numOnPeriodicsQueued -= 1
+    assert numOnPeriodicsQueued == 0
+
+    # The new object's OnPeriodic gets queued fresh, instead of merging into the dropped one
+    assert queue.put(Handler(recycled, "OnPeriodic", 0.1))
+    assert queue.get()[1] == "OnPeriodic"
+
+
+def test_purging_twice_doesnt_count_twice():
+    queue = HandlerQueue()
+    model = FakeModel()
+    queue.put(Handler(model, "OnPeriodic", 0.1))
+    assert queue.Purge(model) == 1
+    assert queue.Purge(model) == 0
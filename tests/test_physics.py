@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+import physics
+
+
+class FakeModel(object):
+    def __init__(self, position, speed):
+        self.motionLock = threading.RLock()
+        self.properties = {"position": position, "size": (10, 10), "speed": speed, "acceleration": (0, 0),
+                           "gravity": 0, "friction": 0, "bounceOnEdges": False}
+
+    def GetProperty(self, key):
+        return self.properties[key]
+
+    def SetProperty(self, key, value, notify=True):
+        self.properties[key] = tuple(value)
+
+    def GetAbsoluteXY(self):
+        return tuple(self.properties["position"])
+
+    def SetAbsolutePosition(self, pos):
+        self.properties["position"] = tuple(pos)
+
+
+def test_step_moves_bodies():
+    model = FakeModel((0, 0), (100, 50))
+    body = physics.Body(model)
+    physics.StepBodies([body], 0.5, (1000, 1000))
+    body.WriteBack()
+    assert model.GetAbsoluteXY() == pytest.approx((50, 25))
+    assert model.GetProperty("speed") == (100, 50)
+
+
+def test_speed_set_mid_batch_survives():
+    model = FakeModel((0, 0), (100, 0))
+    model.properties["bounceOnEdges"] = True
+    body = physics.Body(model)
+    physics.StepBodies([body], 1.0, (50, 1000))  # bounces, so the step changes speed too
+    model.SetProperty("speed", (0, 0))  # a handler stops the object while the batch steps
+    body.WriteBack()
+    assert model.GetProperty("speed") == (0, 0)
+
+
+def test_position_set_mid_batch_survives():
+    model = FakeModel((0, 0), (100, 0))
+    body = physics.Body(model)
+    physics.StepBodies([body], 0.5, (1000, 1000))
+    model.SetAbsolutePosition((300, 300))
+    body.WriteBack()
+    assert model.GetAbsoluteXY() == (300, 300)
@@ -0,0 +1,106 @@
+import http.server
+import queue
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from workerPool import WorkerPool
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/ok":
+            body = b"hello"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(500, "stub failure")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stubServer():
+    server = http.server.HTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class FakeSerialPort(object):
+    """ Stands in for a pyserial Serial, whose errors are SerialException, an IOError subclass. """
+
+    def __init__(self, lines):
+        self.lines = list(lines)
+
+    def readline(self):
+        if not self.lines:
+            raise IOError("device reports readiness to read but returned no data")
+        return self.lines.pop(0)
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(2, "TestBackground")
+    yield pool
+    pool.Shutdown()
+
+
+def Call(pool, func, *args):
+    results = queue.Queue()
+    assert pool.SubmitCall(func, args, {}, lambda result, exception: results.put((result, exception)))
+    return results.get(timeout=5)
+
+
+def Fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read()
+
+
+def test_http_result_comes_back(pool, stubServer):
+    assert Call(pool, Fetch, stubServer + "/ok") == (b"hello", None)
+
+
+def test_http_error_comes_back(pool, stubServer):
+    result, exception = Call(pool, Fetch, stubServer + "/fail")
+    assert result is None
+    assert isinstance(exception, urllib.error.HTTPError)
+    assert exception.code == 500
+
+
+def test_serial_read_and_error_come_back(pool):
+    port = FakeSerialPort([b"42\n"])
+    assert Call(pool, port.readline) == (b"42\n", None)
+    result, exception = Call(pool, port.readline)
+    assert isinstance(exception, IOError)
+
+
+def test_calls_after_shutdown_are_refused(pool):
+    pool.Shutdown()
+    assert not pool.SubmitCall(print, (), {}, lambda result, exception: None)
+
+
+def test_pool_stays_bounded(pool):
+    release = threading.Event()
+    started = queue.Queue()
+    finished = queue.Queue()
+
+    def block(n):
+        started.put(n)
+        release.wait(5)
+        return n
+
+    for n in range(5):
+        pool.SubmitCall(block, (n,), {}, lambda result, exception: finished.put(result))
+    started.get(timeout=5)
+    started.get(timeout=5)
+    assert len(pool.threads) == 2
+    release.set()
+    assert sorted(finished.get(timeout=5) for n in range(5)) == list(range(5))
@@ -374,7 +374,8 @@ class HandTool(BaseTool):
 
     def UpdateBoxSelection(self):
         uiList = []
-        for ui in self.stackManager.uiViews:
+        r = self.selectionRect
+        for ui in self.stackManager.viewIndex.QueryRect((r.Left, r.Top, r.Left + r.Width, r.Top + r.Height)):
             if self.selectionRect.Contains(ui.model.GetCenter()):
                 uiList.append(ui)
         if uiList != self.lastBoxList:
@@ -1,4 +1,5 @@
 import wx
+import easings
 from uiView import *
 import uiShape
 import generator
@@ -69,17 +70,38 @@ class UiCard(UiView):
             self.stackManager.runner.RunHandler(self.model, "OnKeyUp", event)
 
     def OnPeriodic(self, event):
-        didRun = super().OnPeriodic(event)
-        for child in self.stackManager.GetAllUiViews():
-            if child.OnPeriodic(event):
+        # Only visit the card and objects that have OnMouseMove or OnPeriodic code.  Each view only handles itself
+        # here, without recursing into groups, since group members are in the index too.
+        uiViews = {}
+        for handlerName in ["OnPeriodic", "OnMouseMove"]:
+            uiViews.update(self.stackManager.handlerIndex.get(handlerName, {}))
+        didRun = False
+        for ui in list(uiViews.values()):
+            if UiView.OnPeriodic(ui, event):
                 didRun = True
         return didRun
 
 
+class UsedNames(object):
+    """
+    The names in use on a card, plus include, minus exclude, for checking names while deduplicating, without
+    copying every name on the card into a new list each time.
+    """
+
+    def __init__(self, nameIndex, exclude, include):
+        self.nameIndex = nameIndex
+        self.exclude = set(exclude) if exclude else ()
+        self.include = include if include else ()
+
+    def __contains__(self, name):
+        return (name in self.nameIndex and name not in self.exclude) or name in self.include
+
+
 class CardModel(ViewModel):
     """
     The CardModel allows access to a few properties that actually live in the stack.  This is because the Designer
-    allows editing cards, but not the stack model itself.  These properties are size, canSave, and canResize.
+    allows editing cards, but not the stack model itself.  These properties are size, canSave, canResize, frameRate,
+    and simulationRate.
     """
 
     def __init__(self, stackManager):
@@ -89,27 +111,30 @@ class CardModel(ViewModel):
         # Add custom handlers to the top of the list
         handlers = {"OnSetup": "", "OnShowCard": "", "OnHideCard": "", "OnKeyDown": "", "OnKeyUp": "", "OnResize":""}
         for k,v in self.handlers.items():
-            handlers[k] = v
+            if k != "OnCollision":  # Cards can't collide with anything
+                handlers[k] = v
         self.handlers = handlers
         self.initialEditHandler = "OnSetup"
 
         # Custom property order and mask for the inspector
         self.properties["name"] = "card_1"
         self.properties["bgColor"] = "white"
-        self.propertyKeys = ["name", "bgColor", "size", "canSave", "canResize"]
+        self.propertyKeys = ["name", "bgColor", "size", "canSave", "canResize", "frameRate", "simulationRate"]
 
         self.propertyTypes["bgColor"] = "color"
         self.propertyTypes["canSave"] = 'bool'
         self.propertyTypes["canResize"] = 'bool'
+        self.propertyTypes["frameRate"] = 'int'
+        self.propertyTypes["simulationRate"] = 'int'
 
     def SetProperty(self, key, value, notify=True):
-        if key in ["size", "canSave", "canResize"]:
+        if key in ["size", "canSave", "canResize", "frameRate", "simulationRate"]:
             self.parent.SetProperty(key, value, notify)
         else:
             super().SetProperty(key, value, notify)
 
     def GetProperty(self, key):
-        if key in ["size", "canSave", "canResize"]:
+        if key in ["size", "canSave", "canResize", "frameRate", "simulationRate"]:
             return self.parent.GetProperty(key)
         else:
             return super().GetProperty(key)
@@ -144,6 +169,7 @@ class CardModel(ViewModel):
             m = generator.StackGenerator.ModelFromData(self.stackManager, childData)
             m.parent = self
             self.childModels.append(m)
+        self.InvalidateNameIndex()
 
     def AddChild(self, model):
         self.InsertChild(model, len(self.childModels))
@@ -151,16 +177,21 @@ class CardModel(ViewModel):
     def InsertChild(self, model, index):
         self.childModels.insert(index, model)
         model.parent = self
+        if index >= len(self.childModels) - 1:
+            self.AddToNameIndex(model)
+        else:
+            self.InvalidateNameIndex()
         self.isDirty = True
         if self.stackManager.runner and self.stackManager.uiCard.model == self:
-            self.stackManager.runner.SetupForCard(self)
+            self.stackManager.runner.AddCardVars(self, model)
 
     def RemoveChild(self, model):
         self.childModels.remove(model)
+        self.InvalidateNameIndex(namesRemoved=True)
+        if self.stackManager.runner and self.stackManager.uiCard.model == self:
+            self.stackManager.runner.RemoveCardVars(self, model)
         model.SetDown()
         self.isDirty = True
-        if self.stackManager.runner and self.stackManager.uiCard.model == self:
-            self.stackManager.runner.SetupForCard(self)
 
     def AddNewObject(self, typeStr, name, size, points=None, kwargs=None):
         if not isinstance(name, str):
@@ -216,34 +247,24 @@ class CardModel(ViewModel):
         if notify:
             self.Notify("size")
 
-    def GetDedupNameList(self, exclude):
-        names = [m.properties["name"] for m in self.GetAllChildModels()]
-        for n in exclude:
-            if n in names:
-                names.remove(n)
-        return names
-
     def DeduplicateNameInCard(self, name, exclude=None, include=None):
-        if exclude is None: exclude = []
-        if include is None: include = []
-        names = self.GetDedupNameList(exclude)
-        names.extend(include)
-        return super().DeduplicateName(name, names)
+        names = UsedNames(self.GetNameIndex(True), exclude, include)
+        # Excluded names might be free below the hinted suffixes, so count from 1 then
+        return super().DeduplicateName(name, names, None if exclude else self.nameSuffixHints)
 
     def GetNextAvailableNameInCard(self, name, exclude=None):
-        if exclude is None: exclude = []
-        names = self.GetDedupNameList(exclude)
-        return super().GetNextAvailableName(name, names)
+        names = UsedNames(self.GetNameIndex(True), exclude, None)
+        return super().GetNextAvailableName(name, names, None if exclude else self.nameSuffixHints)
 
     def DeduplicateNamesForModels(self, models):
-        usedNames = []
+        usedNames = set()
 
         def dedup(obj):
             c = obj.GetCard()
             if not c or c != self:
                 newName = self.DeduplicateNameInCard(obj.GetProperty("name"), None, usedNames)
                 obj.SetProperty("name", newName)
-                usedNames.append(newName)
+                usedNames.add(newName)
                 for m in obj.childModels:
                     dedup(m)
 
@@ -276,9 +297,10 @@ class Card(ViewProxy):
         if not model: return -1
         return model.parent.childModels.index(model)+1
 
-    def AnimateBgColor(self, duration, endVal, onFinished=None, *args, **kwargs):
+    def AnimateBgColor(self, duration, endVal, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not isinstance(endVal, str):
             raise TypeError("endColor must be a string")
 
@@ -300,7 +322,19 @@ class Card(ViewProxy):
             def internalOnFinished(animDict):
                 if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-            model.AddAnimation("bgColor", duration, onUpdate, onStart, internalOnFinished)
+            model.AddAnimation("bgColor", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
+
+    def FindObjects(self, type=None, namePrefix=None):
+        """ Returns a list of the objects on this card, including inside groups, matching type and namePrefix. """
+        if type is not None and not isinstance(type, str):
+            raise TypeError("type must be a string")
+        if namePrefix is not None and not isinstance(namePrefix, str):
+            raise TypeError("namePrefix must be a string")
+
+        model = self._model
+        if not model: return []
+
+        return [m.GetProxy() for m in model.FindModels(type, namePrefix)]
 
     def AddButton(self, name="button", **kwargs):
         model = self._model
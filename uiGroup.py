@@ -90,10 +90,12 @@ class UiGroup(UiView):
             if ui.view:
                 self.stackManager.view.RemoveChild(ui.view)
                 wx.CallAfter(ui.view.Destroy)
+            self.stackManager.UnmapUiView(ui)
             self.uiViews.remove(ui)
         for m in self.model.childModels.copy():
             uiView = generator.StackGenerator.UiViewFromModel(self, self.stackManager, m)
             self.uiViews.append(uiView)
+            self.stackManager.MapUiView(uiView)
 
     def OnPeriodic(self, event):
         didRun = False
@@ -117,6 +119,13 @@ class GroupModel(ViewModel):
         self.proxyClass = Group
         self.properties["name"] = "group_1"
 
+    def GetHitShapes(self):
+        # A group's hit area is the union of its children's
+        shapes = []
+        for child in self.childModels:
+            shapes.extend(child.GetHitShapes())
+        return shapes
+
     def GetAllChildModels(self):
         allModels = []
         for child in self.childModels:
@@ -134,9 +143,14 @@ class GroupModel(ViewModel):
 
     def SetFromModel(self, model):
         super().SetFromModel(model)
+        for child in model.childModels:
+            newChild = generator.StackGenerator.ModelFromType(self.stackManager, child.type)
+            newChild.SetFromModel(child)
+            newChild.parent = self
+            self.childModels.append(newChild)
+            newChild.origGroupSubviewFrame = newChild.GetFrame()
+        self.InvalidateNameIndex()
         self.origFrame = self.GetFrame()
-        for model in model.childModels:
-            model.origGroupSubviewFrame = model.GetFrame()
 
     def SetData(self, data):
         super().SetData(data)
@@ -145,6 +159,7 @@ class GroupModel(ViewModel):
             model.parent = self
             self.childModels.append(model)
             model.origGroupSubviewFrame = model.GetFrame()
+        self.InvalidateNameIndex()
         self.origFrame = self.GetFrame()
 
     def SetProperty(self, key, value, notify=True):
@@ -161,6 +176,7 @@ class GroupModel(ViewModel):
             model.parent = self
             pos = model.GetProperty("position")
             model.SetProperty("position", [pos[0]-selfPos[0], pos[1]-selfPos[1]], notify=False)
+        self.InvalidateNameIndex()
         self.UpdateFrame()
         self.origFrame = self.GetFrame()
         for model in models:
@@ -170,6 +186,7 @@ class GroupModel(ViewModel):
 
     def RemoveChild(self, model):
         self.childModels.remove(model)
+        self.InvalidateNameIndex(namesRemoved=True)
         model.origGroupSubviewFrame = None
         pos = model.GetProperty("position")
         selfPos = self.GetProperty("position")
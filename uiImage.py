@@ -1,5 +1,6 @@
 import os
 import wx
+import easings
 import generator
 from math import pi
 from uiView import *
@@ -208,9 +209,10 @@ class Image(ViewProxy):
         if not model: return
         model.SetProperty("fit", val)
 
-    def AnimateRotation(self, duration, endRotation, onFinished=None, *args, **kwargs):
+    def AnimateRotation(self, duration, endRotation, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not (isinstance(endRotation, int) or isinstance(endRotation, float)):
             raise TypeError("endRotation must be a number")
 
@@ -228,4 +230,4 @@ class Image(ViewProxy):
         def internalOnFinished(animDict):
             if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-        model.AddAnimation("rotation", duration, onUpdate, onStart, internalOnFinished)
+        model.AddAnimation("rotation", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
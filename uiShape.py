@@ -1,8 +1,13 @@
 import wx
+import easings
 import generator
+import geometry
 from uiView import *
 from codeRunnerThread import RunOnMain
 
+# Lines and pen strokes are hit-tested as if drawn this many pixels thicker, so thin ones aren't too hard to hit
+LINE_HIT_EXTRA_THICKNESS = 6
+
 
 class UiShape(UiView):
     """
@@ -133,7 +138,7 @@ class UiShape(UiView):
             f = self.model.GetAbsoluteFrame()
             points = self.model.GetScaledPoints()
 
-        extraThick = 6 if (self.model.type in ["pen", "line"]) else 0
+        extraThick = LINE_HIT_EXTRA_THICKNESS if (self.model.type in ["pen", "line"]) else 0
         thickness = thickness + extraThick
 
         # Draw the region offset up/right, to allow space for bottom/left resize boxes,
@@ -193,6 +198,7 @@ class LineModel(ViewModel):
         self.proxyClass = Line
         self.points = []
         self.scaledPoints = None
+        self.hitShapeCache = None
 
         self.properties["name"] = "shape_1"
         self.properties["originalSize"] = None
@@ -215,12 +221,21 @@ class LineModel(ViewModel):
         super().SetData(data)
         self.type = data["type"]
         self.points = data["points"]
+        self.hitShapeCache = None
+
+    def SetFromModel(self, model):
+        super().SetFromModel(model)
+        self.type = model.type
+        self.points = model.points.copy()
+        self.scaledPoints = None
+        self.hitShapeCache = None
 
     def SetShape(self, shape):
         self.type = shape["type"]
         self.properties["penColor"] = shape["penColor"]
         self.properties["penThickness"] = shape["thickness"]
         self.points = shape["points"]
+        self.hitShapeCache = None
         self.isDirty = True
         self.Notify("shape")
 
@@ -228,11 +243,14 @@ class LineModel(ViewModel):
         if self.didSetDown: return
         if key == "size":
             self.scaledPoints = None
+        if key != "position":
+            self.hitShapeCache = None
         super().SetProperty(key, value, notify)
 
     def DidUpdateShape(self):  # If client updates the points list already passed to AddShape
         self.isDirty = True
         self.scaledPoints = None
+        self.hitShapeCache = None
         self.Notify("shape")
 
     def PerformFlips(self, fx, fy, notify=True):
@@ -241,10 +259,39 @@ class LineModel(ViewModel):
                 origSize = self.properties["originalSize"]
                 self.points = [((origSize[0] - p[0]) if fx else p[0], (origSize[1] - p[1]) if fy else p[1]) for p in self.points]
                 self.scaledPoints = None
+                self.hitShapeCache = None
                 if notify:
                     self.Notify("size")
 
 
+    def GetHitShapes(self):
+        # Cache the shapes until this object changes, or moves (even by moving a parent group)
+        pos = self.GetAbsolutePosition()
+        if self.hitShapeCache and self.hitShapeCache[0] == (pos.x, pos.y):
+            return self.hitShapeCache[1]
+
+        points = [(p[0] + pos.x, p[1] + pos.y) for p in self.GetScaledPoints()]
+        radius = self.GetProperty("penThickness") / 2
+        shapes = []
+        if self.type in ["pen", "line"]:
+            if len(points) > 0:
+                # Same extra slop as the hit region, so thin lines aren't too hard to hit
+                shapes.append(geometry.HitShape(points, radius=radius + LINE_HIT_EXTRA_THICKNESS / 2))
+        elif self.type in ["oval", "rect", "roundrect"] and len(points) == 2:
+            (x0, y0), (x1, y1) = points
+            if self.type == "rect":
+                points = geometry.RoundRectPoints(x0, y0, x1, y1, 0)
+            elif self.type == "roundrect":
+                points = geometry.RoundRectPoints(x0, y0, x1, y1, self.GetProperty("cornerRadius"))
+            else:
+                points = geometry.OvalPoints(x0, y0, x1, y1)
+            shapes.append(geometry.HitShape(points, closed=True, filled=True, radius=radius))
+        elif self.type == "poly" and len(points) >= 2:
+            shapes.append(geometry.HitShape(points, closed=True, filled=True, radius=radius))
+
+        self.hitShapeCache = ((pos.x, pos.y), shapes)
+        return shapes
+
     # scale from originalSize to Size
     # take into account thickness/2 border on each side
     def GetScaledPoints(self):
@@ -376,9 +423,10 @@ class Line(ViewProxy):
         if not model or not model.parent: return
         model.SetPoints(points)
 
-    def AnimatePenThickness(self, duration, endVal, onFinished=None, *args, **kwargs):
+    def AnimatePenThickness(self, duration, endVal, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not (isinstance(endVal, int) or isinstance(endVal, float)):
             raise TypeError("endThickness must be a number")
 
@@ -396,11 +444,12 @@ class Line(ViewProxy):
         def internalOnFinished(animDict):
             if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-        model.AddAnimation("penThickness", duration, onUpdate, onStart, internalOnFinished)
+        model.AddAnimation("penThickness", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
 
-    def AnimatePenColor(self, duration, endVal, onFinished=None, *args, **kwargs):
+    def AnimatePenColor(self, duration, endVal, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not isinstance(endVal, str):
             raise TypeError("endColor must be a string")
 
@@ -422,7 +471,7 @@ class Line(ViewProxy):
             def internalOnFinished(animDict):
                 if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-            model.AddAnimation("penColor", duration, onUpdate, onStart, internalOnFinished)
+            model.AddAnimation("penColor", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
 
 
 class ShapeModel(LineModel):
@@ -482,9 +531,10 @@ class Shape(Line):
         if not model: return
         model.SetProperty("fillColor", val)
 
-    def AnimateFillColor(self, duration, endVal, onFinished=None, *args, **kwargs):
+    def AnimateFillColor(self, duration, endVal, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not isinstance(endVal, str):
             raise TypeError("endColor must be a string")
 
@@ -506,7 +556,7 @@ class Shape(Line):
             def internalOnFinished(animDict):
                 if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-            model.AddAnimation("fillColor", duration, onUpdate, onStart, internalOnFinished)
+            model.AddAnimation("fillColor", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
 
 
 class RoundRectModel(ShapeModel):
@@ -549,9 +599,10 @@ class RoundRect(Shape):
         if not model: return
         model.SetProperty("cornerRadius", val)
 
-    def AnimateCornerRadius(self, duration, endVal, onFinished=None, *args, **kwargs):
+    def AnimateCornerRadius(self, duration, endVal, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not (isinstance(endVal, int) or isinstance(endVal, float)):
             raise TypeError("endCornerRadius must be a number")
 
@@ -569,4 +620,4 @@ class RoundRect(Shape):
         def internalOnFinished(animDict):
             if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-        model.AddAnimation("cornerRadius", duration, onUpdate, onStart, internalOnFinished)
+        model.AddAnimation("cornerRadius", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
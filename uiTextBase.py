@@ -1,4 +1,5 @@
 import wx
+import easings
 import wx.stc as stc
 from uiView import *
 
@@ -223,9 +224,10 @@ class TextBaseProxy(ViewProxy):
         if not model: return
         model.SetProperty("fontSize", val)
 
-    def AnimateTextColor(self, duration, endVal, onFinished=None, *args, **kwargs):
+    def AnimateTextColor(self, duration, endVal, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         if not isinstance(endVal, str):
             raise TypeError("endColor must be a string")
 
@@ -247,4 +249,4 @@ class TextBaseProxy(ViewProxy):
             def internalOnFinished(animDict):
                 if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-            model.AddAnimation("textColor", duration, onUpdate, onStart, internalOnFinished)
+            model.AddAnimation("textColor", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
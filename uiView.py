@@ -3,8 +3,13 @@ import threading
 import wx
 import threading
 import ast
+import bisect
+import contextlib
 import re
 import generator
+import geometry
+import easings
+import physics
 import helpData
 from time import time
 from codeRunnerThread import RunOnMain, RunOnMainAsync
@@ -51,6 +56,8 @@ class UiView(object):
         view.Bind(wx.EVT_LEFT_UP, self.FwdOnMouseUp)
         view.Bind(wx.EVT_KEY_DOWN, self.FwdOnKeyDown)
         view.Bind(wx.EVT_KEY_UP, self.FwdOnKeyUp)
+        view.Bind(wx.EVT_SET_FOCUS, self.OnSetFocus)
+        view.Bind(wx.EVT_KILL_FOCUS, self.OnKillFocus)
 
     def FwdOnMouseDown( self, event): self.stackManager.OnMouseDown( self, event)
     def FwdOnMouseMove( self, event): self.stackManager.OnMouseMove( self, event)
@@ -58,6 +65,17 @@ class UiView(object):
     def FwdOnKeyDown(   self, event): self.stackManager.OnKeyDown(   self, event)
     def FwdOnKeyUp(     self, event): self.stackManager.OnKeyUp(     self, event)
 
+    def OnSetFocus(self, event):
+        # Track focus on the main thread, so the runner thread can read hasFocus without waiting on us
+        if self.stackManager:
+            self.stackManager.focusedModel = self.model
+        event.Skip()
+
+    def OnKillFocus(self, event):
+        if self.stackManager and self.stackManager.focusedModel == self.model:
+            self.stackManager.focusedModel = None
+        event.Skip()
+
     def SetView(self, view):
         self.view = view
         if view:
@@ -110,6 +128,8 @@ class UiView(object):
         pass
 
     def DestroyView(self):
+        if self.stackManager and self.stackManager.focusedModel == self.model:
+            self.stackManager.focusedModel = None
         if self.view:
             if self.view.HasCapture():
                 self.view.ReleaseMouse()
@@ -154,35 +174,6 @@ class UiView(object):
             self.stackManager.runner.RunHandler(self.model, "OnMouseExit", event)
         event.Skip()
 
-    def RunAnimations(self, onFinishedCalls, elapsedTime):
-        # Move the object by speed.x and speed.y pixels per second
-        updateList = []
-        finishList = []
-        with self.model.animLock:
-            if self.model.type not in ["stack", "card"]:
-                speed = self.model.GetProperty("speed")
-                if speed != (0,0) and "position" not in self.model.animations:
-                    pos = self.model.GetProperty("position")
-                    self.model.SetProperty("position", [pos.x + speed.x*elapsedTime, pos.y + speed.y*elapsedTime])
-
-            # Run any in-progress animations
-            now = time()
-            for (key, animList) in self.model.animations.copy().items():
-                animDict = animList[0]
-                if "startTime" in animDict:
-                    progress = (now - animDict["startTime"]) / animDict["duration"]
-                    if progress < 1.0:
-                        if animDict["onUpdate"]:
-                            updateList.append([animDict, progress])
-                    else:
-                        if animDict["onUpdate"]:
-                            updateList.append([animDict, 1.0])
-                        finishList.append(key)
-        for (d,p) in updateList:
-            d["onUpdate"](p, d)
-        for key in finishList:
-            self.model.FinishAnimation(key)
-
     def OnPeriodic(self, event):
         didRun = False
         if self.hasMouseMoved:
@@ -191,7 +182,7 @@ class UiView(object):
                 self.stackManager.runner.RunHandler(self.model, "OnMouseMove", event)
                 didRun = True
 
-        if self.stackManager.runner and self.model.GetHandler("OnPeriodic"):
+        if self.stackManager.runner and self.model.GetHandler("OnPeriodic") and self.model.IsPeriodicDue(time()):
             self.stackManager.runner.RunHandler(self.model, "OnPeriodic", event)
             didRun = True
 
@@ -272,6 +263,7 @@ class UiView(object):
         'OnKeyUp':      "OnKeyUp(keyName):",
         'OnResize':     "OnResize():",
         'OnPeriodic':   "OnPeriodic(elapsedTime):",
+        'OnCollision':  "OnCollision(other):",
     }
 
 
@@ -285,11 +277,14 @@ class ViewModel(object):
 
     minSize = wx.Size(20, 20)
     reservedNames = helpData.HelpData.ReservedNames()
+    reservedNameSet = set(reservedNames)
 
     def __init__(self, stackManager):
         super().__init__()
         self.type = None
-        self.parent = None
+        self._parent = None
+        self.absPosition = None  # Cached (x, y) position in card coordinates
+        self.absPositionVersion = 0
         self.handlers = {"OnSetup": "",
                          "OnMouseEnter": "",
                          "OnMouseDown": "",
@@ -297,14 +292,20 @@ class ViewModel(object):
                          "OnMouseUp": "",
                          "OnMouseExit": "",
                          "OnMessage": "",
-                         "OnPeriodic": ""
+                         "OnPeriodic": "",
+                         "OnCollision": ""
                          }
         self.initialEditHandler = "OnMouseDown"
 
         self.properties = {"name": "",
                            "size": wx.Size(0,0),
                            "position": wx.RealPoint(0,0),
-                           "speed": wx.Point(0,0),
+                           "speed": wx.RealPoint(0,0),
+                           "acceleration": wx.RealPoint(0,0),
+                           "gravity": 0.0,
+                           "friction": 0.0,
+                           "bounceOnEdges": False,
+                           "periodicInterval": 0.0,
                            "hidden": False,
                            "data": {}
                            }
@@ -313,25 +314,47 @@ class ViewModel(object):
                               "position": "floatpoint",
                               "center": "floatpoint",
                               "size": "size",
-                              "speed": "point",
+                              "speed": "floatpoint",
+                              "acceleration": "floatpoint",
+                              "gravity": "float",
+                              "friction": "float",
+                              "bounceOnEdges": "bool",
+                              "periodicInterval": "float",
                               "hidden": "bool",
                               "data": "dict"
                               }
         self.propertyChoices = {}
 
         self.childModels = []
+        self.nameIndex = None  # name -> child model, built when first needed
+        self.allNameIndex = None  # name -> model, for all models inside this one
+        self.nameLookup = None  # (sorted names, type -> models, name -> index order) for all models inside this one
+        self.nameIndexVersion = 0
+        self.nameSuffixHints = {}  # name base -> highest suffix known to be taken, along with all below it
         self.stackManager = stackManager
         self.isDirty = False
         self.proxy = None
         self.lastOnPeriodicTime = None
         self.animations = {}
+        self.lastAnimation = None  # The animDict most recently added, so an awaited Animate*() call can tag it
         self.proxyClass = ViewProxy
         self.animLock = threading.Lock()
+        self.motionLock = threading.RLock()
         self.didSetDown = False
+        self.generation = 0  # Bumped each time Clone() reuses this model after Recycle(), see IsSameLife()
 
     def __repr__(self):
         return "<"+str(self.__class__.__name__) + ":" + self.type + ":'" + self.GetProperty("name")+"'>"
 
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        self._parent = parent
+        self.InvalidateAbsolutePosition()
+
     def SetBackUp(self, stackManager):
         if self.didSetDown:
             self.stackManager = stackManager
@@ -341,6 +364,8 @@ class ViewModel(object):
                 child.parent = self
 
     def SetDown(self):
+        if self.stackManager and self.stackManager.runner:
+            self.stackManager.runner.ForgetHandlers(self)
         with self.animLock:
             self.didSetDown = True
             for child in self.childModels:
@@ -358,11 +383,24 @@ class ViewModel(object):
         self.childModels = None
 
     def CreateCopy(self):
-        data = self.GetData()
-        newModel = generator.StackGenerator.ModelFromData(self.stackManager, data)
-        if newModel.type != "card":
+        if self.type != "card":
+            # Copy straight from this model, reusing a Recycle()d model if there is one
+            newModel = self.stackManager.TakeRecycledModel(self.type)
+            if newModel:
+                # Start a new life, so anything still pending from the recycled object's old life gets dropped
+                newModel.generation += 1
+                newModel.SetBackUp(self.stackManager)
+                newModel.lastOnPeriodicTime = None
+                if self.stackManager.runner:
+                    self.stackManager.runner.InvalidateHandlers(newModel)
+                    self.stackManager.runner.PurgeHandlers(newModel)
+            else:
+                newModel = generator.StackGenerator.ModelFromType(self.stackManager, self.type)
+            newModel.SetFromModel(self)
             self.stackManager.uiCard.model.DeduplicateNamesForModels([newModel])
         else:
+            data = self.GetData()
+            newModel = generator.StackGenerator.ModelFromData(self.stackManager, data)
             newModel.SetProperty("name", newModel.DeduplicateName("card_1",
                 [m.GetProperty("name") for m in self.stackManager.stackModel.childModels]), notify=False)
         return newModel
@@ -415,22 +453,43 @@ class ViewModel(object):
             m.SetStackManager(stackManager)
 
     def GetAbsolutePosition(self):
-        p = self.GetProperty("position")
-        pos = wx.RealPoint(p[0], p[1])  # Copy so we don't edit the model's position
-        parent = self.parent
-        while parent and parent.type != "card":
-            parentPos = parent.GetProperty("position")
-            pos += parentPos
-            parent = parent.parent
+        x, y = self.GetAbsoluteXY()
+        return wx.RealPoint(x, y)  # New point each time, so callers can't edit the cached position
+
+    def GetAbsoluteXY(self):
+        """
+        Returns this object's (x, y) position in card coordinates.  This is cached until this object or one of the
+        groups it's in moves, or it gets moved into a different parent, so nested groups don't need to walk up through
+        their parents on every paint and hit test.
+        """
+        pos = self.absPosition
+        if pos is None:
+            version = self.absPositionVersion
+            p = self.GetProperty("position")
+            pos = (p[0], p[1])
+            parent = self.parent
+            if parent and parent.type != "card":
+                parentPos = parent.GetAbsoluteXY()
+                pos = (pos[0] + parentPos[0], pos[1] + parentPos[1])
+            # Don't keep it if this object or a parent moved on the other thread while we were working it out
+            if version == self.absPositionVersion:
+                self.absPosition = pos
         return pos
 
+    def InvalidateAbsolutePosition(self):
+        # Call after this object moves, or changes parents.  Everything inside it moves along with it.
+        self.absPositionVersion += 1
+        self.absPosition = None
+        if self.childModels:
+            for child in self.childModels:
+                child.InvalidateAbsolutePosition()
+
     def SetAbsolutePosition(self, pos):
         parent = self.parent
         pos = wx.RealPoint(pos[0], pos[1])
-        while parent and parent.type != "card":
-            parentPos = parent.GetProperty("position")
-            pos -= parentPos
-            parent = parent.parent
+        if parent and parent.type != "card":
+            parentPos = parent.GetAbsoluteXY()
+            pos = wx.RealPoint(pos.x - parentPos[0], pos.y - parentPos[1])
         self.SetProperty("position", pos)
 
     def IsHidden(self):
@@ -457,6 +516,23 @@ class ViewModel(object):
         s = self.GetProperty("size")
         return wx.Rect(p, s)
 
+    def GetHitShapes(self):
+        """
+        Returns this object's hit area as a list of geometry.HitShapes in card coordinates, computed from the model
+        alone, so that collision checks can run right on the runner thread.
+        """
+        pos = self.GetAbsolutePosition()
+        s = self.GetProperty("size")
+        return [geometry.RectHitShape(pos.x, pos.y, s.width, s.height)]
+
+    def IsSameLife(self, generation):
+        # False if this model was deleted, or recycled and reused by Clone(), since generation was read from it
+        return not self.didSetDown and self.generation == generation
+
+    def IsOnCurrentCard(self):
+        sm = self.stackManager
+        return sm is not None and sm.uiCard is not None and self.GetCard() == sm.uiCard.model
+
     def SetFrame(self, rect):
         self.SetProperty("position", rect.Position)
         self.SetProperty("size", rect.Size)
@@ -469,7 +545,8 @@ class ViewModel(object):
 
         props = self.properties.copy()
         props.pop("hidden")
-        props.pop("speed")
+        for k in ["speed", "acceleration", "gravity", "friction", "bounceOnEdges"]:
+            props.pop(k)
         for k,v in self.propertyTypes.items():
             if v in ["point", "floatpoint", "size"] and k in props:
                 props[k] = list(props[k])
@@ -478,6 +555,8 @@ class ViewModel(object):
 
         if len(props["data"]) == 0:
             props.pop("data")
+        if not props["periodicInterval"]:
+            props.pop("periodicInterval")
 
         return {"type": self.type,
                 "handlers": handlers,
@@ -547,15 +626,20 @@ class ViewModel(object):
                     self.SetProperty(k, v, notify=False)
 
     def SetFromModel(self, model):
+        # Like SetData(model.GetData()), but copies directly, without converting everything to json data and back
         for k, v in model.handlers.items():
             self.handlers[k] = v
         for k, v in model.properties.items():
+            if k in ["hidden", "speed", "acceleration", "gravity", "friction", "bounceOnEdges"]:
+                continue
             if self.propertyTypes[k] == "point":
                 self.SetProperty(k, wx.Point(v), notify=False)
             elif self.propertyTypes[k] == "floatpoint":
                 self.SetProperty(k, wx.RealPoint(v[0], v[1]), notify=False)
             elif self.propertyTypes[k] == "size":
                 self.SetProperty(k, wx.Size(v), notify=False)
+            elif self.propertyTypes[k] == "dict":
+                self.SetProperty(k, self.SanitizeDict(v, []), notify=False)
             else:
                 self.SetProperty(k, v, notify=False)
 
@@ -593,11 +677,103 @@ class ViewModel(object):
     def GetChildModelByName(self, name):
         if self.properties["name"] == name:
             return self
-        for child in self.childModels:
-            result = child.GetChildModelByName(name)
-            if result:
-                return result
-        return None
+        return self.GetNameIndex(True).get(name)
+
+    def GetNameIndex(self, includeAll=False):
+        """
+        Returns a dict of name -> model for this model's children, or for all models inside it if includeAll is set,
+        in order, keeping the first model when names repeat.  Built when first needed, and then kept until
+        InvalidateNameIndex() gets called.
+        """
+        index = self.allNameIndex if includeAll else self.nameIndex
+        if index is not None:
+            return index
+        version = self.nameIndexVersion
+        index = {}
+        for m in self.childModels:
+            index.setdefault(m.properties["name"], m)
+            if includeAll and m.childModels:
+                for name, child in m.GetNameIndex(True).items():
+                    index.setdefault(name, child)
+        # Don't keep it if children changed while we were building it
+        if version == self.nameIndexVersion:
+            if includeAll:
+                self.allNameIndex = index
+            else:
+                self.nameIndex = index
+        return index
+
+    def InvalidateNameIndex(self, namesRemoved=False):
+        # Call after this model's children, or their names, change.  The models above this one index them too.
+        # Set namesRemoved if any names were freed up, so numbering new names can reuse them.
+        m = self
+        while m:
+            m.nameIndexVersion += 1
+            m.nameIndex = None
+            m.allNameIndex = None
+            m.nameLookup = None
+            if namesRemoved:
+                m.nameSuffixHints.clear()
+            m = m.parent
+
+    def AddToNameIndex(self, model):
+        # Call after adding model as this model's last child.  Updates the indexes in place instead of dropping them,
+        # so adding lots of objects stays fast.
+        self.nameIndexVersion += 1
+        name = model.properties["name"]
+        if self.nameIndex is not None:
+            self.nameIndex.setdefault(name, model)
+        if self.allNameIndex is not None:
+            added = [(name, model)]
+            if model.childModels:
+                added.extend(model.GetNameIndex(True).items())
+            for addedName, m in added:
+                if addedName not in self.allNameIndex:
+                    self.allNameIndex[addedName] = m
+                    if self.nameLookup is not None:
+                        sortedNames, typeIndex, order = self.nameLookup
+                        bisect.insort(sortedNames, addedName)
+                        typeIndex.setdefault(m.type, []).append(m)
+                        order[addedName] = len(order)
+        else:
+            self.nameLookup = None
+        if self.parent:
+            self.parent.InvalidateNameIndex()
+
+    def GetNameLookup(self):
+        """
+        Returns (sortedNames, typeIndex, order) for all models inside this one: their names sorted, so all names with a
+        given prefix can be found with a binary search, a dict of type -> list of models, and a dict of name -> the
+        name's position in GetNameIndex(True).  Kept along with the name index.
+        """
+        lookup = self.nameLookup
+        if lookup is not None:
+            return lookup
+        version = self.nameIndexVersion
+        index = self.GetNameIndex(True)
+        typeIndex = {}
+        for m in index.values():
+            typeIndex.setdefault(m.type, []).append(m)
+        lookup = (sorted(index), typeIndex, {name: i for i, name in enumerate(index)})
+        if version == self.nameIndexVersion:
+            self.nameLookup = lookup
+        return lookup
+
+    def FindModels(self, type=None, namePrefix=None):
+        """ Returns the models inside this one, in index order, with the given type and name prefix, if any. """
+        sortedNames, typeIndex, order = self.GetNameLookup()
+        if namePrefix is None:
+            if type is None:
+                return list(self.GetNameIndex(True).values())
+            return list(typeIndex.get(type, []))
+
+        start = bisect.bisect_left(sortedNames, namePrefix)
+        end = start
+        while end < len(sortedNames) and sortedNames[end].startswith(namePrefix):
+            end += 1
+        index = self.GetNameIndex(True)
+        names = sorted(sortedNames[start:end], key=order.get)
+        return [index[name] for name in names if type is None or index[name].type == type]
 
     def GetCard(self):
         if self.type == 'stack':
@@ -627,6 +803,7 @@ class ViewModel(object):
             return
         self.parent.childModels.remove(self)
         self.parent.childModels.insert(index, self)
+        self.parent.InvalidateNameIndex()
         if self.GetCard() == self.stackManager.uiCard.model:
             self.stackManager.LoadCardAtIndex(self.stackManager.cardIndex, reload=True)
 
@@ -643,6 +820,8 @@ class ViewModel(object):
             self.SetCenter(cdsFramePart)
         elif cdsFramePart.role == "speed":
             self.SetProperty("speed", cdsFramePart)
+        elif cdsFramePart.role == "acceleration":
+            self.SetProperty("acceleration", cdsFramePart)
 
     def Notify(self, key):
         if self.stackManager:
@@ -675,11 +854,25 @@ class ViewModel(object):
             self.SetAbsolutePosition([value.x - s.width / 2, value.y - s.height / 2])
             return
 
-        if self.properties[key] != value:
-            self.properties[key] = value
-            if notify:
-                self.Notify(key)
-            self.isDirty = True
+        # Physics writes back position and speed with a compare-and-set under motionLock, so hold it here too
+        with self.motionLock if key in ["position", "speed"] else contextlib.nullcontext():
+            if self.properties[key] != value:
+                oldValue = self.properties[key]
+                self.properties[key] = value
+                if key == "position":
+                    self.InvalidateAbsolutePosition()
+                elif key in ["speed", "acceleration", "gravity"] and self.stackManager:
+                    self.stackManager.UpdateAnimatingModel(self)
+                elif key == "name":
+                    if self.parent:
+                        self.parent.InvalidateNameIndex(namesRemoved=True)
+                    if self.type != "card" and self.stackManager and self.stackManager.runner:
+                        card = self.GetCard()
+                        if card and card == self.stackManager.uiCard.model:
+                            self.stackManager.runner.RenameCardVar(card, self, oldValue)
+                if notify:
+                    self.Notify(key)
+                self.isDirty = True
 
     def InterpretPropertyFromString(self, key, valStr):
         propType = self.propertyTypes[key]
@@ -707,22 +900,64 @@ class ViewModel(object):
         if self.handlers[key] != value:
             self.handlers[key] = value
             self.isDirty = True
+            if self.stackManager:
+                self.stackManager.UpdateHandlerIndex(self, key)
+                if self.stackManager.runner:
+                    self.stackManager.runner.InvalidateHandlers(self, key)
+
+    def IsPeriodicDue(self, now):
+        # Objects with a periodicInterval only run OnPeriodic once that many seconds have passed since the last run
+        interval = self.properties["periodicInterval"]
+        return interval <= 0 or not self.lastOnPeriodicTime or now - self.lastOnPeriodicTime >= interval
+
+    def IsMoving(self):
+        props = self.properties
+        return self.type not in ["stack", "card"] and \
+               (props["speed"] != (0,0) or props["acceleration"] != (0,0) or props["gravity"] != 0)
+
+    def IsAnimating(self):
+        return len(self.animations) > 0 or self.IsMoving()
+
+    def RunAnimations(self, now, elapsedTime, updateList, finishList, bodyList):
+        # On Main thread
+        with self.animLock:
+            # Let the physics stepper move the object by its speed, unless its position is being animated
+            if self.IsMoving() and "position" not in self.animations:
+                bodyList.append(physics.Body(self))
 
-    def AddAnimation(self, key, duration, onUpdate, onStart=None, onFinish=None, onCancel=None):
+            # Collect the progress of any in-progress animations, for the StackManager to ease and apply
+            for (key, animList) in self.animations.items():
+                animDict = animList[0]
+                if "startTime" in animDict:
+                    # A step's time can be a bit before a just-started animation's startTime, so don't go negative
+                    progress = max(0.0, (now - animDict["startTime"]) / animDict["duration"])
+                    if progress < 1.0:
+                        if animDict["onUpdate"]:
+                            updateList.append((animDict, progress))
+                    else:
+                        if animDict["onUpdate"]:
+                            updateList.append((animDict, 1.0))
+                        finishList.append((self, key))
+
+    def AddAnimation(self, key, duration, onUpdate, onStart=None, onFinish=None, onCancel=None, easing=None):
         # On Runner thread
         if self.didSetDown: return
         animDict = {"duration": duration,
                     "onStart": onStart,
                     "onUpdate": onUpdate,
                     "onFinish": onFinish,
-                    "onCancel": onCancel
+                    "onCancel": onCancel,
+                    "easing": easing if easing is not None else easings.LINEAR
                     }
         with self.animLock:
+            self.lastAnimation = animDict
             if key not in self.animations:
                 self.animations[key] = [animDict]
                 self.StartAnimation(key)
             else:
                 self.animations[key].append(animDict)
+        if self.stackManager:
+            self.stackManager.AddAnimatingModel(self)
 
     def StartAnimation(self, key):
         # On Runner or Main thread
@@ -746,42 +981,56 @@ class ViewModel(object):
                     del self.animations[key]
                 if "startTime" in animDict and animDict["onFinish"]:
                     animDict["onFinish"](animDict)
+        if self.stackManager:
+            self.stackManager.UpdateAnimatingModel(self)
 
     def StopAnimation(self, key=None):
         # On Runner thread
-        if key:
-            # Stop animating this one property
-            with self.animLock:
+        stopped = []
+        with self.animLock:
+            if key:
+                # Stop animating this one property
                 if key in self.animations:
-                    animDict = self.animations[key][0]
+                    stopped = self.animations.pop(key)
+                    animDict = stopped[0]
                     if "startTime" in animDict and animDict["onCancel"]:
                         animDict["onCancel"](animDict)
-                    del self.animations[key]
-            return
-
-        # Stop animating all properties
-        with self.animLock:
-            for (key, animList) in self.animations.items():
-                animDict = animList[0]
-                if "startTime" in animDict and animDict["onCancel"]:
-                    animDict["onCancel"](animDict)
-            self.animations = {}
-
-    def DeduplicateName(self, name, existingNames):
-        existingNames.extend(self.reservedNames) # disallow globals
-        if name in existingNames:
+            else:
+                # Stop animating all properties
+                for (key, animList) in self.animations.items():
+                    animDict = animList[0]
+                    if "startTime" in animDict and animDict["onCancel"]:
+                        animDict["onCancel"](animDict)
+                    stopped.extend(animList)
+                self.animations = {}
+        if self.stackManager:
+            self.stackManager.UpdateAnimatingModel(self)
+            runner = self.stackManager.runner
+            if runner:
+                # Handlers awaiting any of the stopped animations, including queued ones that never started, won't
+                # get an onFinished call, so cancel them instead of leaving them suspended
+                for animDict in stopped:
+                    if "future" in animDict:
+                        runner.EnqueueFunction(animDict["future"].Cancel)
+
+    def DeduplicateName(self, name, existingNames, suffixHints=None):
+        # existingNames can be any collection of names, but a set or dict is fastest
+        if name in existingNames or name in self.reservedNameSet: # disallow globals
             name = name.rstrip("0123456789_")
-            name = self.GetNextAvailableName(name, existingNames)
+            name = self.GetNextAvailableName(name, existingNames, suffixHints)
         return name
 
-    def GetNextAvailableName(self, base, existingNames):
-        i = 0
+    def GetNextAvailableName(self, base, existingNames, suffixHints=None):
+        # With suffixHints, start counting after the suffixes we already know are taken, instead of from 1
         if base[-1] != "_":
             base += "_"
+        i = suffixHints.get(base, 0) if suffixHints is not None else 0
         while True:
             i += 1
             name = base+str(i)
-            if name not in existingNames:
+            if name not in existingNames and name not in self.reservedNameSet:
+                if suffixHints is not None:
+                    suffixHints[base] = i - 1
                 return name
 
     def GetProxy(self):
@@ -811,9 +1060,9 @@ class ViewProxy(object):
     def __getattr__(self, item):
         model = self._model
         if model:
-            for m in model.childModels:
-                if m.properties["name"] == item:
-                    return m.GetProxy()
+            m = model.GetNameIndex().get(item)
+            if m:
+                return m.GetProxy()
         return super().__getattribute__(item)
 
     def SendMessage(self, message):
@@ -830,18 +1079,22 @@ class ViewProxy(object):
         model = self._model
         if not model: return
 
-        if model.stackManager.runner:
-            model.stackManager.runner.SetFocus(self)
+        stackManager = model.stackManager
+        if stackManager.runner:
+            stackManager.focusRequests += 1
+            stackManager.runner.SetFocus(self, stackManager.focusRequests)
 
     @property
-    @RunOnMain
     def hasFocus(self):
         model = self._model
         if not model: return False
 
-        uiView = model.stackManager.GetUiViewByModel(model)
-        if uiView and uiView.view:
-            return uiView.view.HasFocus()
+        stackManager = model.stackManager
+        if stackManager.focusRequests != stackManager.focusRequestsDone and stackManager.runner:
+            # A Focus() call hasn't reached the main thread yet, so focusedModel is out of date.  Ask the main thread,
+            # which runs the pending Focus() first.
+            return stackManager.runner.HasFocus(model)
+        return stackManager.focusedModel == model
 
     def Clone(self, **kwargs):
         model = self._model
@@ -850,9 +1103,9 @@ class ViewProxy(object):
         if model.type != "card":
             # update the model immediately on the runner thread
             newModel = model.CreateCopy()
-            newModel.SetProperty("speed", model.GetProperty("speed"), notify=False)
-            if not self.visible:
-                newModel.SetProperty("hidden", True, notify=False)
+            for k in ["speed", "acceleration", "gravity", "friction", "bounceOnEdges"]:
+                newModel.SetProperty(k, model.GetProperty(k), notify=False)
+            newModel.SetProperty("hidden", not self.visible, notify=False)
             for k,v in kwargs.items():
                 if k in newModel.propertyTypes:
                     newModel.SetProperty(k, v, notify=False)
@@ -908,6 +1161,29 @@ class ViewProxy(object):
                 sm.RemoveCardRaw(model)
         func()
 
+    def Recycle(self):
+        """
+        Like Delete(), but keeps this object's model around, so a later Clone() of an object of the same type can
+        reuse it, instead of building a new one.  Helps stacks that keep creating and removing lots of objects.
+        """
+        model = self._model
+        if not model or not model.parent or model.parent.type == "group":
+            return
+        if model.type in ["card", "group"]:
+            self.Delete()
+            return
+
+        # immediately update the model
+        sm = model.stackManager
+        model.parent.RemoveChild(model)
+
+        @RunOnMainAsync
+        def func():
+            # update views on the main thread, and then the model is free to reuse
+            sm.RemoveUiViewByModel(model)
+            sm.RecycleModel(model)
+        func()
+
     @RunOnMain
     def Cut(self):
         # update the model and view together in a rare synchronous call to the main thread
@@ -991,8 +1267,8 @@ class ViewProxy(object):
     @property
     def speed(self):
         model = self._model
-        if not model: return wx.Point(0,0)
-        speed = CDSPoint(model.GetProperty("speed"), model=model, role="speed")
+        if not model: return wx.RealPoint(0,0)
+        speed = CDSRealPoint(model.GetProperty("speed"), model=model, role="speed")
         return speed
     @speed.setter
     def speed(self, val):
@@ -1004,6 +1280,71 @@ class ViewProxy(object):
         if not model: return
         model.SetProperty("speed", val)
 
+    @property
+    def periodicInterval(self):
+        model = self._model
+        if not model: return 0.0
+        return model.GetProperty("periodicInterval")
+    @periodicInterval.setter
+    def periodicInterval(self, val):
+        if not (isinstance(val, int) or isinstance(val, float)):
+            raise TypeError("periodicInterval must be a number")
+        model = self._model
+        if not model: return
+        model.SetProperty("periodicInterval", max(0.0, float(val)))
+
+    @property
+    def acceleration(self):
+        model = self._model
+        if not model: return wx.RealPoint(0,0)
+        return CDSRealPoint(model.GetProperty("acceleration"), model=model, role="acceleration")
+    @acceleration.setter
+    def acceleration(self, val):
+        try:
+            val = wx.RealPoint(val[0], val[1])
+        except:
+            raise ValueError("acceleration must be a point or a list of two numbers")
+        model = self._model
+        if not model: return
+        model.SetProperty("acceleration", val)
+
+    @property
+    def gravity(self):
+        model = self._model
+        if not model: return 0.0
+        return model.GetProperty("gravity")
+    @gravity.setter
+    def gravity(self, val):
+        if not (isinstance(val, int) or isinstance(val, float)):
+            raise TypeError("gravity must be a number")
+        model = self._model
+        if not model: return
+        model.SetProperty("gravity", float(val))
+
+    @property
+    def friction(self):
+        model = self._model
+        if not model: return 0.0
+        return model.GetProperty("friction")
+    @friction.setter
+    def friction(self, val):
+        if not (isinstance(val, int) or isinstance(val, float)):
+            raise TypeError("friction must be a number")
+        model = self._model
+        if not model: return
+        model.SetProperty("friction", max(0.0, float(val)))
+
+    @property
+    def bounceOnEdges(self):
+        model = self._model
+        if not model: return False
+        return model.GetProperty("bounceOnEdges")
+    @bounceOnEdges.setter
+    def bounceOnEdges(self, val):
+        model = self._model
+        if not model: return
+        model.SetProperty("bounceOnEdges", bool(val))
+
     @property
     def center(self):
         model = self._model
@@ -1103,17 +1444,8 @@ class ViewProxy(object):
         model = self._model
         if not model: return False
 
-        @RunOnMain
-        def f():
-            if model.didSetDown: return False
-            s = model.stackManager.GetUiViewByModel(model)
-            if not s:
-                return False
-            sreg = s.GetHitRegion()
-            sreg = wx.Region(sreg)
-            sreg.Offset(*model.GetProperty("position"))
-            return sreg.Contains(wx.Point(point)) == wx.InRegion
-        return f()
+        if model.didSetDown or not model.IsOnCurrentCard(): return False
+        return geometry.ShapesContainPoint(model.GetHitShapes(), point[0], point[1])
 
     def IsTouching(self, obj):
         if not isinstance(obj, ViewProxy):
@@ -1123,22 +1455,8 @@ class ViewProxy(object):
         oModel = obj._model
         if not model or not oModel: return False
 
-        @RunOnMain
-        def f():
-            if model.didSetDown: return False
-            s = model.stackManager.GetUiViewByModel(model)
-            o = model.stackManager.GetUiViewByModel(oModel)
-            if not s or not o:
-                return False
-            sreg = s.GetHitRegion()
-            oreg = o.GetHitRegion()
-            sreg = wx.Region(sreg)
-            oreg = wx.Region(oreg)
-            sreg.Offset(*model.GetProperty("position"))
-            oreg.Offset(*oModel.GetProperty("position"))
-            sreg.Intersect(oreg)
-            return not sreg.IsEmpty()
-        return f()
+        if model.didSetDown or not model.IsOnCurrentCard() or not oModel.IsOnCurrentCard(): return False
+        return geometry.ShapesTouch(model.GetHitShapes(), oModel.GetHitShapes())
 
     def IsTouchingEdge(self, obj):
         if not isinstance(obj, ViewProxy):
@@ -1148,25 +1466,24 @@ class ViewProxy(object):
         oModel = obj._model
         if not model or not oModel: return None
 
-        @RunOnMain
-        def f():
-            if model.didSetDown: return None
-            sf = model.GetAbsoluteFrame() # self frame in card coords
-            f = oModel.GetAbsoluteFrame() # other frame in card coords
-            top = wx.Rect(f.Left, f.Top, f.Width, 1)
-            bottom = wx.Rect(f.Left, f.Bottom, f.Width, 1)
-            left = wx.Rect(f.Left, f.Top, 1, f.Height)
-            right = wx.Rect(f.Right, f.Top, 1, f.Height)
-            if sf.Intersects(top): return "Top"
-            if sf.Intersects(bottom): return "Bottom"
-            if sf.Intersects(left): return "Left"
-            if sf.Intersects(right): return "Right"
-            return None
-        return f()
+        # Only uses the models' frames, so answer right here on the runner thread
+        if model.didSetDown: return None
+        sf = model.GetAbsoluteFrame() # self frame in card coords
+        f = oModel.GetAbsoluteFrame() # other frame in card coords
+        top = wx.Rect(f.Left, f.Top, f.Width, 1)
+        bottom = wx.Rect(f.Left, f.Bottom, f.Width, 1)
+        left = wx.Rect(f.Left, f.Top, 1, f.Height)
+        right = wx.Rect(f.Right, f.Top, 1, f.Height)
+        if sf.Intersects(top): return "Top"
+        if sf.Intersects(bottom): return "Bottom"
+        if sf.Intersects(left): return "Left"
+        if sf.Intersects(right): return "Right"
+        return None
 
-    def AnimatePosition(self, duration, endPosition, onFinished=None, *args, **kwargs):
+    def AnimatePosition(self, duration, endPosition, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         try:
             endPosition = wx.RealPoint(endPosition)
         except:
@@ -1193,11 +1510,12 @@ class ViewProxy(object):
         def onCanceled(animDict):
             model.SetProperty("speed", (0,0))
 
-        model.AddAnimation("position", duration, onUpdate, onStart, internalOnFinished, onCanceled)
+        model.AddAnimation("position", duration, onUpdate, onStart, internalOnFinished, onCanceled, easing=easingId)
 
-    def AnimateCenter(self, duration, endCenter, onFinished=None, *args, **kwargs):
+    def AnimateCenter(self, duration, endCenter, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         try:
             endCenter = wx.RealPoint(endCenter)
         except:
@@ -1224,11 +1542,12 @@ class ViewProxy(object):
         def onCanceled(animDict):
             model.SetProperty("speed", (0,0))
 
-        model.AddAnimation("position", duration, onUpdate, onStart, internalOnFinished, onCanceled)
+        model.AddAnimation("position", duration, onUpdate, onStart, internalOnFinished, onCanceled, easing=easingId)
 
-    def AnimateSize(self, duration, endSize, onFinished=None, *args, **kwargs):
+    def AnimateSize(self, duration, endSize, onFinished=None, *args, easing=None, **kwargs):
         if not (isinstance(duration, int) or isinstance(duration, float)):
             raise TypeError("duration must be a number")
+        easingId = easings.EasingId(easing)
         try:
             endSize = wx.Size(endSize)
         except:
@@ -1249,7 +1568,7 @@ class ViewProxy(object):
         def internalOnFinished(animDict):
             if onFinished: self._model.stackManager.runner.EnqueueFunction(onFinished, *args, **kwargs)
 
-        model.AddAnimation("size", duration, onUpdate, onStart, internalOnFinished)
+        model.AddAnimation("size", duration, onUpdate, onStart, internalOnFinished, easing=easingId)
 
     def StopAnimating(self, propertyName=None):
         model = self._model
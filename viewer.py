@@ -11,6 +11,7 @@ import os
 import sys
 import json
 import wx
+import multiprocessing
 import wx.html
 from stackManager import StackManager
 from stackModel import StackModel
@@ -397,6 +398,8 @@ class ViewerApp(wx.App, InspectionMixin):
 
 
 if __name__ == '__main__':
+    # Let RunInProcess() worker processes start up correctly, including from frozen apps
+    multiprocessing.freeze_support()
     app = ViewerApp(redirect=False)
 
     if len(sys.argv) > 1 and not app.argFilename:
@@ -0,0 +1,75 @@
+import threading
+import queue
+
+
+class WorkerPool(object):
+    """
+    A small, bounded pool of daemon threads for running blocking calls off of the runner thread.  Threads only get
+    started as work comes in, up to maxWorkers, and then extra work waits in line.  We use daemon threads, instead
+    of a concurrent.futures pool, so that a call that never returns, like a stuck network or serial port read, can't
+    keep the app from quitting.
+    """
+
+    def __init__(self, maxWorkers, name):
+        self.maxWorkers = maxWorkers
+        self.name = name
+        self.workQueue = queue.Queue()
+        self.threads = []
+        self.numIdle = 0
+        self.lock = threading.Lock()
+        self.isShutdown = False
+
+    def Submit(self, func):
+        with self.lock:
+            if self.isShutdown:
+                return False
+            self.workQueue.put(func)
+            if self.numIdle == 0 and len(self.threads) < self.maxWorkers:
+                t = threading.Thread(target=self.WorkerLoop, name=f"{self.name}-{len(self.threads)+1}", daemon=True)
+                self.threads.append(t)
+                t.start()
+            else:
+                self.numIdle = max(0, self.numIdle - 1)
+        return True
+
+    def SubmitCall(self, func, args, kwargs, onFinished):
+        """
+        Run func(*args, **kwargs) on a worker thread, and then call onFinished(result, exception) on that same thread,
+        with exception set to whatever func raised, or None if it returned normally.
+        """
+        def work():
+            try:
+                result = func(*args, **kwargs)
+                exception = None
+            except Exception as err:
+                result = None
+                exception = err
+            onFinished(result, exception)
+        return self.Submit(work)
+
+    def WorkerLoop(self):
+        while True:
+            func = self.workQueue.get()
+            if func is None:
+                break
+            try:
+                func()
+            except Exception:
+                pass  # Submitted funcs report their own errors
+            with self.lock:
+                if self.isShutdown:
+                    break
+                self.numIdle += 1
+
+    def Shutdown(self):
+        """ Drop any work that hasn't started yet, and let idle threads exit.  Running calls finish on their own. """
+        with self.lock:
+            self.isShutdown = True
+            try:
+                while True:
+                    self.workQueue.get_nowait()
+            except queue.Empty:
+                pass
+            for t in self.threads:
+                self.workQueue.put(None)
+            self.threads = []